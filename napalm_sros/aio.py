@@ -0,0 +1,541 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+"""asyncio variant of the SR OS driver, for polling many routers from one process."""
+import asyncio
+import logging
+import re
+import time
+
+from lxml import etree
+from ncclient.xml_ import to_xml
+from napalm.base.exceptions import (
+    CommandErrorException,
+    CommandTimeoutException,
+    ConnectionClosedException,
+    ConnectionException,
+)
+
+try:
+    import asyncssh
+except ImportError:  # optional dependency, pip install napalm-sros[async]
+    asyncssh = None
+
+from .api.get_bgp_neighbors import GET_BGP_NEIGHBORS, _parse_bgp_neighbors
+from .api.get_bgp_neighbors_detail import _parse_bgp_neighbors_detail, build_filter
+from .api.get_probes_results import _parse_probes_results
+from .api.get_probes_results import build_filter as build_probes_filter
+from .api.get_route_to import _parse_route_to, build_neighbors_filter
+from .api.get_route_to import build_filter as build_route_to_filter
+from .api.iter_getters import FDB_MACS
+from .api.util import _xpath
+from .nc_filters import (
+    GET_ARP_TABLE,
+    GET_BGP_CONFIG,
+    GET_ENVIRONMENT,
+    GET_FACTS,
+    GET_INTERFACES,
+    GET_INTERFACES_COUNTERS,
+    GET_INTERFACES_IP,
+    GET_LLDP_NEIGHBORS,
+    GET_IPV6_NEIGHBORS_STATE,
+    GET_LLDP_NEIGHBORS_DETAIL,
+    GET_MAC_ADDRESS_TABLE_STATE,
+    GET_NETWORK_INSTANCES,
+    GET_NTP_PEERS,
+    GET_NTP_SERVERS,
+    GET_OPTICS,
+    GET_PROBES_CONFIG,
+    GET_SNMP_INFORMATION,
+    GET_USERS,
+)
+from .sros import (
+    CLI_CANDIDATE_CONFIG_COMMANDS,
+    CLI_RUNNING_CONFIG_COMMAND,
+    NokiaSROSDriver,
+    POWER_UTILIZATION_COMMAND,
+    PROMPT_SEARCH_WINDOW,
+)
+
+log = logging.getLogger(__file__)
+
+NC_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+WITH_DEFAULTS_NS = "urn:ietf:params:xml:ns:yang:ietf-netconf-with-defaults"
+BASE_1_0 = "urn:ietf:params:netconf:base:1.0"
+BASE_1_1 = "urn:ietf:params:netconf:base:1.1"
+EOM = b"]]>]]>"
+
+HELLO = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<hello xmlns="{}"><capabilities>'
+    "<capability>{}</capability><capability>{}</capability>"
+    "</capabilities></hello>".format(NC_NS, BASE_1_0, BASE_1_1)
+)
+
+# blank text is kept, as in the replies parsed by ncclient for NokiaSROSDriver
+_PARSER = etree.XMLParser(huge_tree=True)
+
+
+class NetconfReply:
+    """Reply to a <get>, with the same attributes as used from ncclient replies."""
+
+    def __init__(self, xml, data_xml):
+        self.xml = xml
+        self.data_xml = data_xml
+
+
+class NetconfSession:
+    """
+    Minimal NETCONF client (RFC 6241/6242) over a pair of asyncio streams.
+
+    RPCs on one session are sent one at a time; concurrency comes from running many
+    sessions (routers) in the same event loop.
+
+    :param reader: stream with async read(n), readexactly(n) and readuntil(separator)
+    :param writer: stream with write(data) and optionally async drain()
+    :param timeout: deadline in seconds for each reply
+    """
+
+    def __init__(self, reader, writer, timeout=60):
+        self.reader = reader
+        self.writer = writer
+        self.timeout = timeout
+        self.server_capabilities = []
+        self.session_id = None
+        self.chunked = False
+        self._message_id = 0
+        self._lock = asyncio.Lock()
+        # set once a reply could not be read completely: the rest of it may still arrive and
+        # would be taken as the reply of the next RPC
+        self.broken = False
+
+    async def hello(self):
+        await self._send(HELLO.encode("utf-8"), chunked=False)
+        hello = etree.fromstring(
+            await asyncio.wait_for(self._read_eom(), self.timeout), _PARSER
+        )
+        self.server_capabilities = [
+            c.text.strip() for c in hello.iter("{%s}capability" % NC_NS) if c.text
+        ]
+        self.session_id = hello.findtext("{%s}session-id" % NC_NS)
+        self.chunked = BASE_1_1 in self.server_capabilities
+
+    async def _send(self, data, chunked=None):
+        if chunked is None:
+            chunked = self.chunked
+        if chunked:
+            self.writer.write(b"\n#%d\n" % len(data) + data + b"\n##\n")
+        else:
+            self.writer.write(data + EOM)
+        drain = getattr(self.writer, "drain", None)
+        if drain is not None:
+            await drain()
+
+    async def _read_eom(self):
+        data = await self.reader.readuntil(EOM)
+        return data[: -len(EOM)]
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            if await self.reader.readexactly(2) != b"\n#":
+                raise ConnectionException("invalid NETCONF chunk header")
+            line = await self.reader.readuntil(b"\n")
+            if line == b"#\n":
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(int(line[:-1])))
+
+    async def rpc(self, operation):
+        """
+        Sends an RPC and returns its parsed <rpc-reply>.
+
+        :param operation: serialized operation element, e.g. "<get>...</get>"
+        :raises CommandErrorException: if the reply holds an <rpc-error>
+        """
+        async with self._lock:
+            if self.broken:
+                raise ConnectionClosedException("NETCONF session closed after a failed reply")
+            self._message_id += 1
+            message = '<rpc message-id="{}" xmlns="{}">{}</rpc>'.format(
+                self._message_id, NC_NS, operation
+            )
+            try:
+                await self._send(message.encode("utf-8"))
+                read = self._read_chunked() if self.chunked else self._read_eom()
+                raw = await asyncio.wait_for(read, self.timeout)
+                reply = etree.fromstring(raw, _PARSER)
+            except asyncio.TimeoutError as e:
+                self._abort()
+                raise CommandTimeoutException(
+                    "No NETCONF reply received within {}s".format(self.timeout)
+                ) from e
+            except (
+                ConnectionException,
+                asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError,
+                ValueError,
+                etree.XMLSyntaxError,
+            ) as e:
+                self._abort()
+                raise ConnectionClosedException("Invalid NETCONF reply: {}".format(e)) from e
+        errors = reply.findall("{%s}rpc-error" % NC_NS)
+        if errors:
+            raise CommandErrorException(
+                "; ".join(
+                    (e.findtext("{%s}error-message" % NC_NS) or "").strip()
+                    or e.findtext("{%s}error-tag" % NC_NS)
+                    for e in errors
+                )
+            )
+        return raw, reply
+
+    def _abort(self):
+        self.broken = True
+        try:
+            self.writer.close()
+        except Exception:
+            log.debug("Error closing a NETCONF session", exc_info=True)
+
+    async def get(self, filter, with_defaults=None):
+        operation = "<get>{}{}</get>".format(
+            filter.strip(),
+            '<with-defaults xmlns="{}">{}</with-defaults>'.format(WITH_DEFAULTS_NS, with_defaults)
+            if with_defaults
+            else "",
+        )
+        raw, reply = await self.rpc(operation)
+        return NetconfReply(raw, reply.find("{%s}data" % NC_NS))
+
+    async def get_config(self, source):
+        raw, reply = await self.rpc("<get-config><source><{}/></source></get-config>".format(source))
+        return NetconfReply(raw, reply.find("{%s}data" % NC_NS))
+
+    async def close_session(self):
+        if not self.broken:
+            await self.rpc("<close-session/>")
+
+
+class AsyncNokiaSROSDriver:
+    """
+    asyncio variant of NokiaSROSDriver.
+
+    NETCONF and the MD-CLI shell run over asyncssh, so one event loop can poll many routers
+    concurrently. Replies are parsed by the parsers of NokiaSROSDriver, so results are the
+    same as those of the synchronous getters. Unlike the synchronous driver, errors are
+    raised rather than printed, so they can be collected with asyncio.gather().
+
+    get_route_to, get_probes_results, get_ipv6_neighbors_table and, from release 20,
+    get_mac_address_table always read the state tree, like NokiaSROSDriver does with
+    optional_args sros_state_getters.
+
+    Takes the same arguments and optional_args as NokiaSROSDriver.
+    """
+
+    def __init__(self, hostname, username, password, timeout=60, optional_args=None):
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        # synchronous driver without connections: options and reply parsers
+        self.driver = NokiaSROSDriver(hostname, username, password, timeout, optional_args)
+        self.netconf = None
+        self.ssh = None
+        # the MD-CLI shell runs on its own connection, to the SSH port like NokiaSROSDriver
+        self.cli_ssh = None
+        self.shell = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self):
+        if asyncssh is None:
+            raise ConnectionException(
+                "AsyncNokiaSROSDriver requires asyncssh, install napalm-sros[async]"
+            )
+        try:
+            self.ssh = await asyncio.wait_for(
+                asyncssh.connect(
+                    self.hostname,
+                    port=self.driver.port,
+                    username=self.username,
+                    password=self.password,
+                    known_hosts=None,
+                ),
+                self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError, asyncssh.Error) as e:
+            raise ConnectionException(
+                "Cannot connect to {}: {}".format(self.hostname, e)
+            ) from e
+        try:
+            writer, reader, _ = await self.ssh.open_session(subsystem="netconf", encoding=None)
+            self.netconf = NetconfSession(reader, writer, self.timeout)
+            await self.netconf.hello()
+        except BaseException as e:
+            # do not leave the SSH connection open, also when cancelled
+            self.netconf = None
+            self.ssh.close()
+            await self.ssh.wait_closed()
+            self.ssh = None
+            if isinstance(e, (OSError, EOFError, asyncio.TimeoutError, asyncssh.Error)):
+                raise ConnectionException(
+                    "Cannot connect to {}: {}".format(self.hostname, e)
+                ) from e
+            raise
+        self.driver._set_state_revisions(self.netconf.server_capabilities)
+
+    async def close(self):
+        try:
+            if self.netconf is not None:
+                await self.netconf.close_session()
+        except Exception:
+            log.debug("Error closing the NETCONF session of %s", self.hostname, exc_info=True)
+        finally:
+            for connection in (self.cli_ssh, self.ssh):
+                if connection is not None:
+                    connection.close()
+                    await connection.wait_closed()
+            self.netconf = self.ssh = self.cli_ssh = self.shell = None
+
+    async def is_alive(self):
+        return {
+            "is_alive": self.ssh is not None
+            and self.netconf is not None
+            and not self.netconf.broken
+        }
+
+    async def _get(self, filter, with_defaults=None):
+        return (await self.netconf.get(filter, with_defaults)).data_xml
+
+    #
+    # CLI
+    #
+
+    async def _open_shell(self):
+        try:
+            self.cli_ssh = await asyncio.wait_for(
+                asyncssh.connect(
+                    self.hostname,
+                    port=self.driver.ssh_port,
+                    username=self.username,
+                    password=self.password,
+                    known_hosts=None,
+                ),
+                self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError, asyncssh.Error) as e:
+            raise ConnectionException(
+                "Cannot open the CLI of {}: {}".format(self.hostname, e)
+            ) from e
+        writer, reader, _ = await self.cli_ssh.open_session(
+            term_type="vt100", encoding="utf-8", errors="replace"
+        )
+        self.shell = (reader, writer)
+        # skip the login banner
+        await self._read_until_prompt(self.driver.cli_timeout)
+
+    async def _read_until_prompt(self, timeout):
+        reader, _ = self.shell
+        deadline = time.monotonic() + timeout
+        chunks = []
+        tail = ""
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise CommandTimeoutException(
+                    "No prompt received within {}s".format(timeout)
+                )
+            try:
+                data = await asyncio.wait_for(reader.read(65536), remaining)
+            except asyncio.TimeoutError:
+                continue
+            if not data:
+                raise ConnectionClosedException("CLI channel closed by the device")
+            chunks.append(data)
+            tail = (tail + data)[-PROMPT_SEARCH_WINDOW:]
+            if self.driver.terminal_stdout_re[0].search(tail):
+                return "".join(chunks)
+
+    async def _perform_cli_commands(self, commands, no_more=False):
+        if self.shell is None:
+            await self._open_shell()
+        if no_more:
+            commands = ["/environment more false"] + commands
+        _, writer = self.shell
+        buff = []
+        for command in commands:
+            if "\n" not in command:
+                command = command + "\n"
+            writer.write(command)
+            buff.append(await self._read_until_prompt(self.driver._cli_timeout_for(command)))
+        return "".join(buff)
+
+    async def cli(self, commands, encoding="text"):
+        if encoding not in ("text",):
+            raise NotImplementedError("%s is not a supported encoding" % encoding)
+        cli_output = {}
+        for cmd in commands:
+            buff = await self._perform_cli_commands([cmd])
+            cli_output[cmd] = self.driver._clean_cli_output(cmd, buff)
+        return cli_output
+
+    #
+    # Getters, see NokiaSROSDriver for the returned data
+    #
+
+    async def get_facts(self):
+        return self.driver._parse_facts(await self._get(GET_FACTS["_"]))
+
+    async def get_interfaces(self):
+        result = await self._get(GET_INTERFACES(R19=self.driver.R19), "report-all")
+        return self.driver._parse_interfaces(result)
+
+    async def get_interfaces_counters(self):
+        result = await self._get(GET_INTERFACES_COUNTERS["_"], "report-all")
+        return self.driver._parse_interfaces_counters(result)
+
+    async def get_interfaces_ip(self):
+        result = await self._get(GET_INTERFACES_IP["_"], "report-all")
+        return self.driver._parse_interfaces_ip(result)
+
+    async def get_network_instances(self, name=""):
+        result = await self._get(
+            GET_NETWORK_INSTANCES["_"].format(instance_name=name), "report-all"
+        )
+        return self.driver._parse_network_instances(result)
+
+    async def get_optics(self):
+        return self.driver._parse_optics(await self._get(GET_OPTICS["_"], "report-all"))
+
+    async def get_arp_table(self, vrf=""):
+        result = await self._get(GET_ARP_TABLE["_"].format(vrf=vrf), "report-all")
+        return self.driver._parse_arp_table(result)
+
+    async def get_ntp_peers(self):
+        return self.driver._parse_ntp_peers(await self._get(GET_NTP_PEERS["_"], "report-all"))
+
+    async def get_ntp_servers(self):
+        result = await self._get(GET_NTP_SERVERS["_"], "report-all")
+        return self.driver._parse_ntp_servers(result)
+
+    async def get_snmp_information(self):
+        result = await self._get(GET_SNMP_INFORMATION["_"], "report-all")
+        return self.driver._parse_snmp_information(result)
+
+    async def get_users(self):
+        return self.driver._parse_users(await self._get(GET_USERS["_"], "report-all"))
+
+    async def get_probes_config(self):
+        result = await self._get(GET_PROBES_CONFIG["_"], "report-all")
+        return self.driver._parse_probes_config(result)
+
+    async def get_lldp_neighbors(self):
+        return self.driver._parse_lldp_neighbors(await self._get(GET_LLDP_NEIGHBORS["_"]))
+
+    async def get_lldp_neighbors_detail(self, interface=""):
+        result = await self._get(GET_LLDP_NEIGHBORS_DETAIL["_"].format(port_id=interface))
+        return self.driver._parse_lldp_neighbors_detail(result)
+
+    async def get_environment(self):
+        result = await self._get(GET_ENVIRONMENT["_"], "report-all")
+        power_output = await self._perform_cli_commands(
+            [POWER_UTILIZATION_COMMAND], no_more=True
+        )
+        return self.driver._parse_environment(result, power_output)
+
+    async def get_bgp_neighbors(self):
+        return _parse_bgp_neighbors(await self._get(GET_BGP_NEIGHBORS, "report-all"))
+
+    async def get_bgp_neighbors_detail(self, neighbor_address="", vrf=""):
+        result = await self._get(build_filter(neighbor_address, vrf), "report-all")
+        return _parse_bgp_neighbors_detail(result, vrf)
+
+    async def get_bgp_config(self, group="", neighbor=""):
+        result = await self._get(
+            GET_BGP_CONFIG["_"].format(group_name=group, neighbor=neighbor), "report-all"
+        )
+        return self.driver._parse_bgp_config(result, group, neighbor)
+
+    async def get_config(self, retrieve="all", full=False, sanitized=False, format="text"):
+        if retrieve not in ("running", "startup", "candidate", "all"):
+            raise ValueError("retrieve must be running, startup, candidate or all")
+        configuration = {"running": "", "candidate": "", "startup": ""}
+        cli = self.driver.sros_get_format == "cli" or format == "cli"
+        if retrieve in ("running", "startup", "all"):
+            if cli:
+                buff = await self._perform_cli_commands([CLI_RUNNING_CONFIG_COMMAND])
+                running = self.driver._cli_config(buff)
+            else:
+                running = self._configure_xml(await self.netconf.get_config("running"))
+            for datastore in ("running", "startup"):
+                if retrieve in (datastore, "all"):
+                    configuration[datastore] = running
+        if retrieve in ("candidate", "all"):
+            if cli:
+                buff = await self._perform_cli_commands(CLI_CANDIDATE_CONFIG_COMMANDS)
+                configuration["candidate"] = self.driver._cli_config(buff)
+            else:
+                configuration["candidate"] = self._configure_xml(
+                    await self.netconf.get_config("candidate")
+                )
+        return configuration
+
+    @staticmethod
+    def _configure_xml(reply):
+        # same serialization as NokiaSROSDriver.get_config
+        configure = to_xml(_xpath(reply.data_xml, "configure_ns:configure")[0])
+        return re.sub(r"<\?xml.*\?>", "", configure)
+
+    async def get_route_to(self, destination="", protocol="", longer=False):
+        # raises ValueError for longer lookups too wide for the state tree, there is no
+        # CLI fallback here
+        result = await self._get(build_route_to_filter(destination, longer), "report-all")
+        neighbors = None
+        neighbors_filter = build_neighbors_filter(result, destination, protocol, longer)
+        if neighbors_filter is not None:
+            neighbors = await self._get(neighbors_filter)
+        return _parse_route_to(result, destination, protocol, longer, neighbors)
+
+    async def get_mac_address_table(self):
+        if self.driver.R19:
+            # the forwarding databases are not in the state tree of release 19
+            buff = await self._perform_cli_commands(["/show service fdb-mac"], no_more=True)
+            return self.driver._parse_mac_address_table(buff)
+        result = await self._get(
+            GET_MAC_ADDRESS_TABLE_STATE["_"].format(service_name=""), "report-all"
+        )
+        entries = (self.driver._mac_entry(mac) for mac in _xpath(result, FDB_MACS))
+        return [entry for entry in entries if entry is not None]
+
+    async def get_probes_results(self):
+        return _parse_probes_results(await self._get(build_probes_filter(), "report-all"))
+
+    async def get_ipv6_neighbors_table(self):
+        result = await self._get(GET_IPV6_NEIGHBORS_STATE["_"], "report-all")
+        return self.driver._parse_ipv6_neighbors_table(result)
+
+    async def get_ntp_stats(self):
+        buff_servers = await self._perform_cli_commands(
+            ["/show system ntp servers"], no_more=True
+        )
+        buff_peers = await self._perform_cli_commands(["/show system ntp peers"], no_more=True)
+        return self.driver._parse_ntp_stats(buff_servers, buff_peers)
@@ -18,4 +18,11 @@
 
 from .get_bgp_neighbors import get_bgp_neighbors # noqa
 from .get_bgp_neighbors_detail import get_bgp_neighbors_detail # noqa
-
+from .get_interfaces import get_interfaces, get_interfaces_counters, \
+  sample_interfaces_counters # noqa
+from .get_route_to import get_route_to # noqa
+from .get_probes_results import get_probes_results # noqa
+from .get_snapshot import get_snapshot, SNAPSHOT_GETTERS # noqa
+from .iter_getters import iter_arp_table, iter_bgp_config, iter_interfaces_counters, \
+  iter_mac_address_table # noqa
+from .get_config_to import get_config_to # noqa
@@ -20,10 +20,11 @@
 
 import logging, datetime
 
+from lxml import etree
 from ncclient.xml_ import to_xml, to_ele
 from napalm.base.helpers import convert
 
-from .util import _find_txt, NSMAP
+from .util import _find_txt, _index_bgp_neighbors, _xpath
 
 #
 # Netconf filters to retrieve only required attributes
@@ -92,6 +93,7 @@ GET_BGP_NEIGHBORS = """
             </router>
             <service>
                 <vprn>
+                <service-name/>
                 """+NEIGHBOR_STATS+"""
                 </vprn>
             </service>
@@ -101,6 +103,12 @@ GET_BGP_NEIGHBORS = """
 
 log = logging.getLogger(__file__)
 
+def _to_timestamp(time:str):
+  if time:
+    # Remove 'Z' timezone
+    return datetime.datetime.strptime(time[:-1], "%Y-%m-%dT%H:%M:%S.%f").timestamp()
+  return 0
+
 def get_bgp_neighbors(conn):
   data = to_ele(
       conn.get(
@@ -110,82 +118,93 @@ def get_bgp_neighbors(conn):
   )
   if log.isEnabledFor(logging.DEBUG):
     log.debug(to_xml(data, pretty_print=True))
+  return _parse_bgp_neighbors(data)
+
+def _parse_bgp_neighbors(data):
+  current_time = _to_timestamp(_find_txt(data,'//state_ns:system/state_ns:current-time'))
 
-  current_time_str = _find_txt(data,'//state_ns:system/state_ns:current-time')
+  # Index the neighbor state once, rather than searching the tree for every peer
+  state, router_ids = _index_bgp_neighbors(data)
 
   # List all VRFs and the operational local router ID
   result = {
     'global': {
-      'router_id': _find_txt(data,"//state_ns:router/state_ns:oper-router-id"),
+      'router_id': router_ids.get('global', ''),
       'peers': {}
     }
   }
-  for vprn in data.xpath("//state_ns:service/state_ns:vprn",namespaces=NSMAP):
+  for vprn in _xpath(data, "state_ns:state/state_ns:service/state_ns:vprn"):
     name = _find_txt(vprn, "state_ns:service-name")
-    router_id = _find_txt(vprn, "state_ns:oper-router-id")
-    result[ name ] = { 'router_id': router_id, 'peers': {} }
-
-  for n in data.xpath("//configure_ns:neighbor",namespaces=NSMAP):
-    name = _find_txt(n, "../../configure_ns:service-name") or "global"
-    local_as = convert(int, _find_txt( n, "../../configure_ns:autonomous-system" ))
-
-    ip_address = _find_txt( n, "configure_ns:ip-address" )
-    stats = data.xpath( f"//state_ns:ip-address[ text()='{ip_address}']/..", namespaces=NSMAP)
-
-    def conf_int(attr: str,default=0):
-      return convert( int, _find_txt(n,f"configure_ns:{attr}")) or default
-
-    def conf_str(attr: str):
-      return _find_txt(n,f"configure_ns:{attr}")
-
-    def state_str(attr: str):
-      return _find_txt(stats[0],f"state_ns:statistics/state_ns:{attr}")
-
-    def to_timestamp(time:str):
-      if time:
-        # Remove 'Z' timezone
-        return datetime.datetime.strptime(time[:-1], "%Y-%m-%dT%H:%M:%S.%f").timestamp()
-      return 0
-
-    session_state = state_str('session-state')
-    router_id = _find_txt( data, f"//state_ns:ip-address[text()='{ip_address}']/../../../state_ns:oper-router-id" )
-
-    count = {}
-    for attr in ['received','active','sent']:
-      count[attr] = {}
-      for af in ('ipv4','ipv6'):
-        count[attr][af] = convert(
-            int,
-            _find_txt(
-                stats[0],
-                f"state_ns:statistics/state_ns:family-prefix/state_ns:{af}/state_ns:{attr}"
-            )
-        )
-
-    last_established_time = to_timestamp(state_str('last-established-time'))
-    uptime = to_timestamp(current_time_str) - last_established_time
-
-    peer = {
-      'local_as': local_as,
-      'remote_as': conf_int('peer-as'),
-      'remote_id': state_str('peer-identifier'),
-      'is_up': session_state.lower()=="established",
-      'is_enabled': conf_str('admin-state') == "enable",
-      'description': conf_str('description'),
-      'uptime': convert(int,uptime), # Current or time since down if is_up=False
-      'address_family': {
-        'ipv4': {
-         'received_prefixes': count['received']['ipv4'],
-         'accepted_prefixes': count['active']['ipv4'],
-         'sent_prefixes': count['sent']['ipv4'],
-        },
-        'ipv6': {
-         'received_prefixes': count['received']['ipv6'],
-         'accepted_prefixes': count['active']['ipv6'],
-         'sent_prefixes': count['sent']['ipv6'],
-        }
-      }
-    }
-    result[name]['peers'][ip_address] = peer
+    result[ name ] = { 'router_id': router_ids.get(name, ''), 'peers': {} }
+
+  instances = _xpath(
+      data,
+      "configure_ns:configure/configure_ns:router"
+      " | configure_ns:configure/configure_ns:service/configure_ns:vprn"
+  )
+  for instance in instances:
+    name = _find_txt(instance, "configure_ns:service-name") or "global"
+    local_as = convert(int, _find_txt(instance, "configure_ns:autonomous-system"))
+    for n in _xpath(instance, "configure_ns:bgp/configure_ns:neighbor"):
+      ip_address = _find_txt(n, "configure_ns:ip-address")
+      stats = state.get((name, ip_address))
+      if stats is None:
+        # configured but no state reported, e.g. instance not operational
+        stats = etree.Element("neighbor")
+      result.setdefault(name, { 'router_id': router_ids.get(name, ''), 'peers': {} })
+      result[name]['peers'][ip_address] = _peer(n, stats, local_as, current_time)
 
   return result
+
+def _peer(n, stats, local_as, current_time):
+  """
+  Builds the NAPALM peer dictionary from a configured neighbor and its indexed state
+  """
+  def conf_int(attr: str,default=0):
+    return convert( int, _find_txt(n,f"configure_ns:{attr}")) or default
+
+  def conf_str(attr: str):
+    return _find_txt(n,f"configure_ns:{attr}")
+
+  def state_str(attr: str):
+    return _find_txt(stats,f"state_ns:statistics/state_ns:{attr}")
+
+  session_state = state_str('session-state')
+
+  count = {}
+  for attr in ['received','active','sent']:
+    count[attr] = {}
+    for af in ('ipv4','ipv6'):
+      count[attr][af] = convert(
+          int,
+          _find_txt(
+              stats,
+              f"state_ns:statistics/state_ns:family-prefix/state_ns:{af}/state_ns:{attr}"
+          )
+      )
+
+  last_established_time = _to_timestamp(state_str('last-established-time'))
+  uptime = current_time - last_established_time
+
+  peer = {
+    'local_as': local_as,
+    'remote_as': conf_int('peer-as'),
+    'remote_id': state_str('peer-identifier'),
+    'is_up': session_state.lower()=="established",
+    'is_enabled': conf_str('admin-state') == "enable",
+    'description': conf_str('description'),
+    'uptime': convert(int,uptime), # Current or time since down if is_up=False
+    'address_family': {
+      'ipv4': {
+       'received_prefixes': count['received']['ipv4'],
+       'accepted_prefixes': count['active']['ipv4'],
+       'sent_prefixes': count['sent']['ipv4'],
+      },
+      'ipv6': {
+       'received_prefixes': count['received']['ipv6'],
+       'accepted_prefixes': count['active']['ipv6'],
+       'sent_prefixes': count['sent']['ipv6'],
+      }
+    }
+  }
+  return peer
@@ -20,9 +20,10 @@
 
 import logging
 
+from lxml import etree
 from ncclient.xml_ import to_xml, to_ele
 from napalm.base.helpers import convert
-from .util import _find_txt, NSMAP
+from .util import _find_txt, _index_bgp_neighbors, _xpath, NSMAP
 
 #
 # Netconf filters to retrieve only required attributes
@@ -103,136 +104,200 @@ NEIGHBOR_STATS = """
 </bgp>
 """
 
-GET_BGP_NEIGHBORS_DETAILS = """
-    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
-        <configure xmlns="urn:nokia.com:sros:ns:yang:sr:conf">
+CONF_ROUTER = """
             <router>
-                <router-name/>
+                <router-name>{router_name}</router-name>
                 <autonomous-system/>
                 <bgp>
                 """+NEIGHBOR_CONF+"""
                 </bgp>
             </router>
+"""
+
+CONF_VPRN = """
             <service>
                 <vprn>
-                    <service-name/>
+                    <service-name>{service_name}</service-name>
                     <autonomous-system/>
                     <bgp>
                     """+NEIGHBOR_CONF+"""
                     </bgp>
                 </vprn>
             </service>
-        </configure>
-        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+"""
+
+STATE_ROUTER = """
             <router>
+                <router-name>{router_name}</router-name>
                 """+NEIGHBOR_STATS+"""
             </router>
+"""
+
+STATE_VPRN = """
             <service>
                 <vprn>
+                    <service-name>{service_name}</service-name>
                     """+NEIGHBOR_STATS+"""
                 </vprn>
             </service>
+"""
+
+FILTER = """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <configure xmlns="urn:nokia.com:sros:ns:yang:sr:conf">
+            {conf}
+        </configure>
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            {state}
         </state>
     </filter>
 """
 
+def build_filter(neighbor_address="", vrf=""):
+  """
+  Builds the subtree filter, scoped to a single neighbor and/or routing instance.
+
+  :param neighbor_address: IP address of the neighbor, all neighbors if empty
+  :param vrf: "global" (or "Base") for the base router, a VPRN service name, or empty for
+              all instances
+  :return: filter string
+  """
+  conf, state = [], []
+  if vrf in ("", "global", "Base"):
+    router_name = "Base" if vrf else ""
+    conf.append(CONF_ROUTER.replace("{router_name}", router_name))
+    state.append(STATE_ROUTER.replace("{router_name}", router_name))
+  if vrf not in ("global", "Base"):
+    conf.append(CONF_VPRN.replace("{service_name}", vrf))
+    state.append(STATE_VPRN.replace("{service_name}", vrf))
+  return FILTER.format(
+      conf="".join(conf), state="".join(state)
+  ).replace("{neighbor_address}", neighbor_address)
+
+GET_BGP_NEIGHBORS_DETAILS = build_filter()
+
 log = logging.getLogger(__file__)
 
-def get_bgp_neighbors_detail(conn,neighbor_address=""):
+def get_bgp_neighbors_detail(conn,neighbor_address="",vrf=""):
+  """
+  :param conn: NETCONF connection
+  :param neighbor_address: only return this neighbor
+  :param vrf: only return neighbors of this instance ("global" or a VPRN service name);
+              the filter is scoped on the device, so other instances are not retrieved
+  :return: same structure as NokiaSROSDriver.get_bgp_neighbors_detail
+  """
   data = to_ele(
       conn.get(
-          filter=GET_BGP_NEIGHBORS_DETAILS.format(
-              neighbor_address=neighbor_address
-          ),
+          filter=build_filter(neighbor_address, vrf),
           with_defaults="report-all",
       ).data_xml
   )
   if log.isEnabledFor(logging.DEBUG):
     log.debug(to_xml(data, pretty_print=True))
+  return _parse_bgp_neighbors_detail(data, vrf)
+
+def _parse_bgp_neighbors_detail(data, vrf=""):
+  # Index the neighbor state once, rather than searching the tree for every peer
+  state, _ = _index_bgp_neighbors(data)
+
+  if vrf == "Base":
+    vrf = "global"
   result = {}
-  for n in data.xpath("//configure_ns:neighbor",namespaces=NSMAP):
-    name = _find_txt(n, "../../configure_ns:service-name") or "global"
-    local_as = convert(int, _find_txt( n, "../../configure_ns:autonomous-system" ))
-
-    ip_address = _find_txt( n, "configure_ns:ip-address" )
-    stats = data.xpath( f"//state_ns:ip-address[ text()='{ip_address}']/..", namespaces=NSMAP)
-
-    def conf_int(attr: str,default=0):
-      return convert( int, _find_txt(n,f"configure_ns:{attr}")) or default
-
-    def state_int(attr: str):
-      return convert( int, _find_txt(stats[0],f"state_ns:statistics/state_ns:{attr}"))
-
-    def conf_str(attr: str):
-      return _find_txt(n,f"configure_ns:{attr}")
-
-    def conf_bool(attr:str):
-      return conf_str(attr).lower() == "true"
-
-    def conf_list(attr:str):
-      policies = [ele.text for ele in n.xpath(attr,namespaces=NSMAP)]
-      return ",".join(policies)
-
-    def state_str(attr: str):
-      return _find_txt(stats[0],f"state_ns:statistics/state_ns:{attr}")
-
-    session_state = state_str('session-state')
-
-    count = {}
-    for attr in ['active','suppressed','rejected','sent','received']:
-      count[attr] = {}
-      for af in ('ipv4','ipv6'):
-        count[attr][af] = convert(
-            int,
-            _find_txt(
-                stats[0],
-                f"state_ns:statistics/state_ns:family-prefix/state_ns:{af}/state_ns:{attr}"
-            )
-        )
-      count[attr]['total'] = count[attr]['ipv4'] + count[attr]['ipv6']
-
-    peer = {
-      'up': session_state.lower()=="established",
-      'local_as': local_as,
-      'remote_as': conf_int('peer-as'),
-      'router_id': state_str('peer-identifier'),
-      'local_address': state_str('operational-local-address'),
-      'routing_table': name,
-      'local_address_configured': conf_str('local-address') != "",
-      'local_port': state_int('local-port'),
-      'remote_address': ip_address,
-      'remote_port': state_int('peer-port'),
-      'multihop': conf_int('multihop') > 0,
-      'multipath': conf_str('multipath-eligible') != "false",
-      'remove_private_as': conf_bool('remove-private/configure_ns:limited'),
-      'import_policy': conf_list('import/configure_ns:policy'),
-      'export_policy': conf_list('export/configure_ns:policy'),
-      'input_messages': state_int('received/state_ns:messages'),
-      'output_messages': state_int('sent/state_ns:messages'),
-      'input_updates': state_int('received/state_ns:updates'),
-      'output_updates': state_int('sent/state_ns:updates'),
-      'messages_queued_out': state_int('sent/state_ns:queues'),
-      'connection_state': session_state,
-      'previous_connection_state': state_str('last-state'),
-      'last_event': state_str('last-event'),
-      'suppress_4byte_as': conf_str('asn-4-byte') == 'false',
-      'local_as_prepend': conf_bool('local-as/configure_ns:prepend-global-as'),
-      'holdtime': state_int('hold-time-interval'),
-      'configured_holdtime': conf_int('hold-time/configure_ns:seconds'),
-      'keepalive': state_int('keep-alive-interval'),
-      'configured_keepalive': conf_int('keepalive'),
-      'active_prefix_count': count['active']['total'],
-      'received_prefix_count': count['received']['total'],
-      'accepted_prefix_count': count['received']['total'] - count['rejected']['total'],
-      'suppressed_prefix_count': count['suppressed']['total'],
-      'advertised_prefix_count': count['sent']['total'],
-      'flap_count': state_int('number-of-update-flaps')
-    }
-
-    if name not in result:
-      result[name] = {}
-    if peer['remote_as'] not in result[name]:
-      result[name][ peer['remote_as'] ] = []
-    result[name][ peer['remote_as'] ].append(peer)
+  instances = _xpath(
+      data,
+      "configure_ns:configure/configure_ns:router"
+      " | configure_ns:configure/configure_ns:service/configure_ns:vprn"
+  )
+  for instance in instances:
+    name = _find_txt(instance, "configure_ns:service-name") or "global"
+    if vrf and name != vrf:
+      continue
+    local_as = convert(int, _find_txt(instance, "configure_ns:autonomous-system"))
+    for n in _xpath(instance, "configure_ns:bgp/configure_ns:neighbor"):
+      ip_address = _find_txt(n, "configure_ns:ip-address")
+      stats = state.get((name, ip_address))
+      if stats is None:
+        # configured but no state reported, e.g. instance not operational
+        stats = etree.Element("neighbor")
+      peer = _peer(n, stats, name, local_as, ip_address)
+      result.setdefault(name, {}).setdefault(peer['remote_as'], []).append(peer)
 
   return result
+
+def _peer(n, stats, name, local_as, ip_address):
+  """
+  Builds the NAPALM detail dictionary from a configured neighbor and its indexed state
+  """
+  def conf_int(attr: str,default=0):
+    return convert( int, _find_txt(n,f"configure_ns:{attr}")) or default
+
+  def state_int(attr: str):
+    return convert( int, _find_txt(stats,f"state_ns:statistics/state_ns:{attr}"))
+
+  def conf_str(attr: str):
+    return _find_txt(n,f"configure_ns:{attr}")
+
+  def conf_bool(attr:str):
+    return conf_str(attr).lower() == "true"
+
+  def conf_list(attr:str):
+    policies = [ele.text for ele in n.xpath(attr,namespaces=NSMAP)]
+    return ",".join(policies)
+
+  def state_str(attr: str):
+    return _find_txt(stats,f"state_ns:statistics/state_ns:{attr}")
+
+  session_state = state_str('session-state')
+
+  count = {}
+  for attr in ['active','suppressed','rejected','sent','received']:
+    count[attr] = {}
+    for af in ('ipv4','ipv6'):
+      count[attr][af] = convert(
+          int,
+          _find_txt(
+              stats,
+              f"state_ns:statistics/state_ns:family-prefix/state_ns:{af}/state_ns:{attr}"
+          )
+      )
+    count[attr]['total'] = count[attr]['ipv4'] + count[attr]['ipv6']
+
+  peer = {
+    'up': session_state.lower()=="established",
+    'local_as': local_as,
+    'remote_as': conf_int('peer-as'),
+    'router_id': state_str('peer-identifier'),
+    'local_address': state_str('operational-local-address'),
+    'routing_table': name,
+    'local_address_configured': conf_str('local-address') != "",
+    'local_port': state_int('local-port'),
+    'remote_address': ip_address,
+    'remote_port': state_int('peer-port'),
+    'multihop': conf_int('multihop') > 0,
+    'multipath': conf_str('multipath-eligible') != "false",
+    'remove_private_as': conf_bool('remove-private/configure_ns:limited'),
+    'import_policy': conf_list('import/configure_ns:policy'),
+    'export_policy': conf_list('export/configure_ns:policy'),
+    'input_messages': state_int('received/state_ns:messages'),
+    'output_messages': state_int('sent/state_ns:messages'),
+    'input_updates': state_int('received/state_ns:updates'),
+    'output_updates': state_int('sent/state_ns:updates'),
+    'messages_queued_out': state_int('sent/state_ns:queues'),
+    'connection_state': session_state,
+    'previous_connection_state': state_str('last-state'),
+    'last_event': state_str('last-event'),
+    'suppress_4byte_as': conf_str('asn-4-byte') == 'false',
+    'local_as_prepend': conf_bool('local-as/configure_ns:prepend-global-as'),
+    'holdtime': state_int('hold-time-interval'),
+    'configured_holdtime': conf_int('hold-time/configure_ns:seconds'),
+    'keepalive': state_int('keep-alive-interval'),
+    'configured_keepalive': conf_int('keepalive'),
+    'active_prefix_count': count['active']['total'],
+    'received_prefix_count': count['received']['total'],
+    'accepted_prefix_count': count['received']['total'] - count['rejected']['total'],
+    'suppressed_prefix_count': count['suppressed']['total'],
+    'advertised_prefix_count': count['sent']['total'],
+    'flap_count': state_int('number-of-update-flaps')
+  }
+
+  return peer
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+
+import contextlib, gzip, os
+
+from lxml import etree
+
+from ..utils.streaming import RawGetConfig, TextReader, raw_reply
+
+CONF_NS = "urn:nokia.com:sros:ns:yang:sr:conf"
+
+@contextlib.contextmanager
+def _open_output(path_or_fileobj, compression=None):
+  """Opens the destination for writing bytes, compressing them if asked."""
+  if compression not in (None, "gzip", "zstd"):
+    raise ValueError("Unsupported compression: {}".format(compression))
+  is_path = isinstance(path_or_fileobj, (str, os.PathLike))
+  raw = open(path_or_fileobj, "wb") if is_path else path_or_fileobj
+  try:
+    if compression == "gzip":
+      with gzip.GzipFile(fileobj=raw, mode="wb") as out:
+        yield out
+    elif compression == "zstd":
+      try:
+        import zstandard
+      except ImportError:
+        raise ValueError("zstd compression requires the zstandard package")
+      with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as out:
+        yield out
+    else:
+      yield raw
+  finally:
+    if is_path:
+      raw.close()
+
+def _write_xml(reply, out):
+  """
+  Copies the <configure> element of the text of a <get-config> reply to out, one top-level
+  container at a time, releasing each one once it is written.
+  """
+  configure = "{%s}configure" % CONF_NS
+  events = etree.iterparse(
+    TextReader(reply), events=("start", "end"), huge_tree=True
+  )
+  for event, element in events:
+    if event == "start" and element.tag == configure:
+      break
+  else:
+    raise ValueError("No configure element in the reply")
+  with etree.xmlfile(out, encoding="utf-8") as xf:
+    with xf.element(configure, attrib=dict(element.attrib), nsmap=element.nsmap):
+      depth = 0
+      for event, child in events:
+        if event == "start":
+          depth += 1
+          continue
+        if depth == 0:
+          break
+        depth -= 1
+        if depth == 0:
+          xf.write(child)
+          child.clear(keep_tail=False)
+          while child.getprevious() is not None:
+            del element[0]
+
+def get_config_to(driver, path_or_fileobj, retrieve="running", format="xml", compression=None):
+  """
+  Writes a configuration of an open NokiaSROSDriver to a file or stream.
+
+  Unlike get_config, the configuration is not assembled into a string: the XML reply is
+  kept as the text received from the session, without the tree ncclient would build, and
+  serialized one top-level container at a time with etree.xmlfile; the MD-CLI output is
+  written line by line as it is received from the CLI channel. The response cache is not
+  used.
+
+  :param driver: open NokiaSROSDriver
+  :param path_or_fileobj: file name, or binary file-like object to write to
+  :param retrieve: datastore to write, "running", "startup" (same as running) or "candidate"
+  :param format: "xml" or "cli" (MD-CLI)
+  :param compression: None, "gzip", or "zstd" (requires the zstandard package)
+  """
+  if retrieve not in ("running", "startup", "candidate"):
+    raise ValueError("retrieve must be running, startup or candidate, not {}".format(retrieve))
+  source = "candidate" if retrieve == "candidate" else "running"
+  with _open_output(path_or_fileobj, compression) as out:
+    if format == "cli":
+      from ..sros import CLI_CANDIDATE_CONFIG_COMMANDS, CLI_RUNNING_CONFIG_COMMAND
+      commands = CLI_CANDIDATE_CONFIG_COMMANDS if source == "candidate" \
+        else [CLI_RUNNING_CONFIG_COMMAND]
+      separator = b""
+      lines = driver._iter_cli_lines(commands)
+      try:
+        for line in driver._config_lines(lines):
+          out.write(separator + line.encode("utf-8"))
+          separator = b"\n"
+        # _config_lines stops at the persistent indices: read the rest of the output up to
+        # the prompt, so that it is not taken as the reply of the next command
+        for _ in lines:
+          pass
+      finally:
+        lines.close()
+    else:
+      _write_xml(raw_reply(driver.conn, RawGetConfig, source=source), out)
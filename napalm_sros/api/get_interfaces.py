@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+
+
+from ncclient.xml_ import to_ele
+
+from ..nc_filters import GET_INTERFACES, GET_INTERFACES_COUNTERS, GET_PORTS_LAST_CLEARED
+from ..utils.filters import merge_filters, scope_filter
+from .util import _find_txt, _xpath
+
+PORT = ("port",)
+ROUTER_INTERFACE = ("router", "interface")
+
+def build_filter(filter, interfaces=None, ports=None):
+  """
+  Restricts a filter of ports and router interfaces to some of them.
+
+  When only one of interfaces and ports is given, the other kind of entry is left out.
+
+  :param filter: filter string with <port> and <router><interface> entries
+  :param interfaces: names of the router interfaces to select
+  :param ports: ids of the ports to select
+  """
+  if interfaces is None and ports is None:
+    return filter
+  return scope_filter(filter, {
+    PORT: ("port-id", ports or []),
+    ROUTER_INTERFACE: ("interface-name", interfaces or []),
+  })
+
+def get_interfaces(driver, interfaces=None, ports=None):
+  """
+  Same as NokiaSROSDriver.get_interfaces, for some router interfaces and ports only
+
+  The MAC address and speed of a router interface are those of its port, so the port of
+  an interface must be selected as well for these to be reported.
+
+  :param driver: open NokiaSROSDriver
+  :param interfaces: names of the router interfaces to return
+  :param ports: ids of the ports to return
+  """
+  result = to_ele(
+      driver._nc_get(
+          "get_interfaces",
+          filter=build_filter(GET_INTERFACES(R19=driver.R19), interfaces, ports),
+          with_defaults="report-all",
+      ).data_xml
+  )
+  return driver._parse_interfaces(result)
+
+def get_interfaces_counters(driver, interfaces=None, ports=None):
+  """
+  Same as NokiaSROSDriver.get_interfaces_counters, for some router interfaces and ports only
+
+  :param driver: open NokiaSROSDriver
+  :param interfaces: names of the router interfaces to return the counters of
+  :param ports: ids of the ports to return the counters of
+  """
+  result = to_ele(
+      driver._nc_get(
+          "get_interfaces_counters",
+          filter=build_filter(GET_INTERFACES_COUNTERS["_"], interfaces, ports),
+          with_defaults="report-all",
+      ).data_xml
+  )
+  return driver._parse_interfaces_counters(result)
+
+def sample_interfaces_counters(driver, sampler, interfaces=None, ports=None):
+  """
+  Reads the interface counters and returns their rates since the previous sample
+
+  The last-cleared-time of the ports is read along with the counters, so that the sampler
+  tells cleared counters from wrapped ones.
+
+  :param driver: open NokiaSROSDriver
+  :param sampler: CounterSampler keeping the previous sample, per hostname of the driver
+  :param interfaces: names of the router interfaces to sample
+  :param ports: ids of the ports to sample
+  :return: dict of interface name to dict of rates per second, see CounterSampler.rates
+  """
+  filter = merge_filters(GET_INTERFACES_COUNTERS["_"], GET_PORTS_LAST_CLEARED["_"])
+  result = to_ele(
+      driver.conn.get(
+          filter=build_filter(filter, interfaces, ports), with_defaults="report-all"
+      ).data_xml
+  )
+  timestamp = sampler.clock()
+  cleared = {
+    _find_txt(port, "state_ns:port-id"): _find_txt(
+        port, "state_ns:statistics/state_ns:last-cleared-time"
+    )
+    for port in _xpath(result, "state_ns:state/state_ns:port")
+  }
+  counters = driver._parse_interfaces_counters(result)
+  return sampler.rates(driver.hostname, counters, timestamp=timestamp, cleared=cleared)
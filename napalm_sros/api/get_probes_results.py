@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+
+
+import logging
+from xml.sax.saxutils import escape
+
+from ncclient.xml_ import to_xml, to_ele
+from napalm.base.helpers import convert
+
+from .util import _find_txt, _xpath
+
+#
+# Netconf filter of the SAA tests: their configuration (target, source, count) and the
+# statistics of the runs kept in their probe history, for all tests or a single owner/test
+#
+FILTER = """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <configure xmlns="urn:nokia.com:sros:ns:yang:sr:conf">
+            <saa>
+                <owner>
+                    <owner-name>{owner}</owner-name>
+                    <test>{test}</test>
+                    <type>
+                        <icmp-ping>
+                            <destination-address/>
+                            <count/>
+                            <source-address/>
+                        </icmp-ping>
+                    </type>
+                </owner>
+            </saa>
+        </configure>
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            <saa>
+                <owner>
+                    <owner-name>{owner}</owner-name>
+                    <test>{test}</test>
+                    <run-history>
+                        <run>
+                            <run-index/>
+                            <total-attempts/>
+                            <requests-failed-to-send/>
+                            <round-trip>
+                                <min/>
+                                <max/>
+                                <average/>
+                                <jitter/>
+                            </round-trip>
+                        </run>
+                    </run-history>
+                </owner>
+            </saa>
+        </state>
+    </filter>
+"""
+
+ICMP_PING = "configure_ns:type/configure_ns:icmp-ping"
+
+log = logging.getLogger(__file__)
+
+def build_filter(owner="", test=""):
+  """
+  Builds the <get> filter of get_probes_results.
+
+  :param owner: SAA owner to return the tests of, all owners if empty
+  :param test: SAA test to return, all tests if empty
+  """
+  return FILTER.format(owner=escape(owner), test=escape(test))
+
+def get_probes_results(conn, owner="", test=""):
+  data = to_ele(
+      conn.get(filter=build_filter(owner, test), with_defaults="report-all").data_xml
+  )
+  if log.isEnabledFor(logging.DEBUG):
+    log.debug(to_xml(data, pretty_print=True))
+  return _parse_probes_results(data)
+
+def _parse_probes_results(data):
+  runs = {}
+  for state in _xpath(data, "state_ns:state/state_ns:saa/state_ns:owner"):
+    key = (_find_txt(state, "state_ns:owner-name"), _find_txt(state, "state_ns:test"))
+    runs[key] = sorted(
+      _xpath(state, "state_ns:run-history/state_ns:run"),
+      key=lambda r: convert(int, _find_txt(r, "state_ns:run-index"), default=-1),
+    )
+
+  probes_results = {}
+  for probe in _xpath(data, "configure_ns:configure/configure_ns:saa/configure_ns:owner"):
+    probe_name = _find_txt(probe, "configure_ns:owner-name")
+    test_name = _find_txt(probe, "configure_ns:test")
+    if probe_name == "" or test_name == "":
+      continue
+    history = runs.get((probe_name, test_name), [])
+    current = history[-1] if history else None
+    last = history[-2] if len(history) > 1 else None
+    probes_results.setdefault(probe_name, {})[test_name] = {
+      "probe_type": "icmp-ping",
+      "target": _find_txt(probe, f"{ICMP_PING}/configure_ns:destination-address"),
+      "source": _find_txt(probe, f"{ICMP_PING}/configure_ns:source-address"),
+      "probe_count": convert(int, _find_txt(probe, f"{ICMP_PING}/configure_ns:count")),
+      "rtt": _round_trip(current, "average"),
+      "round_trip_jitter": _round_trip(current, "jitter"),
+      "current_test_min_delay": _round_trip(current, "min"),
+      "current_test_max_delay": _round_trip(current, "max"),
+      "current_test_avg_delay": _round_trip(current, "average"),
+      "last_test_min_delay": _round_trip(last, "min"),
+      "last_test_max_delay": _round_trip(last, "max"),
+      "last_test_avg_delay": _round_trip(last, "average"),
+      "last_test_loss": _loss(last),
+      "global_test_min_delay": -1.0, # default value as SROS does not have global_test
+      "global_test_max_delay": -1.0, # default value as SROS does not have global_test
+      "global_test_avg_delay": -1.0, # default value as SROS does not have global_test
+    }
+  return probes_results
+
+def _round_trip(run, statistic):
+  if run is None:
+    return -1.0
+  return convert(float, _find_txt(run, f"state_ns:round-trip/state_ns:{statistic}"), default=-1.0)
+
+def _loss(run):
+  """
+  Share of the requests of a run that failed to be sent out, as computed from '/show saa'
+  """
+  if run is None:
+    return -1
+  attempts = convert(int, _find_txt(run, "state_ns:total-attempts"), default=0)
+  failed = convert(int, _find_txt(run, "state_ns:requests-failed-to-send"), default=0)
+  return convert(int, failed / attempts, default=-1) if attempts > 0 else -1
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+
+import datetime, ipaddress, logging
+from xml.sax.saxutils import escape
+
+from ncclient.xml_ import to_xml, to_ele
+from napalm.base.helpers import convert
+
+from .util import _find_txt, _xpath
+
+#
+# Netconf filter of the route-table state: one <route> selection per candidate prefix, so that
+# routers and VPRNs without a matching route return no route entries
+#
+ROUTE = """
+<route>
+    <{af}-prefix>{prefix}</{af}-prefix>
+    <protocol/>
+    <preference/>
+    <metric/>
+    <active/>
+    <last-update/>
+    <nexthop>
+        <nexthop-id/>
+        <address/>
+        <interface-name/>
+        <active/>
+    </nexthop>
+</route>
+"""
+
+INSTANCE = """
+<route-table>
+    <unicast>
+        <{af}>{routes}</{af}>
+    </unicast>
+</route-table>
+"""
+
+FILTER = """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            <system>
+                <current-time/>
+            </system>
+            <router>
+                <router-name/>
+                <autonomous-system/>
+                {instance}
+            </router>
+            <service>
+                <vprn>
+                    <service-name/>
+                    <oper-service-id/>
+                    <autonomous-system/>
+                    {instance}
+                </vprn>
+            </service>
+        </state>
+    </filter>
+"""
+
+#
+# Netconf filter of the BGP neighbors that are the next-hop of a returned BGP route, in the
+# routers and VPRNs of these routes only
+#
+NEIGHBOR = """
+<neighbor>
+    <ip-address>{address}</ip-address>
+    <statistics>
+        <peer-identifier/>
+        <peer-as/>
+    </statistics>
+</neighbor>
+"""
+
+NEIGHBORS_FILTER = """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            {routers}
+            <service>{vprns}</service>
+        </state>
+    </filter>
+"""
+
+ROUTER_NEIGHBORS = "<router><router-name>{name}</router-name><bgp>{neighbors}</bgp></router>"
+VPRN_NEIGHBORS = "<vprn><service-name>{name}</service-name><bgp>{neighbors}</bgp></vprn>"
+
+#
+# Subtree filters cannot select a range of prefixes: the more specific routes of a
+# destination are listed one by one in the filter, for at most this many of them (e.g. an
+# IPv4 /26). Wider longer lookups are not served from the state tree, see scoped()
+#
+LONGER_PREFIX_LIMIT = 127
+
+log = logging.getLogger(__file__)
+
+def scoped(destination, longer=False):
+  """
+  Returns True if the routes to destination can be selected by prefix in the state tree,
+  i.e. for a destination and, with longer, if it has at most LONGER_PREFIX_LIMIT more
+  specific prefixes.
+  """
+  if not destination:
+    return False
+  if not longer:
+    return True
+  network = ipaddress.ip_network(destination, strict=False)
+  return 2 ** (network.max_prefixlen - network.prefixlen + 1) - 1 <= LONGER_PREFIX_LIMIT
+
+def _candidates(destination, longer):
+  """
+  Returns the address family and the prefixes to select: the destination itself for an
+  exact lookup, every covering prefix for a longest match, the destination and its more
+  specific prefixes for longer.
+  """
+  if not destination:
+    raise ValueError("get_route_to needs a destination prefix or address")
+  if not scoped(destination, longer):
+    raise ValueError(
+        "longer lookup of {} selects more than {} prefixes".format(
+            destination, LONGER_PREFIX_LIMIT
+        )
+    )
+  network = ipaddress.ip_network(destination, strict=False)
+  af = "ipv4" if network.version == 4 else "ipv6"
+  if longer:
+    return af, network, [
+      subnet
+      for prefixlen in range(network.prefixlen, network.max_prefixlen + 1)
+      for subnet in network.subnets(new_prefix=prefixlen)
+    ]
+  if "/" in destination:
+    return af, network, [network]
+  return af, network, [network.supernet(new_prefix=n) for n in range(network.prefixlen, -1, -1)]
+
+def build_filter(destination, longer=False):
+  """
+  Builds the <get> filter of get_route_to.
+
+  :param destination: prefix, or address for a longest prefix match
+  :param longer: also retrieve the more specific routes, see scoped()
+  :raises ValueError: if destination is empty, or a longer lookup is not scoped()
+  """
+  af, _, prefixes = _candidates(destination, longer)
+  routes = "".join(ROUTE.format(af=af, prefix=p) for p in prefixes)
+  return FILTER.format(instance=INSTANCE.format(af=af, routes=routes))
+
+def build_neighbors_filter(data, destination, protocol="", longer=False):
+  """
+  Builds the <get> filter of the BGP neighbors of the routes in the reply to build_filter,
+  or returns None if none of them is a BGP route.
+  """
+  routers, vprns = [], []
+  for kind, key, _, instance, matched in _matches(data, destination, protocol, longer):
+    addresses = sorted({
+      _find_txt(nexthop, "state_ns:address")
+      for _, route in matched
+      if _find_txt(route, "state_ns:protocol").lower() == "bgp"
+      for nexthop in _xpath(route, "state_ns:nexthop")
+    } - {""})
+    if not addresses:
+      continue
+    neighbors = "".join(NEIGHBOR.format(address=escape(a)) for a in addresses)
+    if kind == "router":
+      routers.append(ROUTER_NEIGHBORS.format(name=escape(key), neighbors=neighbors))
+    else:
+      vprns.append(VPRN_NEIGHBORS.format(name=escape(key), neighbors=neighbors))
+  if not routers and not vprns:
+    return None
+  return NEIGHBORS_FILTER.format(routers="".join(routers), vprns="".join(vprns))
+
+def _to_timestamp(time:str):
+  if time:
+    return datetime.datetime.strptime(time[:-1], "%Y-%m-%dT%H:%M:%S.%f").timestamp()
+  return 0
+
+def get_route_to(conn, destination="", protocol="", longer=False):
+  data = to_ele(
+      conn.get(
+          filter=build_filter(destination, longer),
+          with_defaults="report-all",
+      ).data_xml
+  )
+  if log.isEnabledFor(logging.DEBUG):
+    log.debug(to_xml(data, pretty_print=True))
+  neighbors = None
+  neighbors_filter = build_neighbors_filter(data, destination, protocol, longer)
+  if neighbors_filter is not None:
+    neighbors = to_ele(conn.get(filter=neighbors_filter).data_xml)
+  return _parse_route_to(data, destination, protocol, longer, neighbors)
+
+def _instances(data):
+  """
+  Returns (kind, key, name, element) of the routers and VPRNs in a reply: the key selects
+  the instance in a filter, the name is reported as routing_table.
+  """
+  instances = []
+  for router in _xpath(data, "state_ns:state/state_ns:router"):
+    name = _find_txt(router, "state_ns:router-name")
+    instances.append(("router", name, name, router))
+  for vprn in _xpath(data, "state_ns:state/state_ns:service/state_ns:vprn"):
+    key = _find_txt(vprn, "state_ns:service-name")
+    instances.append(("vprn", key, _find_txt(vprn, "state_ns:oper-service-id") or key, vprn))
+  return instances
+
+def _matches(data, destination, protocol, longer):
+  """
+  Returns (kind, key, name, instance element, [(prefix, route element)]) for the routers
+  and VPRNs with routes to destination.
+  """
+  af, network, prefixes = _candidates(destination, longer)
+  selected = set(prefixes)
+  matches = []
+  for kind, key, name, instance in _instances(data):
+    routes = _xpath(
+        instance, f"state_ns:route-table/state_ns:unicast/state_ns:{af}/state_ns:route"
+    )
+    matched = []
+    for route in routes:
+      prefix = ipaddress.ip_network(_find_txt(route, f"state_ns:{af}-prefix"), strict=False)
+      if protocol and _find_txt(route, "state_ns:protocol").lower() != protocol.lower():
+        continue
+      if prefix not in selected:
+        continue
+      if longer and (prefix.version != network.version or not prefix.subnet_of(network)):
+        continue
+      matched.append((prefix, route))
+    if not matched:
+      continue
+    if not longer and "/" not in destination:
+      # longest prefix match within this routing instance
+      longest = max(p.prefixlen for p, _ in matched)
+      matched = [(p, r) for p, r in matched if p.prefixlen == longest]
+    matches.append((kind, key, name, instance, matched))
+  return matches
+
+def _parse_route_to(data, destination, protocol="", longer=False, neighbors=None):
+  """
+  :param data: reply to build_filter
+  :param neighbors: reply to build_neighbors_filter, if any
+  """
+  current_time = _to_timestamp(_find_txt(data, "//state_ns:system/state_ns:current-time"))
+  bgp_neighbors = {} # (kind, key) -> ip-address -> neighbor
+  if neighbors is not None:
+    for kind, key, _, instance in _instances(neighbors):
+      bgp_neighbors[(kind, key)] = {
+        _find_txt(n, "state_ns:ip-address"): n
+        for n in _xpath(instance, "state_ns:bgp/state_ns:neighbor")
+      }
+
+  route_to = {}
+  for kind, key, name, instance, matched in _matches(data, destination, protocol, longer):
+    local_as = convert(int, _find_txt(instance, "state_ns:autonomous-system"), default=-1)
+    instance_neighbors = bgp_neighbors.get((kind, key), {})
+    for prefix, route in matched:
+      entries = route_to.setdefault(str(prefix), [])
+      for nexthop in _xpath(route, "state_ns:nexthop") or [route]:
+        entries.append(
+            _route(name, route, nexthop, local_as, instance_neighbors, current_time)
+        )
+  return route_to
+
+def _route(name, route, nexthop, local_as, neighbors, current_time):
+  """
+  Builds the NAPALM route dictionary of one next-hop of a route
+  """
+  route_protocol = _find_txt(route, "state_ns:protocol").lower()
+  preference = convert(int, _find_txt(route, "state_ns:preference"), default=-1)
+  metric = convert(int, _find_txt(route, "state_ns:metric"), default=-1)
+  active = _find_txt(route, "state_ns:active") == "true"
+  next_hop = _find_txt(nexthop, "state_ns:address")
+  last_update = _to_timestamp(_find_txt(route, "state_ns:last-update"))
+
+  attributes = {}
+  if route_protocol == "bgp":
+    neighbor = neighbors.get(next_hop)
+    attributes = {
+      "local_as": local_as,
+      "remote_as": convert(
+          int, _find_txt(neighbor, "state_ns:statistics/state_ns:peer-as"), default=-1
+      ) if neighbor is not None else -1,
+      "peer_id": _find_txt(neighbor, "state_ns:statistics/state_ns:peer-identifier")
+          if neighbor is not None else "",
+      "as_path": "",
+      "communities": [],
+      "local_preference": -1,
+      "preference2": preference,
+      "metric": metric,
+      "metric2": -1,
+    }
+  elif route_protocol == "ospf":
+    attributes = {"cost": metric}
+
+  return {
+    "protocol": route_protocol,
+    "current_active": active,
+    "last_active": False, # SR OS does not report this
+    "age": convert(int, current_time - last_update, default=0) if last_update else 0,
+    "next_hop": next_hop,
+    "outgoing_interface": _find_txt(nexthop, "state_ns:interface-name"),
+    "selected_next_hop": active and _find_txt(nexthop, "state_ns:active") != "false",
+    "preference": preference,
+    "inactive_reason": "",
+    "routing_table": name,
+    "protocol_attributes": attributes,
+  }
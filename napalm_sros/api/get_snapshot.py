@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+import logging, traceback
+
+from ncclient.xml_ import to_ele
+
+from ..nc_filters import GET_ARP_TABLE, GET_ENVIRONMENT, GET_FACTS, GET_INTERFACES, \
+     GET_INTERFACES_COUNTERS, GET_INTERFACES_IP, GET_LLDP_NEIGHBORS, \
+     GET_LLDP_NEIGHBORS_DETAIL, GET_NETWORK_INSTANCES, GET_NTP_PEERS, GET_NTP_SERVERS, \
+     GET_OPTICS, GET_PROBES_CONFIG, GET_SNMP_INFORMATION, GET_USERS
+from ..utils.filters import merge_filters
+from .util import _xpath
+
+def _parse_interfaces_counters(driver, result):
+  """
+  get_interfaces_counters of a merged reply: the ports and router interfaces without
+  statistics were only returned for the other getters, and are left out like in the reply
+  to its own filter.
+  """
+  counters = driver._parse_interfaces_counters(result)
+  names = set(
+    _xpath(result, "state_ns:state/state_ns:port[state_ns:statistics]/state_ns:port-id/text()")
+  )
+  names.update(_xpath(
+    result,
+    "state_ns:state/state_ns:router/state_ns:interface[state_ns:statistics]"
+    "/state_ns:interface-name/text()",
+  ))
+  return {name: value for name, value in counters.items() if name in names}
+
+#
+# Getters that can share a single <get>:
+# getter name -> (filter builder, with-defaults mode, reply parser: name of a method of the
+# driver, or a function of the driver and the reply)
+#
+SNAPSHOT_GETTERS = {
+  "get_facts": (lambda d: GET_FACTS["_"], None, "_parse_facts"),
+  "get_interfaces": (lambda d: GET_INTERFACES(R19=d.R19), "report-all", "_parse_interfaces"),
+  "get_interfaces_counters": (
+    lambda d: GET_INTERFACES_COUNTERS["_"], "report-all", _parse_interfaces_counters
+  ),
+  "get_network_instances": (
+    lambda d: GET_NETWORK_INSTANCES["_"].format(instance_name=""),
+    "report-all",
+    "_parse_network_instances",
+  ),
+  "get_optics": (lambda d: GET_OPTICS["_"], "report-all", "_parse_optics"),
+  "get_arp_table": (lambda d: GET_ARP_TABLE["_"].format(vrf=""), "report-all", "_parse_arp_table"),
+  "get_interfaces_ip": (lambda d: GET_INTERFACES_IP["_"], "report-all", "_parse_interfaces_ip"),
+  "get_ntp_peers": (lambda d: GET_NTP_PEERS["_"], "report-all", "_parse_ntp_peers"),
+  "get_ntp_servers": (lambda d: GET_NTP_SERVERS["_"], "report-all", "_parse_ntp_servers"),
+  "get_snmp_information": (
+    lambda d: GET_SNMP_INFORMATION["_"], "report-all", "_parse_snmp_information"
+  ),
+  "get_users": (lambda d: GET_USERS["_"], "report-all", "_parse_users"),
+  "get_probes_config": (lambda d: GET_PROBES_CONFIG["_"], "report-all", "_parse_probes_config"),
+  "get_lldp_neighbors": (lambda d: GET_LLDP_NEIGHBORS["_"], None, "_parse_lldp_neighbors"),
+  "get_lldp_neighbors_detail": (
+    lambda d: GET_LLDP_NEIGHBORS_DETAIL["_"].format(port_id=""),
+    None,
+    "_parse_lldp_neighbors_detail",
+  ),
+  "get_environment": (lambda d: GET_ENVIRONMENT["_"], "report-all", "_parse_environment"),
+}
+
+log = logging.getLogger(__file__)
+
+def get_snapshot(driver, getters=None):
+  """
+  Runs several getters of an open NokiaSROSDriver on a single NETCONF <get>.
+
+  The filters of the requested getters are merged into one subtree filter (one per
+  with-defaults mode), the reply is parsed once and the tree is handed to the parser of
+  each getter, so results are identical to calling the getters one by one.
+  Getters not listed in SNAPSHOT_GETTERS are called on the driver as usual.
+
+  :param driver: open NokiaSROSDriver
+  :param getters: list of getter names, by default all getters in SNAPSHOT_GETTERS
+  :return: dictionary with the result of each getter, keyed by getter name
+  """
+  if getters is None:
+    getters = list(SNAPSHOT_GETTERS)
+
+  snapshot = {}
+  groups = {}
+  for getter in getters:
+    if getter in SNAPSHOT_GETTERS:
+      groups.setdefault(SNAPSHOT_GETTERS[getter][1], []).append(getter)
+    else:
+      snapshot[getter] = getattr(driver, getter)()
+
+  for with_defaults, names in groups.items():
+    try:
+      merged_filter = merge_filters(*[SNAPSHOT_GETTERS[n][0](driver) for n in names])
+      result = to_ele(
+          driver._nc_get(
+              "get_snapshot", filter=merged_filter, with_defaults=with_defaults
+          ).data_xml
+      )
+    except Exception as e:
+      print("Error in method get snapshot : {}".format(e))
+      log.error("Error in method get snapshot : %s" % traceback.format_exc())
+      for name in names:
+        snapshot[name] = None
+      continue
+
+    for name in names:
+      try:
+        parser = SNAPSHOT_GETTERS[name][2]
+        if callable(parser):
+          snapshot[name] = parser(driver, result)
+        else:
+          snapshot[name] = getattr(driver, parser)(result)
+      except Exception as e:
+        print("Error in method get snapshot ({}) : {}".format(name, e))
+        log.error("Error in method get snapshot (%s) : %s" % (name, traceback.format_exc()))
+        snapshot[name] = None
+
+  return {getter: snapshot[getter] for getter in getters}
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+from xml.sax.saxutils import escape
+
+from lxml import etree
+
+from .get_interfaces import build_filter
+from ..nc_filters import GET_ARP_TABLE, GET_BGP_CONFIG, GET_INTERFACES_COUNTERS, \
+     GET_MAC_ADDRESS_TABLE_STATE
+from ..utils.streaming import RawGet, iter_entries, raw_reply
+from .util import _find_txt, NSMAP
+
+#
+# Generator variants of getters with potentially very large replies. The reply is kept as
+# the text received from the session, without the tree ncclient would build, and parsed
+# incrementally: every entry is released once it has been processed, so besides the text
+# of the reply only the entry being processed is held in memory.
+#
+
+ARP_NEIGHBORS = [
+  "state_ns:state/state_ns:router/state_ns:interface/"
+  "state_ns:ipv4/state_ns:neighbor-discovery/state_ns:neighbor",
+  "state_ns:state/state_ns:service/state_ns:vprn/state_ns:interface/"
+  "state_ns:ipv4/state_ns:neighbor-discovery/state_ns:neighbor",
+]
+
+PORTS = "state_ns:state/state_ns:port"
+ROUTER_INTERFACES = "state_ns:state/state_ns:router/state_ns:interface"
+
+FDB_MACS = "state_ns:state/state_ns:service/state_ns:vpls/state_ns:fdb/state_ns:mac"
+
+BGP_ROUTER = "configure_ns:configure/configure_ns:router"
+BGP_VPRN = "configure_ns:configure/configure_ns:service/configure_ns:vprn"
+
+def _get(driver, **kwargs):
+  return raw_reply(driver.conn, RawGet, **kwargs)
+
+def iter_arp_table(driver, vrf=""):
+  """
+  Same as NokiaSROSDriver.get_arp_table, one entry at a time
+
+  :param driver: open NokiaSROSDriver
+  :param vrf: VRF to return the entries of, all VRFs if empty
+  :return: generator of ARP entries (dictionaries with interface, mac, ip and age)
+  """
+  source = _get(
+      driver, filter=GET_ARP_TABLE["_"].format(vrf=vrf), with_defaults="report-all"
+  )
+  for _, neighbor in iter_entries(source, ARP_NEIGHBORS):
+    # neighbor-discovery/ipv4/interface
+    interface = neighbor.getparent().getparent().getparent()
+    entry = driver._arp_entry(_find_txt(interface, "state_ns:interface-name"), neighbor)
+    if entry is not None:
+      yield entry
+
+def iter_interfaces_counters(driver, interfaces=None, ports=None):
+  """
+  Same as NokiaSROSDriver.get_interfaces_counters, one interface at a time
+
+  :param driver: open NokiaSROSDriver
+  :param interfaces: names of the router interfaces to return, see get_interfaces.build_filter
+  :param ports: ids of the ports to return
+  :return: generator of (interface name, counters) tuples
+  """
+  source = _get(
+      driver,
+      filter=build_filter(GET_INTERFACES_COUNTERS["_"], interfaces, ports),
+      with_defaults="report-all",
+  )
+  for path, entry in iter_entries(source, [PORTS, ROUTER_INTERFACES]):
+    if path == PORTS:
+      port_id = _find_txt(entry, "state_ns:port-id")
+      if port_id:
+        yield port_id, driver._port_counters(entry)
+    else:
+      if_name = _find_txt(entry, "state_ns:interface-name")
+      if if_name:
+        yield if_name, driver._router_interface_counters(entry)
+
+def iter_mac_address_table(driver, service=None):
+  """
+  Same as NokiaSROSDriver.get_mac_address_table, read from the VPLS forwarding databases in
+  the state tree one entry at a time
+
+  :param driver: open NokiaSROSDriver
+  :param service: name of the VPLS service to return the entries of, all services if None
+  :return: generator of MAC address table entries
+  """
+  source = _get(
+      driver,
+      filter=GET_MAC_ADDRESS_TABLE_STATE["_"].format(service_name=escape(service or "")),
+      with_defaults="report-all",
+  )
+  for _, mac in iter_entries(source, FDB_MACS):
+    entry = driver._mac_entry(mac)
+    if entry is not None:
+      yield entry
+
+def iter_bgp_config(driver, group="", neighbor=""):
+  """
+  Same as NokiaSROSDriver.get_bgp_config, one routing instance at a time
+
+  get_bgp_config merges groups with the same name across instances; here every instance
+  is reported on its own instead.
+
+  :param driver: open NokiaSROSDriver
+  :param group: only return this BGP group
+  :param neighbor: only return this BGP neighbor
+  :return: generator of (instance name, BGP config) tuples, "global" for the base router
+  """
+  source = _get(
+      driver,
+      filter=GET_BGP_CONFIG["_"].format(group_name=group, neighbor=neighbor),
+      with_defaults="report-all",
+  )
+  for path, instance in iter_entries(source, [BGP_ROUTER, BGP_VPRN]):
+    if not instance.xpath("configure_ns:bgp", namespaces=NSMAP):
+      continue
+    # Hand the instance to the regular parser in a tree of its own
+    data = etree.Element("data")
+    parent = etree.SubElement(data, "{%s}configure" % NSMAP["configure_ns"])
+    if path == BGP_VPRN:
+      name = _find_txt(instance, "configure_ns:service-name")
+      parent = etree.SubElement(parent, "{%s}service" % NSMAP["configure_ns"])
+    else:
+      name = "global"
+    parent.append(instance)
+    bgp_config = driver._parse_bgp_config(data, group, neighbor)
+    if bgp_config:
+      yield name, bgp_config
@@ -16,13 +16,33 @@
 # License for the specific language governing permissions and limitations under
 # the License.
 
-import logging, traceback
+import functools, logging, traceback
+
+from lxml import etree
 
 NSMAP = {
  "state_ns": "urn:nokia.com:sros:ns:yang:sr:state",
  "configure_ns": "urn:nokia.com:sros:ns:yang:sr:conf",
 }
 
+@functools.lru_cache(maxsize=4096)
+def _compile_xpath(path, namespaces):
+    return etree.XPath(path, namespaces=dict(namespaces))
+
+def _xpath(xml_tree, path, namespaces=NSMAP):
+    """
+    Evaluates an XPath expression against an XML tree.
+
+    Compiled expressions are cached by (path, namespaces), so lxml does not parse the same
+    expression again for every element it is applied to.
+
+    :param xml_tree:   the XML Tree object. Assumed is <type 'lxml.etree._Element'>.
+    :param path:       XPath to be applied
+    :param namespaces: prefix-namespace mappings to process XPath
+    :return: the XPath result (list of elements/strings, or a string/number/boolean)
+    """
+    return _compile_xpath(path, tuple(namespaces.items()) if namespaces else ())(xml_tree)
+
 def _find_txt(xml_tree, path, default="", namespaces=NSMAP):
     """
     Extracts the text value from an XML tree, using XPath.
@@ -36,8 +56,8 @@ def _find_txt(xml_tree, path, default="", namespaces=NSMAP):
     """
     value = ""
     try:
-        xpath_applied = xml_tree.xpath(
-            path, namespaces=namespaces
+        xpath_applied = _xpath(
+            xml_tree, path, namespaces=namespaces
         )  # will consider the first match only
         xpath_length = len(xpath_applied)  # get a count of items in XML tree
         if xpath_length and xpath_applied[0] is not None:
@@ -59,3 +79,29 @@ def _find_txt(xml_tree, path, default="", namespaces=NSMAP):
         logging.error("Error while finding text in xml: %s" % traceback.format_exc())
         value = default
     return str(value)
+
+def _index_bgp_neighbors(data):
+    """
+    Indexes the BGP neighbor state of a reply in a single pass.
+
+    The base router is reported as instance "global" and each VPRN by its service name,
+    matching the instance names used for the configuration side.
+
+    :param data: <data> element of a NETCONF reply holding the state tree
+    :return: tuple ({(instance, ip-address): neighbor element}, {instance: oper-router-id})
+    """
+    neighbors = {}
+    router_ids = {}
+    instances = [("global", r) for r in _xpath(data, "state_ns:state/state_ns:router")]
+    instances += [
+        (_find_txt(v, "state_ns:service-name"), v)
+        for v in _xpath(data, "state_ns:state/state_ns:service/state_ns:vprn")
+    ]
+    for name, instance in instances:
+        router_id = _find_txt(instance, "state_ns:oper-router-id")
+        if router_id and not router_ids.get(name):
+            router_ids[name] = router_id
+        for neighbor in _xpath(instance, "state_ns:bgp/state_ns:neighbor"):
+            ip_address = _find_txt(neighbor, "state_ns:ip-address")
+            neighbors.setdefault((name, ip_address), neighbor)
+    return neighbors, router_ids
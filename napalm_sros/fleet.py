@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+#
+# The contents of this file are licensed under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with the
+# License. You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations under
+# the License.
+
+"""
+Runs getters across many devices.
+
+Devices are polled by a bounded pool of threads, one NETCONF session per device, while the
+replies are parsed by a pool of worker processes. Fetching is latency bound and parsing is
+CPU bound, so the two are scaled independently.
+"""
+import collections
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from lxml import etree
+from napalm.base.exceptions import CommandErrorException, ConnectionException
+
+from .api.get_snapshot import SNAPSHOT_GETTERS
+from .sros import NokiaSROSDriver, POWER_UTILIZATION_COMMAND
+from .utils.streaming import reply_bytes
+
+log = logging.getLogger(__file__)
+
+NC_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+#
+# Result of one getter on one device. timing holds the seconds spent in "fetch" and
+# "parse"; error is None on success, or the exception (result is then None).
+#
+Record = collections.namedtuple("Record", "hostname getter result timing error")
+
+# driver without connection whose parsers are used, one per thread: with parse_workers=0
+# the I/O threads parse concurrently, each for a device of its own release
+_parsers = threading.local()
+
+
+def _parse(parser, data, r19, power_output=None):
+    """Parses a serialized reply in a worker process, returns (result, seconds)."""
+    start = time.monotonic()
+    _parser_driver = getattr(_parsers, "driver", None)
+    if _parser_driver is None:
+        _parser_driver = _parsers.driver = NokiaSROSDriver("parser", "", "")
+    _parser_driver.R19 = r19
+    root = etree.fromstring(data, etree.XMLParser(huge_tree=True))
+    if etree.QName(root).localname != "data":
+        root = root.find("{%s}data" % NC_NS)
+    if callable(parser):
+        # a function of get_snapshot, see SNAPSHOT_GETTERS
+        result = parser(_parser_driver, root)
+    elif power_output is not None:
+        result = getattr(_parser_driver, parser)(root, power_output)
+    else:
+        result = getattr(_parser_driver, parser)(root)
+    return result, time.monotonic() - start
+
+
+class _InlineExecutor:
+    """Runs the parsers in the calling thread, when no worker processes are wanted."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def collect(
+    inventory,
+    getters,
+    max_sessions=16,
+    parse_workers=None,
+    timeout=300,
+    retries=1,
+    driver_class=NokiaSROSDriver,
+):
+    """
+    Runs getters on every device of an inventory and yields the results as they complete.
+
+    Getters listed in SNAPSHOT_GETTERS are fetched by the I/O threads and parsed in the
+    process pool; other getters are called on the driver in the I/O thread.
+
+    :param inventory: iterable of dicts with hostname, username, password and optionally
+                      timeout and optional_args, as taken by NokiaSROSDriver
+    :param getters: list of getter names, e.g. ["get_facts", "get_interfaces"]
+    :param max_sessions: number of devices polled at the same time
+    :param parse_workers: number of parser processes, None for one per CPU, 0 to parse in
+                          the I/O threads
+    :param timeout: seconds after which the session of a device is closed: the getter in
+                    progress and the remaining ones fail with TimeoutError
+    :param retries: number of times a failing getter is retried on a new session
+    :param driver_class: driver to use, e.g. a subclass of NokiaSROSDriver
+    :return: generator of Record tuples, in order of completion
+    """
+    records = queue.Queue()
+    if parse_workers != 0:
+        # the I/O threads hold locks, which a forked worker process would inherit
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        parser_pool = ProcessPoolExecutor(parse_workers, mp_context=context)
+    else:
+        parser_pool = _InlineExecutor()
+    # bounds the replies waiting to be parsed, so I/O threads cannot outrun the parsers
+    pending = threading.BoundedSemaphore(max(2 * (parse_workers or 4), max_sessions))
+    io_pool = ThreadPoolExecutor(max_sessions)
+
+    def parsed(hostname, getter, fetch_time, future):
+        try:
+            (result, parse_time), error = future.result(), None
+        except Exception as e:
+            result, parse_time, error = None, 0.0, e
+        finally:
+            pending.release()
+        timing = {"fetch": fetch_time, "parse": parse_time}
+        records.put(Record(hostname, getter, result, timing, error))
+
+    def timed_out(hostname):
+        return TimeoutError("{}: timeout of {}s".format(hostname, timeout))
+
+    def poll(device):
+        hostname = device["hostname"]
+        expired = threading.Event()
+        session = [None]  # driver of the device, closed by the watchdog at the deadline
+
+        def expire():
+            expired.set()
+            _close(session[0])
+
+        # a getter blocked on the device fails once its session is torn down
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            for getter in getters:
+                for attempt in range(retries + 1):
+                    if expired.is_set():
+                        records.put(Record(hostname, getter, None, {}, timed_out(hostname)))
+                        break
+                    start = time.monotonic()
+                    try:
+                        if session[0] is None:
+                            session[0] = _open(driver_class, device)
+                            if expired.is_set():
+                                raise timed_out(hostname)
+                        driver = session[0]
+                        if getter not in SNAPSHOT_GETTERS:
+                            result = getattr(driver, getter)()
+                            timing = {"fetch": time.monotonic() - start, "parse": 0.0}
+                            records.put(Record(hostname, getter, result, timing, None))
+                            break
+                        build_filter, with_defaults, parser = SNAPSHOT_GETTERS[getter]
+                        args = [parser, _fetch(driver, getter, build_filter, with_defaults)]
+                        args.append(driver.R19)
+                        if getter == "get_environment":
+                            power_output = driver._perform_cli_commands(
+                                [POWER_UTILIZATION_COMMAND], True, no_more=True
+                            )
+                            if power_output is None:
+                                raise CommandErrorException("power utilization not available")
+                            args.append(power_output)
+                    except Exception as e:
+                        _close(session[0])
+                        session[0] = None
+                        timing = {"fetch": time.monotonic() - start, "parse": 0.0}
+                        if expired.is_set():
+                            error = timed_out(hostname)
+                            records.put(Record(hostname, getter, None, timing, error))
+                            break
+                        log.warning(
+                            "%s: %s failed (attempt %d): %s", hostname, getter, attempt + 1, e
+                        )
+                        if attempt == retries:
+                            records.put(Record(hostname, getter, None, timing, e))
+                        continue
+                    fetch_time = time.monotonic() - start
+                    pending.acquire()
+                    parser_pool.submit(_parse, *args).add_done_callback(
+                        lambda f, g=getter, t=fetch_time: parsed(hostname, g, t, f)
+                    )
+                    break
+        finally:
+            watchdog.cancel()
+            _close(session[0])
+
+    try:
+        futures = [io_pool.submit(poll, device) for device in inventory]
+        remaining = len(futures) * len(getters)
+        while remaining:
+            try:
+                record = records.get(timeout=1)
+            except queue.Empty:
+                # surface unexpected errors of the I/O threads rather than waiting forever
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                continue
+            remaining -= 1
+            yield record
+    finally:
+        io_pool.shutdown(wait=True)
+        parser_pool.shutdown(wait=True)
+
+
+def _open(driver_class, device):
+    driver = driver_class(
+        device["hostname"],
+        device["username"],
+        device["password"],
+        timeout=device.get("timeout", 60),
+        optional_args=device.get("optional_args"),
+    )
+    driver.open()
+    if driver.conn is None:
+        raise ConnectionException("Cannot connect to {}".format(device["hostname"]))
+    return driver
+
+
+def _fetch(driver, getter, build_filter, with_defaults):
+    return reply_bytes(
+        driver._nc_get(getter, filter=build_filter(driver), with_defaults=with_defaults)
+    )
+
+
+def _close(driver):
+    if driver is not None:
+        try:
+            driver.close()
+        except Exception:
+            log.debug("Error closing the session to %s", driver.hostname, exc_info=True)
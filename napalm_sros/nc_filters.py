@@ -117,6 +117,21 @@ GET_INTERFACES_COUNTERS = {
     """
 }
 
+# merged into GET_INTERFACES_COUNTERS to tell cleared counters from wrapped ones
+GET_PORTS_LAST_CLEARED = {
+    "_": """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            <port>
+                <statistics>
+                    <last-cleared-time />
+                </statistics>
+            </port>
+        </state>
+    </filter>
+    """
+}
+
 GET_NETWORK_INSTANCES = {
     "_": """
     <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
@@ -646,6 +661,74 @@ GET_IPV6_NEIGHBORS_TABLE = {
     """
 }
 
+# neighbor cache of every IPv6 interface, used instead of the CLI when the state getter is enabled
+GET_IPV6_NEIGHBORS_STATE = {
+    "_": """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            <router>
+                <router-name/>
+                <interface>
+                    <interface-name/>
+                    <ipv6>
+                        <neighbor-discovery>
+                            <neighbor>
+                                <ipv6-address/>
+                                <mac-address/>
+                                <state/>
+                                <timer/>
+                            </neighbor>
+                        </neighbor-discovery>
+                    </ipv6>
+                </interface>
+            </router>
+            <service>
+                <vprn>
+                    <service-name/>
+                    <interface>
+                        <interface-name/>
+                        <ipv6>
+                            <neighbor-discovery>
+                                <neighbor>
+                                    <ipv6-address/>
+                                    <mac-address/>
+                                    <state/>
+                                    <timer/>
+                                </neighbor>
+                            </neighbor-discovery>
+                        </ipv6>
+                    </interface>
+                </vprn>
+            </service>
+        </state>
+    </filter>
+    """
+}
+
+# forwarding database of the VPLS services, all of them if service_name is empty
+GET_MAC_ADDRESS_TABLE_STATE = {
+    "_": """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            <service>
+                <vpls>
+                    <service-name>{service_name}</service-name>
+                    <fdb>
+                        <mac>
+                            <address/>
+                            <type/>
+                            <locale/>
+                            <sap/>
+                            <sdp/>
+                        </mac>
+                    </fdb>
+                </vpls>
+            </service>
+        </state>
+    </filter>
+    """
+}
+
 
 GET_ENVIRONMENT = {
     "_": """
@@ -705,3 +788,54 @@ GET_ENVIRONMENT = {
     </filter>
     """
 }
+
+# identifiers of the configuration commits, used to tell whether the running configuration
+# has changed
+GET_COMMIT_HISTORY = {
+    "_": """
+    <filter xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+        <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+            <system>
+                <management-interface>
+                    <commit-history>
+                        <commit-id>
+                            <id/>
+                            <timestamp/>
+                        </commit-id>
+                    </commit-history>
+                </management-interface>
+            </system>
+        </state>
+    </filter>
+    """
+}
+
+# md-compare action of the global operations model, reports the changes from the running
+# to the candidate configuration in MD-CLI format, like the MD-CLI compare command
+OPER_GLOBAL_NS = "urn:nokia.com:sros:ns:yang:sr:oper-global"
+
+COMPARE_CONFIG = f"""
+    <action xmlns="urn:ietf:params:xml:ns:yang:1">
+        <global-operations xmlns="{OPER_GLOBAL_NS}">
+            <md-compare>
+                <path>
+                    <subtree-path>/configure</subtree-path>
+                </path>
+                <format>md-cli</format>
+                <source>
+                    <running/>
+                </source>
+                <destination>
+                    <candidate/>
+                </destination>
+            </md-compare>
+        </global-operations>
+    </action>
+    """
+
+# runs an MD-CLI command, the output is returned in md-cli-output-block
+MD_CLI_RAW_COMMAND = f"""
+    <md-cli-raw-command xmlns="{OPER_GLOBAL_NS}">
+        <md-cli-input-line>{{command}}</md-cli-input-line>
+    </md-cli-raw-command>
+    """
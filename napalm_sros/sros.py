@@ -21,11 +21,15 @@
 Napalm driver for SROS.
 """
 # import standard library
+import codecs
+import hashlib
 import json
 import time
 import re
+import select
 import datetime
 import traceback
+from xml.sax.saxutils import escape
 import xmltodict
 from dictdiffer import diff
 import paramiko
@@ -42,27 +46,74 @@ from napalm.base.exceptions import (
     ReplaceConfigException,
     CommitError,
     CommandErrorException,
+    CommandTimeoutException,
+    ConnectionClosedException,
 )
 from napalm.base.helpers import convert, ip, as_number
 import napalm.base.constants as C
 
 # import third party libraries
 from ncclient import manager
+from ncclient.operations.rpc import RPCError
 from ncclient.xml_ import to_ele, to_xml
 
 # import local modules
 from napalm_sros.utils.parse_output_to_dict import parse_with_textfsm
-from napalm_sros.nc_filters import GET_ARP_TABLE,GET_BGP_CONFIG,GET_ENVIRONMENT, \
+from napalm_sros.nc_filters import COMPARE_CONFIG,MD_CLI_RAW_COMMAND,OPER_GLOBAL_NS, \
+     GET_ARP_TABLE,GET_BGP_CONFIG,GET_COMMIT_HISTORY,GET_ENVIRONMENT, \
      GET_FACTS,GET_INTERFACES,GET_INTERFACES_COUNTERS,GET_INTERFACES_IP, \
-     GET_IPV6_NEIGHBORS_TABLE,GET_LLDP_NEIGHBORS,GET_LLDP_NEIGHBORS_DETAIL, \
+     GET_IPV6_NEIGHBORS_STATE,GET_IPV6_NEIGHBORS_TABLE,GET_LLDP_NEIGHBORS,GET_LLDP_NEIGHBORS_DETAIL, \
      GET_NETWORK_INSTANCES,GET_NTP_PEERS,GET_NTP_SERVERS,GET_OPTICS, \
      GET_PROBES_CONFIG,GET_ROUTE_TO,GET_SNMP_INFORMATION,GET_USERS
 
-from .api import get_bgp_neighbors, get_bgp_neighbors_detail
+from .api import get_bgp_neighbors, get_bgp_neighbors_detail, get_route_to, \
+    iter_mac_address_table
+from .api import get_probes_results as get_probes_results_state
+from .api.get_route_to import scoped as route_to_scoped
+from .api.util import _xpath
+from .utils.cache import ConfigStore, ResponseCache
+from .utils.edit_chunks import split_config
+from .utils.session_pool import SESSION_POOL
+from .utils.xml_diff import diff_xml
 import logging
 
 log = logging.getLogger(__file__)
 
+# Number of trailing characters of CLI output that are searched for the prompt
+PROMPT_SEARCH_WINDOW = 4096
+
+# Longest time (seconds) spent checking that a pooled MD-CLI shell is back at its prompt
+POOL_CHECK_TIMEOUT = 5
+
+# MD-CLI command reporting the power drawn, used by get_environment
+# JvB: on VSR this is 'power-supply'
+POWER_UTILIZATION_COMMAND = "/show chassis power-management utilization detail"
+
+# MD-CLI commands retrieving the running and candidate configurations
+CLI_RUNNING_CONFIG_COMMAND = "admin show configuration | no-more"
+CLI_CANDIDATE_CONFIG_COMMANDS = ["edit-config read-only", "info | no-more", "quit-config"]
+# MD-CLI commands comparing the candidate with the running configuration, from /configure
+CLI_COMPARE_COMMANDS = ["edit-config read-only", "compare | no-more", "quit-config"]
+
+class _SharedTransport:
+    """
+    Stands in for the SSH client of the CLI when the MD-CLI shell is a channel of the NETCONF
+    session: closing it closes the channel only.
+    """
+
+    def __init__(self, transport, channel):
+        self._transport = transport
+        self._channel = channel
+
+    def get_transport(self):
+        return self
+
+    def is_active(self):
+        return self._transport.is_active() and not self._channel.closed
+
+    def close(self):
+        self._channel.close()
+
 class NokiaSROSDriver(NetworkDriver):
     """Napalm driver for Skeleton."""
 
@@ -78,6 +129,9 @@ class NokiaSROSDriver(NetworkDriver):
         self.ssh_channel = None
         self.fmt = None
         self.locked = False
+        # whether all output of the MD-CLI shell has been read up to its prompt, so that
+        # the shell can be handed to another driver by the session pool
+        self.cli_at_prompt = False
         self.terminal_stdout_re = [
             re.compile(
                 r"[\r\n]*\!?\*?(\((ex|gl|pr|ro)\))?\[.*\][\r\n]+[ABCD]\:\S+\@\S+\#\s$"
@@ -98,15 +152,85 @@ class NokiaSROSDriver(NetworkDriver):
           r"(([0-9a-fA-F]{1,4}:){7,7}[0-9a-fA-F]{1,4}|([0-9a-fA-F]{1,4}:){1,7}:|([0-9a-fA-F]{1,4}:){1,6}:[0-9a-fA-F]{1,4}|([0-9a-fA-F]{1,4}:){1,5}(:[0-9a-fA-F]{1,4}){1,2}|([0-9a-fA-F]{1,4}:){1,4}(:[0-9a-fA-F]{1,4}){1,3}|([0-9a-fA-F]{1,4}:){1,3}(:[0-9a-fA-F]{1,4}){1,4}|([0-9a-fA-F]{1,4}:){1,2}(:[0-9a-fA-F]{1,4}){1,5}|[0-9a-fA-F]{1,4}:((:[0-9a-fA-F]{1,4}){1,6})|:((:[0-9a-fA-F]{1,4}){1,7}|:)|fe80:(:[0-9a-fA-F]{0,4}){0,4}%[0-9a-zA-Z]{1,}|::(ffff(:0{1,4}){0,1}:){0,1}((25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])|([0-9a-fA-F]{1,4}:){1,4}:((25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\.){3,3}(25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9]))"
         )
         self.cmd_line_pattern_re = re.compile(r"\*?(.*?)(>.*)*#.*?")
+        # MD-CLI prompt anywhere in the output, one follows each line entered
+        self.cli_prompt_re = re.compile(
+            r"\!?\*?(\((ex|gl|pr|ro)\))?\[.*\][\r\n]+[ABCD]\:\S+\@\S+\#\s"
+        )
+        # a line of output that is a prompt: the MD-CLI context, or the prompt itself with
+        # the command echoed after it
+        self.cli_prompt_line_re = re.compile(
+            r"^(\!?\*?(\((ex|gl|pr|ro)\))?\[.*\]|\*?[ABCD]\:\S+[#\$].*)$"
+        )
 
         if optional_args is None:
             optional_args = {}
         self.sros_get_format = optional_args.get("sros_get_format", "xml")
         self.sros_compare_format = optional_args.get("sros_compare_format", "json")
+        # "tree" diffs the XML configurations directly, "dictdiffer" converts them to
+        # dictionaries first (slow on large configurations, but matches list entries by position)
+        self.sros_compare_engine = optional_args.get("sros_compare_engine", "tree")
+        # "md-cli" returns the MD-CLI compare text of the router (md-compare), without
+        # retrieving both configurations, and fails if the router cannot provide it; "auto"
+        # does the same, but runs the MD-CLI compare command when md-compare is not available;
+        # "local" diffs the configurations here, in sros_compare_format
+        self.sros_compare_mode = optional_args.get("sros_compare_mode", "local")
         self.port = optional_args.get("port", 830)
+        # port of the MD-CLI shell, opened on a separate SSH connection
+        self.ssh_port = optional_args.get("ssh_port", 22)
         self.conn_ssh = optional_args.get("ssh_conn", None)
         self.ssh_channel = optional_args.get("ssh_channel", None)
 
+        # CLI read deadlines (seconds): a default for every command, optional overrides per
+        # command prefix e.g. {"admin show configuration": 300}, and the idle time after which
+        # a bulk configuration load is considered to be fully echoed back
+        self.cli_timeout = optional_args.get("cli_timeout", self.timeout)
+        self.cli_command_timeouts = optional_args.get("cli_command_timeouts", {})
+        self.cli_idle_timeout = optional_args.get("cli_idle_timeout", 0.5)
+        # largest number of configuration lines sent ahead of the prompts of the device when
+        # loading a text configuration
+        self.cli_load_window = optional_args.get("cli_load_window", 512)
+
+        # opt-in cache of NETCONF replies, keyed by (filter, with-defaults, datastore), with
+        # a default time to live, optional overrides per getter e.g. {"get_facts": 300} and
+        # an upper bound on the number of cached replies
+        self.response_cache = None
+        if optional_args.get("response_cache", False):
+            self.response_cache = ResponseCache(
+                ttl=optional_args.get("response_cache_ttl", 30),
+                ttls=optional_args.get("response_cache_ttls", {}),
+                maxsize=optional_args.get("response_cache_size", 128),
+            )
+
+        # opt-in store of the last running configuration, reused by get_config while the
+        # commit history of the device has not changed: True to keep it in memory, a directory
+        # to persist it, or a ConfigStore shared between drivers
+        self.running_config_cache = optional_args.get("running_config_cache", None)
+        if self.running_config_cache is True:
+            self.running_config_cache = ConfigStore()
+        elif isinstance(self.running_config_cache, str):
+            self.running_config_cache = ConfigStore(self.running_config_cache)
+
+        # opt-in split of large XML candidates into several edit-config RPCs of about this
+        # many elements each, with an optional progress callback(parts sent, total parts)
+        self.edit_config_chunk_size = optional_args.get("edit_config_chunk_size", None)
+        self.edit_config_progress = optional_args.get("edit_config_progress", None)
+
+        # opt-in reuse of NETCONF and SSH sessions across drivers: True for the pool shared by
+        # the process, or a SessionPool
+        self.session_pool = optional_args.get("session_pool", None)
+        if self.session_pool is True:
+            self.session_pool = SESSION_POOL
+
+        # how CLI commands reach the device: "ssh" logs in a second time on port 22, "netconf"
+        # opens the MD-CLI shell as another channel of the NETCONF SSH session (falling back to
+        # "ssh" when the device refuses it), "rpc" does the same and also runs the commands of
+        # cli() with the md-cli-raw-command RPC when the device supports it
+        self.sros_cli_transport = optional_args.get("sros_cli_transport", "ssh")
+
+        # getters that read the YANG state tree over NETCONF instead of parsing CLI output:
+        # True for all of them, or a list of getter names e.g. ["get_route_to"]
+        self.sros_state_getters = optional_args.get("sros_state_getters", [])
+
         # locking variables
         self.lock_disable = optional_args.get("lock_disable", False)
         self.session_config_lock = optional_args.get("config_lock", False)
@@ -124,19 +248,15 @@ class NokiaSROSDriver(NetworkDriver):
         try:
             if self.manager:
                 self.conn = self.manager.connect()
-            else:
-                self.conn = manager.connect(
-                    host=self.hostname,
-                    port=self.port,
-                    username=self.username,
-                    password=self.password,
-                    hostkey_verify=False,
-                    timeout=self.timeout,
+            elif self.session_pool is not None:
+                self.conn = self.session_pool.acquire(
+                    self._pool_key("netconf", self.port),
+                    self._connect_netconf,
+                    check=lambda conn: conn.connected,
                 )
-            revision = re.compile( ".*&revision=(.*).*" )
-            self.state_revisions = [ revision.match(i).groups()[0] for i in self.conn.server_capabilities if "nokia-state" in i ]
-            log.info( self.state_revisions )
-            self.R19 = '2016-07-06' in self.state_revisions # Older SR OS release e.g. '2022-10-19' or '2016-07-06'
+            else:
+                self.conn = self._connect_netconf()
+            self._set_state_revisions(self.conn.server_capabilities)
         except ConnectionException as ce:
             print("Error in opening netconf connection : {}".format(ce))
             log.error(
@@ -149,33 +269,269 @@ class NokiaSROSDriver(NetworkDriver):
                 "Error in opening netconf connection : %s" % traceback.format_exc()
             )
 
+    def _set_state_revisions(self, capabilities):
+        revision = re.compile( ".*&revision=(.*).*" )
+        self.state_revisions = [ revision.match(i).groups()[0] for i in capabilities if "nokia-state" in i ]
+        log.info( self.state_revisions )
+        self.R19 = '2016-07-06' in self.state_revisions # Older SR OS release e.g. '2022-10-19' or '2016-07-06'
+
+    def _connect_netconf(self):
+        return manager.connect(
+            host=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            hostkey_verify=False,
+            timeout=self.timeout,
+        )
+
+    def _pool_key(self, kind, port):
+        # sessions are only shared between drivers using the same credentials
+        secret = hashlib.sha256(self.password.encode("utf-8")).hexdigest()
+        return (kind, self.hostname, port, self.username, secret)
+
     def close(self):
         """Implement the NAPALM method close (mandatory)"""
         # Close the NETCONF connection with the host
 
         # netconf connection
         if self.conn is not None:
-            self.conn.close_session()
+            if self.session_pool is not None and not self.locked:
+                self.session_pool.release(
+                    self._pool_key("netconf", self.port),
+                    self.conn,
+                    lambda conn: conn.close_session(),
+                )
+                # the session may now be borrowed by another driver
+                self.conn = None
+            else:
+                self.conn.close_session()
         # ssh connection
         if self.conn_ssh is not None:
-            self.conn_ssh.close()
+            # a shell used to load a text configuration is left in a configuration context
+            if self.session_pool is not None and self.fmt != "text" and self.cli_at_prompt \
+                    and not isinstance(self.conn_ssh, _SharedTransport):
+                self.session_pool.release(
+                    self._pool_key("ssh", self.ssh_port),
+                    (self.conn_ssh, self.ssh_channel),
+                    lambda session: session[0].close(),
+                )
+                self.conn_ssh = self.ssh_channel = None
+            else:
+                self.conn_ssh.close()
+                self.conn_ssh = self.ssh_channel = None
+            self.cli_at_prompt = False
+
+    def _connect_ssh(self):
+        conn_ssh = paramiko.SSHClient()
+        conn_ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        conn_ssh.connect(
+            hostname=self.hostname,
+            port=self.ssh_port,
+            username=self.username,
+            password=self.password,
+            timeout = self.timeout
+        )
+        return conn_ssh, conn_ssh.invoke_shell()
+
+    def _ssh_session_ready(self, session):
+        """
+        Checks that a pooled MD-CLI shell is usable: reads any output left in the channel,
+        then enters an empty line and expects the channel to go silent after the prompt.
+        """
+        conn_ssh, ssh_channel = session
+        transport = conn_ssh.get_transport()
+        if transport is None or not transport.is_active() or ssh_channel.closed:
+            return False
+        try:
+            ssh_channel.send("\n")
+            output = self._drain_channel(
+                self.cli_idle_timeout,
+                channel=ssh_channel,
+                deadline=time.monotonic() + POOL_CHECK_TIMEOUT,
+            )
+        except Exception as e:
+            log.info("Pooled CLI session of %s is not usable: %s", self.hostname, e)
+            return False
+        return bool(self.terminal_stdout_re[0].search(output[-PROMPT_SEARCH_WINDOW:]))
+
+    def _open_netconf_shell(self):
+        """
+        Opens the MD-CLI shell as a channel of the SSH transport of the NETCONF session.
+        :return: (stand-in for the SSH client, channel), or None if that is not possible
+        """
+        transport = getattr(getattr(self.conn, "_session", None), "_transport", None)
+        if transport is None or not transport.is_active():
+            return None
+        channel = None
+        try:
+            channel = transport.open_session(timeout=self.timeout)
+            channel.get_pty()
+            channel.invoke_shell()
+        except Exception as e:
+            log.info("Cannot open a shell on the NETCONF session, logging in again: %s", e)
+            if channel is not None:
+                channel.close()
+            return None
+        return _SharedTransport(transport, channel), channel
 
     def _create_ssh(self):
         try:
-            self.conn_ssh = paramiko.SSHClient()
-            self.conn_ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self.conn_ssh.connect(
-                hostname=self.hostname,
-                port=22,
-                username=self.username,
-                password=self.password,
-                timeout = self.timeout
-            )
-            self.ssh_channel = self.conn_ssh.invoke_shell()
+            if self.sros_cli_transport in ("netconf", "rpc"):
+                session = self._open_netconf_shell()
+                if session is not None:
+                    self.conn_ssh, self.ssh_channel = session
+                    return
+            self.cli_at_prompt = False
+            if self.session_pool is not None:
+                self.conn_ssh, self.ssh_channel = self.session_pool.acquire(
+                    self._pool_key("ssh", self.ssh_port), self._connect_ssh, check=self._ssh_session_ready
+                )
+            else:
+                self.conn_ssh, self.ssh_channel = self._connect_ssh()
         except Exception as e:
             print("Error in opening a ssh connection: {}".format(e))
             log.error("Error in opening a ssh connection: %s" % traceback.format_exc())
 
+    def _use_state_getter(self, getter):
+        return self.sros_state_getters is True or getter in self.sros_state_getters
+
+    def _nc_get(self, getter, filter, with_defaults=None):
+        """Sends a <get>, or returns the cached reply when the response cache is enabled."""
+        if self.response_cache is None:
+            return self.conn.get(filter=filter, with_defaults=with_defaults)
+        return self.response_cache.fetch(
+            (filter, with_defaults, "operational"),
+            lambda: self.conn.get(filter=filter, with_defaults=with_defaults),
+            getter,
+        )
+
+    def _nc_get_config(self, getter, source):
+        """Sends a <get-config>, or returns the cached reply when the response cache is enabled."""
+        if self.response_cache is None:
+            return self.conn.get_config(source=source)
+        return self.response_cache.fetch(
+            (None, None, source), lambda: self.conn.get_config(source=source), getter
+        )
+
+    def _invalidate_response_cache(self):
+        if self.response_cache is not None:
+            self.response_cache.invalidate()
+
+    def _cli_timeout_for(self, command):
+        """Returns the read deadline for a command, using the longest matching prefix override."""
+        command = command.strip().lstrip("/")
+        timeout = self.cli_timeout
+        matched = ""
+        for prefix, value in self.cli_command_timeouts.items():
+            prefix = prefix.strip().lstrip("/")
+            if command.startswith(prefix) and len(prefix) > len(matched):
+                matched = prefix
+                timeout = value
+        return timeout
+
+    def _wait_recv_ready(self, deadline, channel=None):
+        """
+        Blocks until the CLI channel has data to read or the deadline expires.
+
+        :param deadline: absolute time.monotonic() value
+        :param channel: channel to wait for, the CLI channel of the driver if None
+        :return: True if data can be read, False on timeout
+        """
+        channel = self.ssh_channel if channel is None else channel
+        if not hasattr(channel, "fileno"):
+            # channel does not support readiness polling, recv() itself blocks
+            return True
+        if channel.recv_ready():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        readable, _, _ = select.select([channel], [], [], remaining)
+        return bool(readable)
+
+    def _recv_chunk(self, decoder, channel=None):
+        resp = (self.ssh_channel if channel is None else channel).recv(9999)
+        if not resp:
+            raise ConnectionClosedException("CLI channel closed by the device")
+        return decoder.decode(resp)
+
+    def _read_until_prompt(self, timeout):
+        """
+        Reads the output of a command from the CLI channel.
+
+        Returns as soon as the MD-CLI prompt is received instead of polling on a fixed sleep.
+        Chunks are collected in a list and only the last PROMPT_SEARCH_WINDOW characters are
+        searched for the prompt, so large outputs are read in linear time.
+        :param timeout: seconds to wait for the prompt
+        :return: the output received, ending with the prompt
+        """
+        return "".join(self._iter_until_prompt(timeout))
+
+    def _iter_until_prompt(self, timeout):
+        """
+        Yields the output of a command from the CLI channel as it is received, up to and
+        including the MD-CLI prompt.
+        :param timeout: seconds to wait for the prompt
+        """
+        deadline = time.monotonic() + timeout
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        tail = ""
+        while True:
+            if not self._wait_recv_ready(deadline):
+                raise CommandTimeoutException(
+                    "No CLI prompt received within {} seconds".format(timeout)
+                )
+            chunk = self._recv_chunk(decoder)
+            yield chunk
+            tail = (tail + chunk)[-PROMPT_SEARCH_WINDOW:]
+            if self.terminal_stdout_re[0].search(tail):
+                self.cli_at_prompt = True
+                return
+
+    def _iter_cli_lines(self, commands):
+        """
+        Runs CLI commands and yields their output line by line, without holding all of it.
+        """
+        is_alive = False
+        if self.conn_ssh is not None:
+            is_alive = self.conn_ssh.get_transport().is_active()
+        if not is_alive:
+            self._create_ssh()
+        for command in commands:
+            if "\n" not in command:
+                command = command + "\n"
+            self.cli_at_prompt = False
+            self.ssh_channel.send(command)
+            partial = ""
+            for chunk in self._iter_until_prompt(self._cli_timeout_for(command)):
+                lines = (partial + chunk).split("\n")
+                partial = lines.pop()
+                yield from lines
+            yield partial
+
+    def _drain_channel(self, idle_timeout, channel=None, deadline=None):
+        """
+        Reads from the CLI channel until it stays silent for idle_timeout seconds.
+
+        :param channel: channel to read, the CLI channel of the driver if None
+        :param deadline: absolute time.monotonic() value after which reading stops
+        """
+        channel = self.ssh_channel if channel is None else channel
+        chunks = []
+        if not hasattr(channel, "fileno"):
+            return ""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while deadline is None or time.monotonic() < deadline:
+            wait_until = time.monotonic() + idle_timeout
+            if deadline is not None:
+                wait_until = min(wait_until, deadline)
+            if not self._wait_recv_ready(wait_until, channel):
+                break
+            chunks.append(self._recv_chunk(decoder, channel))
+        chunks.append(decoder.decode(b"", final=True))
+        return "".join(chunks)
+
     def _perform_cli_commands(self, commands, is_get, no_more=False):
         if no_more:
             # Disable paged responses, note that the '/' changes the filenames
@@ -188,24 +544,19 @@ class NokiaSROSDriver(NetworkDriver):
                 is_alive = self.conn_ssh.get_transport().is_active()
             if not is_alive:
                 self._create_ssh()
-            buff = ""
+            buff = []
             if is_get:
                 for command in commands:
                     if "\n" not in command:
                         command = command + "\n"
+                    self.cli_at_prompt = False
                     self.ssh_channel.send(command)
-                    while True:
-                        time.sleep(0.150)
-                        resp = self.ssh_channel.recv(9999)
-                        buff += resp.decode("ascii")
-                        if re.search(self.terminal_stdout_re[0], buff):
-                          break
+                    buff.append(self._read_until_prompt(self._cli_timeout_for(command)))
             else:
                 # chunk commands into lists of length 500
                 # send all the 500 commands together
-                # receive the output from the router
-                # the last while loop is to ensure that we have received all the output 
-                # from the router for the remaining commands
+                # receive the output from the router until it goes idle
+                # finally wait for the prompt that follows the last command
 
                 command_list = []
                 if len(commands) > 500:
@@ -222,30 +573,94 @@ class NokiaSROSDriver(NetworkDriver):
                     ]
                 if len(command_list) == 0:
                     pass
+                tail = ""
+                self.cli_at_prompt = False
                 for command_set in command_list:
                     for command in command_set:
                         if "\n" not in command:
                             command = command + "\n"
-                        if self.ssh_channel.send_ready():
-                            self.ssh_channel.send(command)
-                    time.sleep(0.1)
-                    while self.ssh_channel.recv_ready():
-                        time.sleep(0.1)
-                        resp = self.ssh_channel.recv(999)
-                        buff += resp.decode("ascii")
-
-                time.sleep(1.0)
-                while self.ssh_channel.recv_ready():
-                    time.sleep(0.1)
-                    resp = self.ssh_channel.recv(999)
-                    buff += resp.decode("ascii")
-
-            return buff
+                        self.ssh_channel.sendall(command)
+                    output = self._drain_channel(self.cli_idle_timeout)
+                    buff.append(output)
+                    tail = (tail + output)[-PROMPT_SEARCH_WINDOW:]
+
+                if not self.terminal_stdout_re[0].search(tail):
+                    buff.append(self._read_until_prompt(self.cli_timeout))
+                buff.append(self._drain_channel(self.cli_idle_timeout))
+                self.cli_at_prompt = True
+
+            return "".join(buff)
         except Exception as e:
             print("Error in method perform cli commands : {}".format(e))
             log.error("Error in _perform_cli_commands : %s" % traceback.format_exc())
             return None
 
+    def _load_cli_lines(self, lines, preamble):
+        """
+        Enters configuration lines in the MD-CLI, keeping a window of lines in flight.
+
+        The MD-CLI answers every line with a prompt, so the output received between two
+        prompts belongs to a single line: errors are attributed to the exact line that caused
+        them, and no line is sent more than a window ahead of the device. The window starts
+        small, doubles while the device keeps up and is halved when it goes silent for
+        cli_idle_timeout seconds. Sending stops at the first error.
+
+        :param lines: configuration lines
+        :param preamble: commands entered before the lines, e.g. ["edit-config exclusive"]
+        :return: None, or (line number, line, error) for the first line the device rejected;
+                 the line number is None for a preamble command
+        """
+        is_alive = False
+        if self.conn_ssh is not None:
+            is_alive = self.conn_ssh.get_transport().is_active()
+        if not is_alive:
+            self._create_ssh()
+        # discard the banner or prompt still waiting to be read
+        self._drain_channel(self.cli_idle_timeout)
+
+        commands = list(preamble) + [line.rstrip("\r") for line in lines]
+        self.cli_at_prompt = False
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        window = min(16, self.cli_load_window)
+        sent = answered = 0
+        failure = None
+        pending = ""
+        while answered < sent or (sent < len(commands) and failure is None):
+            if failure is None and sent < len(commands) and sent - answered <= window // 2:
+                batch = commands[sent : answered + window]
+                self.ssh_channel.sendall("".join(c + "\n" for c in batch))
+                sent += len(batch)
+            deadline = time.monotonic() + self.cli_idle_timeout
+            if not self._wait_recv_ready(deadline):
+                window = max(1, window // 2)
+                deadline = time.monotonic() + self.cli_timeout
+                if not self._wait_recv_ready(deadline):
+                    raise CommandTimeoutException(
+                        "No answer to line {} within {} seconds: {}".format(
+                            answered - len(preamble) + 1, self.cli_timeout, commands[answered]
+                        )
+                    )
+            pending += self._recv_chunk(decoder)
+            match = self.cli_prompt_re.search(pending)
+            while match is not None and answered < sent:
+                output, pending = pending[: match.start()], pending[match.end() :]
+                # the output starts with the echo of the line, which is not searched for errors
+                output = output.partition("\n")[2]
+                error = None
+                for regex in self.terminal_stderr_re:
+                    found = regex.search(output)
+                    if found is not None:
+                        error = found.group(0).strip()
+                        break
+                if error is not None and failure is None:
+                    number = answered - len(preamble) + 1 if answered >= len(preamble) else None
+                    failure = (number, commands[answered], error)
+                answered += 1
+                if answered == sent and failure is None:
+                    window = min(2 * window, self.cli_load_window)
+                match = self.cli_prompt_re.search(pending)
+        return failure
+
     def _lock_config(self):
         if not self.locked:
             try:
@@ -283,8 +698,8 @@ class NokiaSROSDriver(NetworkDriver):
         """
         value = ""
         try:
-            xpath_applied = xml_tree.xpath(
-                path, namespaces=namespaces
+            xpath_applied = _xpath(
+                xml_tree, path, namespaces=namespaces
             )  # will consider the first match only
             xpath_length = len(xpath_applied)  # get a count of items in XML tree
             if xpath_length and xpath_applied[0] is not None:
@@ -330,6 +745,7 @@ class NokiaSROSDriver(NetworkDriver):
         """
         Discards the configuration loaded into the candidate.
         """
+        self._invalidate_response_cache()
         if self.fmt == "xml":
             self.conn.discard_changes()
         else:
@@ -341,6 +757,7 @@ class NokiaSROSDriver(NetworkDriver):
         """
         Commits the changes requested by the method load_replace_candidate or load_merge_candidate.
         """
+        self._invalidate_response_cache()
         if self.fmt == "text":
             buff = self._perform_cli_commands(["commit"], True)
             # If error while performing commit, return the error
@@ -362,6 +779,7 @@ class NokiaSROSDriver(NetworkDriver):
         """
         If changes were made, revert changes to the original state.
         """
+        self._invalidate_response_cache()
         cmd = ["/quit-config", "/configure exclusive", "rollback 1", "commit", "exit"]
         buff = self._perform_cli_commands(cmd, True)
         error = ""
@@ -389,20 +807,20 @@ class NokiaSROSDriver(NetworkDriver):
             buff = self._perform_cli_commands( ["compare"], True, no_more=True )
             # buff = self._perform_cli_commands(["/environment more false", "compare"])
         else:
-            #  if format is xml we convert them into dict and perform a diff on configs to return the difference
-            # running_dict = xmltodict.parse(running_config, process_namespaces=True)
-
-            running_dict = xmltodict.parse(
-                self.get_config(retrieve="running")["running"],
-                process_namespaces=self.sros_compare_format != "json",
-            )
-            # candidate_dict = xmltodict.parse(candidate_config, process_namespaces=True)
-            candidate_dict = xmltodict.parse(
-                self.get_config(retrieve="candidate")["candidate"],
-                process_namespaces=self.sros_compare_format != "json",
-            )
+            #  if format is xml we perform a structural diff on configs to return the difference
+            if self.sros_compare_mode in ("md-cli", "auto"):
+                return self._device_compare()
+
+            running = self.get_config(retrieve="running")["running"]
+            candidate = self.get_config(retrieve="candidate")["candidate"]
+            process_namespaces = self.sros_compare_format != "json"
+            if self.sros_compare_engine == "dictdiffer":
+                running_dict = xmltodict.parse(running, process_namespaces=process_namespaces)
+                candidate_dict = xmltodict.parse(candidate, process_namespaces=process_namespaces)
+                result = diff(running_dict, candidate_dict)
+            else:
+                result = diff_xml(running, candidate, process_namespaces=process_namespaces)
             new_buff = ""
-            result = diff(running_dict, candidate_dict)
             if self.sros_compare_format == "json":
                 new_buff += "\n".join(
                     [json.dumps(e, sort_keys=True, indent=4) for e in result]
@@ -442,6 +860,85 @@ class NokiaSROSDriver(NetworkDriver):
         else:
             return ""
 
+    def _device_compare(self):
+        """
+        Returns the MD-CLI difference between the candidate and running configurations as
+        reported by the router. In "auto" mode, the MD-CLI compare command is run instead
+        when the router does not support md-compare or it fails.
+
+        :raises CommandErrorException: if the router does not support md-compare or it fails
+        """
+        auto = self.sros_compare_mode == "auto"
+        if not any(OPER_GLOBAL_NS in c for c in self.conn.server_capabilities):
+            if auto:
+                return self._cli_compare()
+            raise CommandErrorException(
+                "sros_compare_mode md-cli: the device does not support md-compare"
+            )
+        try:
+            reply = self.conn.dispatch(to_ele(COMPARE_CONFIG))
+        except Exception as e:
+            if auto:
+                log.warning("md-compare failed, running the compare command: %s", e)
+                return self._cli_compare()
+            log.error("md-compare failed: %s", e)
+            raise CommandErrorException("md-compare failed: {}".format(e))
+        root = to_ele(reply.xml)
+        blocks = root.xpath("//*[local-name()='md-cli-output-block']")
+        return self._compare_text("".join(block.text or "" for block in blocks))
+
+    def _cli_compare(self):
+        """
+        Returns the output of the MD-CLI compare command in /configure, in the format of
+        _device_compare.
+        """
+        buff = self._perform_cli_commands(CLI_COMPARE_COMMANDS, True)
+        if buff is None:
+            raise CommandErrorException("compare failed on the CLI")
+        rows = []
+        for item in buff.split("\n"):
+            row = item.strip()
+            if any(match.search(item + "\n") for match in self.terminal_stderr_re):
+                raise CommandErrorException("compare failed: {}".format(row))
+            if row in CLI_COMPARE_COMMANDS or row.startswith("INFO: "):
+                continue
+            if self.cli_prompt_line_re.search(row):
+                continue
+            rows.append(item)
+        return self._compare_text("\n".join(rows))
+
+    @staticmethod
+    def _compare_text(text):
+        """MD-CLI compare output without trailing spaces and blank lines."""
+        return "\n".join(line.rstrip() for line in text.split("\n") if line.strip())
+
+    def _edit_candidate(self, config, default_operation, exception):
+        """
+        Sends a <config> element to the candidate datastore, in several edit-config RPCs when
+        edit_config_chunk_size is set: the first part with default_operation, the following
+        ones merged into it.
+        """
+        if not self.edit_config_chunk_size:
+            self.conn.edit_config(
+                config=config, target="candidate", default_operation=default_operation
+            )
+            return
+        parts = split_config(config, self.edit_config_chunk_size)
+        for i, build in enumerate(parts):
+            try:
+                self.conn.edit_config(
+                    config=build(),
+                    target="candidate",
+                    default_operation=default_operation if i == 0 else "merge",
+                )
+            except Exception as e:
+                log.error("edit-config of part %d/%d failed: %s", i + 1, len(parts), e)
+                raise exception(
+                    "edit-config of part {}/{} failed: {}".format(i + 1, len(parts), e)
+                )
+            if self.edit_config_progress is not None:
+                self.edit_config_progress(i + 1, len(parts))
+
     def _determinne_config_format(self, config) -> str:
         if config.strip().startswith("<"):
             return "xml"
@@ -465,6 +962,7 @@ class NokiaSROSDriver(NetworkDriver):
                 configuration = f.read()
 
         self.fmt = self._determinne_config_format(configuration)
+        self._invalidate_response_cache()
         if self.fmt == "xml":
             if not self.lock_disable and not self.session_config_lock:
                 self._lock_config()
@@ -476,30 +974,23 @@ class NokiaSROSDriver(NetworkDriver):
                     "{urn:ietf:params:xml:ns:netconf:base:1.0}config"
                 )
                 newroot.insert(0, root)
-                self.conn.edit_config(
-                    config=newroot, target="candidate", default_operation="merge"
-                )
+                self._edit_candidate(newroot, "merge", MergeConfigException)
 
             else:
-                self.conn.edit_config(
-                    config=configuration,
-                    target="candidate",
-                    default_operation="merge",
-                )
+                self._edit_candidate(configuration, "merge", MergeConfigException)
             self.conn.validate(source="candidate")
 
         else:
-            configuration = configuration.split("\n")
-            configuration.insert(0, "edit-config exclusive")
-            buff = self._perform_cli_commands(configuration, False)
-            # error checking
-            if buff is not None:
-                for item in buff.split("\n"):
-                    if any(match.search(item) for match in self.terminal_stderr_re):
-                        log.error(f"Merge issue : {item}")
-                        raise MergeConfigException("Merge issue: %s", item)
-            else:
-                raise MergeConfigException("Timeout during load_merge_candidate")
+            try:
+                failure = self._load_cli_lines(
+                    configuration.split("\n"), ["edit-config exclusive"]
+                )
+            except Exception as e:
+                log.error("Error in load_merge_candidate : %s" % traceback.format_exc())
+                raise MergeConfigException("Error during load_merge_candidate: {}".format(e))
+            if failure is not None:
+                log.error("Merge issue at line %s: %s: %s", *failure)
+                raise MergeConfigException("Merge issue at line {}: {}: {}".format(*failure))
 
     def load_replace_candidate(self, filename=None, config=None):
         """
@@ -521,6 +1012,7 @@ class NokiaSROSDriver(NetworkDriver):
                 configuration = f.read()
 
         self.fmt = self._determinne_config_format(configuration)
+        self._invalidate_response_cache()
         if self.fmt == "xml":
             if not self.lock_disable and not self.session_config_lock:
                 self._lock_config()
@@ -532,29 +1024,23 @@ class NokiaSROSDriver(NetworkDriver):
                     "{urn:ietf:params:xml:ns:netconf:base:1.0}config"
                 )
                 newroot.insert(0, root)
-                self.conn.edit_config(
-                    config=newroot, target="candidate", default_operation="replace",
-                )
+                self._edit_candidate(newroot, "replace", ReplaceConfigException)
             else:
-                self.conn.edit_config(
-                    config=configuration,
-                    target="candidate",
-                    default_operation="replace",
-                )
+                self._edit_candidate(configuration, "replace", ReplaceConfigException)
             self.conn.validate(source="candidate")
         else:
-            configuration = configuration.split("\n")
-            configuration.insert(0, "edit-config exclusive")
-            configuration.insert(1, "delete configure")
-            buff = self._perform_cli_commands(configuration, False)
-            # error checking
-            if buff is not None:
-                for item in buff.split("\n"):
-                    if any(match.search(item) for match in self.terminal_stderr_re):
-                        log.error( f"Replace issue: {item}" )
-                        raise ReplaceConfigException("Replace issue: %s", item)
-            else:
-                raise ReplaceConfigException("Timeout during load_replace_candidate")
+            try:
+                failure = self._load_cli_lines(
+                    configuration.split("\n"), ["edit-config exclusive", "delete configure"]
+                )
+            except Exception as e:
+                log.error("Error in load_replace_candidate : %s" % traceback.format_exc())
+                raise ReplaceConfigException(
+                    "Error during load_replace_candidate: {}".format(e)
+                )
+            if failure is not None:
+                log.error("Replace issue at line %s: %s: %s", *failure)
+                raise ReplaceConfigException("Replace issue at line {}: {}: {}".format(*failure))
 
     def get_facts(self):
         """
@@ -569,63 +1055,66 @@ class NokiaSROSDriver(NetworkDriver):
                 interface_list - List of the interfaces of the device
         """
         try:
-            interface_list = []
-            result = to_ele(self.conn.get(filter=GET_FACTS["_"]).data_xml)
+            result = to_ele(self._nc_get("get_facts", filter=GET_FACTS["_"]).data_xml)
+            return self._parse_facts(result)
+        except Exception as e:
+            print("Error in method get facts : {}".format(e))
+            log.error("Error in method get facts : %s" % traceback.format_exc())
+
+    def _parse_facts(self, result):
+        interface_list = []
+
+        hostname = self._find_txt(
+            result,
+            "state_ns:state/state_ns:system/state_ns:oper-name",
+            default="",
+            namespaces=self.nsmap,
+        )
+        fqdn = hostname
+        uptime = self._find_txt(
+            result,
+            "state_ns:state/state_ns:system/state_ns:up-time",
+            default="",
+            namespaces=self.nsmap,
+        )
+        # In uptime, last three digits are milliseconds
+        if uptime:
+            uptime = uptime[:-3]+ "." + uptime[-3:]
+            uptime = convert(float, uptime, default=0.0)
+        else:
+            uptime = -1.0
+        interfaces = result.xpath(
+            "state_ns:state/state_ns:router/state_ns:interface/state_ns:interface-name",
+            namespaces=self.nsmap,
+        )
+        for i in interfaces:
+            interface_list.append(i.text)
 
-            hostname = self._find_txt(
+        return {
+            "vendor": "Nokia",
+            "model": self._find_txt(
                 result,
-                "state_ns:state/state_ns:system/state_ns:oper-name",
+                "state_ns:state/state_ns:system/state_ns:platform",
                 default="",
                 namespaces=self.nsmap,
-            )
-            fqdn = hostname
-            uptime = self._find_txt(
+            ),
+            "serial_number": self._find_txt(
                 result,
-                "state_ns:state/state_ns:system/state_ns:up-time",
+                "state_ns:state/state_ns:chassis/state_ns:hardware-data/state_ns:serial-number",
                 default="",
                 namespaces=self.nsmap,
-            )
-            # In uptime, last three digits are milliseconds
-            if uptime:
-                uptime = uptime[:-3]+ "." + uptime[-3:]
-                uptime = convert(float, uptime, default=0.0)
-            else:
-                uptime = -1.0
-            interfaces = result.xpath(
-                "state_ns:state/state_ns:router/state_ns:interface/state_ns:interface-name",
+            ),
+            "os_version": self._find_txt(
+                result,
+                "state_ns:state/state_ns:system/state_ns:version/state_ns:version-number",
+                default="",
                 namespaces=self.nsmap,
-            )
-            for i in interfaces:
-                interface_list.append(i.text)
-
-            return {
-                "vendor": "Nokia",
-                "model": self._find_txt(
-                    result,
-                    "state_ns:state/state_ns:system/state_ns:platform",
-                    default="",
-                    namespaces=self.nsmap,
-                ),
-                "serial_number": self._find_txt(
-                    result,
-                    "state_ns:state/state_ns:chassis/state_ns:hardware-data/state_ns:serial-number",
-                    default="",
-                    namespaces=self.nsmap,
-                ),
-                "os_version": self._find_txt(
-                    result,
-                    "state_ns:state/state_ns:system/state_ns:version/state_ns:version-number",
-                    default="",
-                    namespaces=self.nsmap,
-                ),
-                "hostname": hostname,
-                "fqdn": fqdn,
-                "uptime": uptime,
-                "interface_list": interface_list,
-            }
-        except Exception as e:
-            print("Error in method get facts : {}".format(e))
-            log.error("Error in method get facts : %s" % traceback.format_exc())
+            ),
+            "hostname": hostname,
+            "fqdn": fqdn,
+            "uptime": uptime,
+            "interface_list": interface_list,
+        }
 
     def get_interfaces(self):
         # All physical ports and interfaces
@@ -643,181 +1132,185 @@ class NokiaSROSDriver(NetworkDriver):
                mac_address (string)
          """
         try:
-            interfaces = {}
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_interfaces",
                     filter=GET_INTERFACES(R19=self.R19), with_defaults="report-all"
                 ).data_xml
             )
-            # get physical interfaces (ports) information
-            for port in result.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
-                port_id = self._find_txt(
-                    port, "state_ns:port-id", namespaces=self.nsmap
-                )  # port name
-                if port_id == "":
-                    continue
-                pd = {}  # port dict
-                pd["mac_address"] = self._find_txt(
-                    port, "state_ns:hardware-mac-address", namespaces=self.nsmap
-                )
-                pd["is_up"] = (
-                    True
-                    if self._find_txt(port, "state_ns:oper-state", namespaces=self.nsmap)
-                    == "up"
-                    else False
-                )
-                pd["speed"] = convert(
-                    float,
-                    self._find_txt(
-                        port, "state_ns:ethernet/state_ns:oper-speed", namespaces=self.nsmap
-                    ),
-                )
-                pd["last_flapped"] = -1.0  # flap information is not available in YANG yet
-                pd["is_enabled"] = (
-                    True
-                    if self._find_txt(
-                        result,
-                        'configure_ns:configure/configure_ns:port[configure_ns:port-id="{}"]/configure_ns:admin-state'.format(
-                            port_id
-                        ),
-                        namespaces=self.nsmap,
-                    )
-                    == "enable"
-                    else False
-                )
-                pd["mtu"] = convert(
-                    int,
-                    self._find_txt(
-                        result,
-                        'configure_ns:configure/configure_ns:port[configure_ns:port-id="{}"]/configure_ns:ethernet/configure_ns:mtu'.format(
-                            port_id
-                        ),
-                        namespaces=self.nsmap,
+            return self._parse_interfaces(result)
+        except Exception as e:
+            print("Error in method get interfaces : {}".format(e))
+            log.error("Error in method get interfaces : %s" % traceback.format_exc())
+
+    def _parse_interfaces(self, result):
+        interfaces = {}
+        # get physical interfaces (ports) information
+        for port in result.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
+            port_id = self._find_txt(
+                port, "state_ns:port-id", namespaces=self.nsmap
+            )  # port name
+            if port_id == "":
+                continue
+            pd = {}  # port dict
+            pd["mac_address"] = self._find_txt(
+                port, "state_ns:hardware-mac-address", namespaces=self.nsmap
+            )
+            pd["is_up"] = (
+                True
+                if self._find_txt(port, "state_ns:oper-state", namespaces=self.nsmap)
+                == "up"
+                else False
+            )
+            pd["speed"] = convert(
+                float,
+                self._find_txt(
+                    port, "state_ns:ethernet/state_ns:oper-speed", namespaces=self.nsmap
+                ),
+            )
+            pd["last_flapped"] = -1.0  # flap information is not available in YANG yet
+            pd["is_enabled"] = (
+                True
+                if self._find_txt(
+                    result,
+                    'configure_ns:configure/configure_ns:port[configure_ns:port-id="{}"]/configure_ns:admin-state'.format(
+                        port_id
                     ),
+                    namespaces=self.nsmap,
                 )
-                pd["description"] = self._find_txt(
+                == "enable"
+                else False
+            )
+            pd["mtu"] = convert(
+                int,
+                self._find_txt(
                     result,
-                    'configure_ns:configure/configure_ns:port[configure_ns:port-id="{}"]/configure_ns:description'.format(
+                    'configure_ns:configure/configure_ns:port[configure_ns:port-id="{}"]/configure_ns:ethernet/configure_ns:mtu'.format(
                         port_id
                     ),
                     namespaces=self.nsmap,
+                ),
+            )
+            pd["description"] = self._find_txt(
+                result,
+                'configure_ns:configure/configure_ns:port[configure_ns:port-id="{}"]/configure_ns:description'.format(
+                    port_id
+                ),
+                namespaces=self.nsmap,
+            )
+            interfaces[port_id] = pd
+
+        # get logical interfaces (interfaces) information
+        for if_state in result.xpath(
+            "state_ns:state/state_ns:router/state_ns:interface", namespaces=self.nsmap
+        ):
+            if_name = self._find_txt(
+                if_state, "state_ns:interface-name", namespaces=self.nsmap
+            )
+            if if_name == "":
+                continue
+            ifd = {}  # interface dict
+            if_mac = ""
+            if_port = ""
+            # configuration portion of the interface
+            if_cfg_block = result.find(
+                f'configure_ns:configure/configure_ns:router/configure_ns:interface[configure_ns:interface-name="{if_name}"]',
+                self.nsmap,
+            )
+            if if_cfg_block is not None and len(if_cfg_block) > 0:
+                # description
+                ifd["description"] = self._find_txt(
+                    if_cfg_block, "configure_ns:description", namespaces=self.nsmap
                 )
-                interfaces[port_id] = pd
-
-            # get logical interfaces (interfaces) information
-            for if_state in result.xpath(
-                "state_ns:state/state_ns:router/state_ns:interface", namespaces=self.nsmap
-            ):
-                if_name = self._find_txt(
-                    if_state, "state_ns:interface-name", namespaces=self.nsmap
+                # MAC address
+                cfg_mac = self._find_txt(
+                    if_cfg_block, "configure_ns:mac", namespaces=self.nsmap
                 )
-                if if_name == "":
-                    continue
-                ifd = {}  # interface dict
-                if_mac = ""
-                if_port = ""
-                # configuration portion of the interface
-                if_cfg_block = result.find(
-                    f'configure_ns:configure/configure_ns:router/configure_ns:interface[configure_ns:interface-name="{if_name}"]',
-                    self.nsmap,
+                # configured mac address
+                if cfg_mac != "":
+                    if_mac = cfg_mac
+
+                # port info
+                _p = self._find_txt(
+                    if_cfg_block, "configure_ns:port", namespaces=self.nsmap
                 )
-                if if_cfg_block is not None and len(if_cfg_block) > 0:
-                    # description
-                    ifd["description"] = self._find_txt(
-                        if_cfg_block, "configure_ns:description", namespaces=self.nsmap
-                    )
-                    # MAC address
-                    cfg_mac = self._find_txt(
-                        if_cfg_block, "configure_ns:mac", namespaces=self.nsmap
-                    )
-                    # configured mac address
-                    if cfg_mac != "":
-                        if_mac = cfg_mac
+                if_port = (
+                    _p.split(":")[0] if (_p != "" and ":" in _p) else ""
+                )  # port name without .1q tag
 
-                    # port info
-                    _p = self._find_txt(
-                        if_cfg_block, "configure_ns:port", namespaces=self.nsmap
-                    )
-                    if_port = (
-                        _p.split(":")[0] if (_p != "" and ":" in _p) else ""
-                    )  # port name without .1q tag
-
-                    # configured admin-state
-                    ifd["is_enabled"] = (
-                        True
-                        if self._find_txt(
-                            if_cfg_block, "configure_ns:admin-state", namespaces=self.nsmap
-                        )
-                        == "enable"
-                        else False
+                # configured admin-state
+                ifd["is_enabled"] = (
+                    True
+                    if self._find_txt(
+                        if_cfg_block, "configure_ns:admin-state", namespaces=self.nsmap
                     )
+                    == "enable"
+                    else False
+                )
 
-                # state portion of the port associated with interface
-                if_port_state_block = []
-                if if_port != "":
-                    if_port_state_block = result.find(
-                        f'state_ns:state/state_ns:port[state_ns:port-id="{if_port}"]',
-                        self.nsmap,
-                    )
+            # state portion of the port associated with interface
+            if_port_state_block = []
+            if if_port != "":
+                if_port_state_block = result.find(
+                    f'state_ns:state/state_ns:port[state_ns:port-id="{if_port}"]',
+                    self.nsmap,
+                )
 
-                if if_mac == "":
-                    if if_name != "system":
-                        # take port's MAC for non system interfaces
-                        if if_port_state_block is not None and len(if_port_state_block) > 0:
-                            if_mac = self._find_txt(
-                                if_port_state_block,
-                                "state_ns:hardware-mac-address",
-                                namespaces=self.nsmap,
-                            )
-                    else:
-                        # system interface gets chassis MAC
+            if if_mac == "":
+                if if_name != "system":
+                    # take port's MAC for non system interfaces
+                    if if_port_state_block is not None and len(if_port_state_block) > 0:
                         if_mac = self._find_txt(
-                            result,
-                            "state_ns:state/state_ns:chassis/state_ns:hardware-data/state_ns:base-mac-address",
+                            if_port_state_block,
+                            "state_ns:hardware-mac-address",
                             namespaces=self.nsmap,
                         )
-                ifd["mac_address"] = if_mac
+                else:
+                    # system interface gets chassis MAC
+                    if_mac = self._find_txt(
+                        result,
+                        "state_ns:state/state_ns:chassis/state_ns:hardware-data/state_ns:base-mac-address",
+                        namespaces=self.nsmap,
+                    )
+            ifd["mac_address"] = if_mac
 
-                # speed is a port inherited value
-                if_speed = -1.0  # default value for system/loopback interface
-                if if_port:
-                    if if_port_state_block is not None and len(if_port_state_block) > 0:
-                        if_speed = convert(
-                            float,
-                            self._find_txt(
-                                if_port_state_block,
-                                "state_ns:ethernet/state_ns:oper-speed",
-                                namespaces=self.nsmap,
-                            ),
-                        )
-                ifd["speed"] = if_speed
+            # speed is a port inherited value
+            if_speed = -1.0  # default value for system/loopback interface
+            if if_port:
+                if if_port_state_block is not None and len(if_port_state_block) > 0:
+                    if_speed = convert(
+                        float,
+                        self._find_txt(
+                            if_port_state_block,
+                            "state_ns:ethernet/state_ns:oper-speed",
+                            namespaces=self.nsmap,
+                        ),
+                    )
+            ifd["speed"] = if_speed
 
-                ifd["is_up"] = self._find_txt(
-                        if_state, "state_ns:if-oper-status" if self.R19 else "state_ns:oper-state", 
-                        namespaces=self.nsmap
-                    ) == "up"
+            ifd["is_up"] = self._find_txt(
+                    if_state, "state_ns:if-oper-status" if self.R19 else "state_ns:oper-state", 
+                    namespaces=self.nsmap
+                ) == "up"
 
-                flap_time = self._find_txt(
-                    if_state, "state_ns:last-oper-change", namespaces=self.nsmap
-                )
-                ifd["last_flapped"] = (
-                    datetime.datetime.strptime(
-                        flap_time, "%Y-%m-%dT%H:%M:%S.%fZ"
-                    ).timestamp()
-                    if flap_time != ""
-                    else -1.0
-                )
+            flap_time = self._find_txt(
+                if_state, "state_ns:last-oper-change", namespaces=self.nsmap
+            )
+            ifd["last_flapped"] = (
+                datetime.datetime.strptime(
+                    flap_time, "%Y-%m-%dT%H:%M:%S.%fZ"
+                ).timestamp()
+                if flap_time != ""
+                else -1.0
+            )
 
-                ifd["mtu"] = convert(
-                    int,
-                    self._find_txt(if_state, "state_ns:oper-ip-mtu", namespaces=self.nsmap),
-                )
-                interfaces[if_name] = ifd
+            ifd["mtu"] = convert(
+                int,
+                self._find_txt(if_state, "state_ns:oper-ip-mtu", namespaces=self.nsmap),
+            )
+            interfaces[if_name] = ifd
 
-            return interfaces
-        except Exception as e:
-            print("Error in method get interfaces : {}".format(e))
-            log.error("Error in method get interfaces : %s" % traceback.format_exc())
+        return interfaces
 
     def get_interfaces_counters(self):
         # (Statistics of all ports and router/interface is taken)
@@ -838,179 +1331,189 @@ class NokiaSROSDriver(NetworkDriver):
                 rx_broadcast_packets (int)
         """
         try:
-            interface_counters = {}
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_interfaces_counters",
                     filter=GET_INTERFACES_COUNTERS["_"], with_defaults="report-all"
                 ).data_xml
             )
-            # Looping through port-list to get statistics of individual port
-            for port in result.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
-                port_id = self._find_txt(port, "state_ns:port-id", namespaces=self.nsmap)
-                if port_id == "":
-                    continue
-                interface_counters[port_id] = {
-                    "tx_errors": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:out-errors",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_errors": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:in-errors",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "tx_discards": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:out-discards",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_discards": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:in-discards",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "tx_octets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:out-octets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_octets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:in-octets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "tx_unicast_packets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:out-unicast-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_unicast_packets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:in-unicast-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "tx_multicast_packets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:out-multicast-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_multicast_packets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:in-multicast-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "tx_broadcast_packets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:out-broadcast-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_broadcast_packets": convert(
-                        int,
-                        self._find_txt(
-                            port,
-                            "state_ns:statistics/state_ns:in-broadcast-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                }
-            # Looping through interfaces-list to get statistics of interfaces port
-            for iface in result.xpath(
-                "state_ns:state/state_ns:router/state_ns:interface", namespaces=self.nsmap
-            ):
-                if_name = self._find_txt(
-                    iface, "state_ns:interface-name", namespaces=self.nsmap
-                )
-                if if_name == "":
-                    continue
-                interface_counters[if_name] = {
-                    "tx_errors": -1,
-                    "rx_errors": -1,
-                    "tx_discards": convert(
-                        int,
-                        self._find_txt(
-                            iface,
-                            "state_ns:statistics/state_ns:ip/state_ns:out-discard-packets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_discards": -1,
-                    "tx_octets": convert(
-                        int,
-                        self._find_txt(
-                            iface,
-                            "state_ns:statistics/state_ns:ip/state_ns:out-octets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "rx_octets": convert(
-                        int,
-                        self._find_txt(
-                            iface,
-                            "state_ns:statistics/state_ns:ip/state_ns:in-octets",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    ),
-                    "tx_unicast_packets": -1,
-                    "rx_unicast_packets": -1,
-                    "tx_multicast_packets": -1,
-                    "rx_multicast_packets": -1,
-                    "tx_broadcast_packets": -1,
-                    "rx_broadcast_packets": -1,
-                }
-            return interface_counters
+            return self._parse_interfaces_counters(result)
         except Exception as e:
             print("Error in method get interfaces counters : {}".format(e))
             log.error("Error in method get interfaces counters : %s" % traceback.format_exc())
 
+    def _parse_interfaces_counters(self, result):
+        interface_counters = {}
+        # Looping through port-list to get statistics of individual port
+        for port in result.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
+            port_id = self._find_txt(port, "state_ns:port-id", namespaces=self.nsmap)
+            if port_id == "":
+                continue
+            interface_counters[port_id] = self._port_counters(port)
+        # Looping through interfaces-list to get statistics of interfaces port
+        for iface in result.xpath(
+            "state_ns:state/state_ns:router/state_ns:interface", namespaces=self.nsmap
+        ):
+            if_name = self._find_txt(
+                iface, "state_ns:interface-name", namespaces=self.nsmap
+            )
+            if if_name == "":
+                continue
+            interface_counters[if_name] = self._router_interface_counters(iface)
+        return interface_counters
+
+    def _port_counters(self, port):
+        return {
+            "tx_errors": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:out-errors",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_errors": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:in-errors",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "tx_discards": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:out-discards",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_discards": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:in-discards",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "tx_octets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:out-octets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_octets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:in-octets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "tx_unicast_packets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:out-unicast-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_unicast_packets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:in-unicast-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "tx_multicast_packets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:out-multicast-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_multicast_packets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:in-multicast-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "tx_broadcast_packets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:out-broadcast-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_broadcast_packets": convert(
+                int,
+                self._find_txt(
+                    port,
+                    "state_ns:statistics/state_ns:in-broadcast-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+        }
+
+    def _router_interface_counters(self, iface):
+        return {
+            "tx_errors": -1,
+            "rx_errors": -1,
+            "tx_discards": convert(
+                int,
+                self._find_txt(
+                    iface,
+                    "state_ns:statistics/state_ns:ip/state_ns:out-discard-packets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_discards": -1,
+            "tx_octets": convert(
+                int,
+                self._find_txt(
+                    iface,
+                    "state_ns:statistics/state_ns:ip/state_ns:out-octets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "rx_octets": convert(
+                int,
+                self._find_txt(
+                    iface,
+                    "state_ns:statistics/state_ns:ip/state_ns:in-octets",
+                    namespaces=self.nsmap,
+                ),
+                default=-1,
+            ),
+            "tx_unicast_packets": -1,
+            "rx_unicast_packets": -1,
+            "tx_multicast_packets": -1,
+            "rx_multicast_packets": -1,
+            "tx_broadcast_packets": -1,
+            "rx_broadcast_packets": -1,
+        }
+
     def get_network_instances(self, name=""):
         """
            Return a dictionary of network instances (VRFs) configured, including default/global
@@ -1026,79 +1529,82 @@ class NokiaSROSDriver(NetworkDriver):
                                interface name: (dict)
         """
         try:
-            network_instances = {}
-
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_network_instances",
                     filter=GET_NETWORK_INSTANCES["_"].format(instance_name=name),
                     with_defaults="report-all",
                 ).data_xml
             )
+            return self._parse_network_instances(result)
+        except Exception as e:
+            print("Error in method get network instances : {}".format(e))
+            log.error("Error in method get network instances : %s", traceback.format_exc())
 
-            # helper
-            def _get_interfaces_list(instance):
-                network_instances[instance_name].update(
-                    {
-                        "name": instance_name,
-                        "state": {
-                            "route_distinguisher": self._find_txt(
-                                instance,
-                                "state_ns:oper-route-distinguisher",
-                                namespaces=self.nsmap,
-                            )
-                        },
-                        "interfaces": {"interface": {}},
-                    }
-                )
-                for interface in instance.xpath(
-                    "state_ns:interface", namespaces=self.nsmap
-                ):
-                    interface_name = self._find_txt(
-                        interface, "state_ns:interface-name", namespaces=self.nsmap
-                    )
-                    network_instances[instance_name]["interfaces"]["interface"].update(
-                        {interface_name: {}}
-                    )
-
-            for router in result.xpath(
-                "state_ns:state/state_ns:router", namespaces=self.nsmap
+    def _parse_network_instances(self, result):
+        network_instances = {}
+
+        # helper
+        def _get_interfaces_list(instance):
+            network_instances[instance_name].update(
+                {
+                    "name": instance_name,
+                    "state": {
+                        "route_distinguisher": self._find_txt(
+                            instance,
+                            "state_ns:oper-route-distinguisher",
+                            namespaces=self.nsmap,
+                        )
+                    },
+                    "interfaces": {"interface": {}},
+                }
+            )
+            for interface in instance.xpath(
+                "state_ns:interface", namespaces=self.nsmap
             ):
-                instance_name = self._find_txt(
-                    router, "state_ns:router-name", namespaces=self.nsmap
+                interface_name = self._find_txt(
+                    interface, "state_ns:interface-name", namespaces=self.nsmap
                 )
-                if instance_name == "":
-                    continue
-                if instance_name == "Base":
-                    network_instances.update({instance_name: {"type": "DEFAULT_INSTANCE"}})
-                if instance_name == "management":
-                    network_instances.update({instance_name: {"type": "MGMT"}})
-                _get_interfaces_list(router)
-
-            for vprn_service in result.xpath(
-                "state_ns:state/state_ns:service/state_ns:vprn", namespaces=self.nsmap
-            ):
-                instance_name = self._find_txt(
-                    vprn_service, "state_ns:service-name", namespaces=self.nsmap
+                network_instances[instance_name]["interfaces"]["interface"].update(
+                    {interface_name: {}}
                 )
-                if instance_name == "":
-                    continue
-                network_instances.update({instance_name: {"type": "L3VRF"}})
-                _get_interfaces_list(vprn_service)
 
-            for vpls_service in result.xpath(
-                "state_ns:state/state_ns:service/state_ns:vpls", namespaces=self.nsmap
-            ):
-                instance_name = self._find_txt(
-                    vpls_service, "state_ns:service-name", namespaces=self.nsmap
-                )
-                if instance_name == "":
-                    continue
-                network_instances.update({instance_name: {"type": "VPLS"}})
-                _get_interfaces_list(vpls_service)
-            return network_instances
-        except Exception as e:
-            print("Error in method get network instances : {}".format(e))
-            log.error("Error in method get network instances : %s", traceback.format_exc())
+        for router in result.xpath(
+            "state_ns:state/state_ns:router", namespaces=self.nsmap
+        ):
+            instance_name = self._find_txt(
+                router, "state_ns:router-name", namespaces=self.nsmap
+            )
+            if instance_name == "":
+                continue
+            if instance_name == "Base":
+                network_instances.update({instance_name: {"type": "DEFAULT_INSTANCE"}})
+            if instance_name == "management":
+                network_instances.update({instance_name: {"type": "MGMT"}})
+            _get_interfaces_list(router)
+
+        for vprn_service in result.xpath(
+            "state_ns:state/state_ns:service/state_ns:vprn", namespaces=self.nsmap
+        ):
+            instance_name = self._find_txt(
+                vprn_service, "state_ns:service-name", namespaces=self.nsmap
+            )
+            if instance_name == "":
+                continue
+            network_instances.update({instance_name: {"type": "L3VRF"}})
+            _get_interfaces_list(vprn_service)
+
+        for vpls_service in result.xpath(
+            "state_ns:state/state_ns:service/state_ns:vpls", namespaces=self.nsmap
+        ):
+            instance_name = self._find_txt(
+                vpls_service, "state_ns:service-name", namespaces=self.nsmap
+            )
+            if instance_name == "":
+                continue
+            network_instances.update({instance_name: {"type": "VPLS"}})
+            _get_interfaces_list(vpls_service)
+        return network_instances
 
     def get_config(
         self,
@@ -1132,80 +1638,35 @@ class NokiaSROSDriver(NetworkDriver):
             if self.sros_get_format == "cli" or format == "cli":
                 # Getting output in MD-CLI format
                 # retrieving config using md-cli
-                cmd_running = "admin show configuration | no-more"
-                cmd_candidate = ["edit-config read-only", "info | no-more", "quit-config"]
-
-                # helper method
-                def _update_buff(buff):
-                    if "@nokia.com" in buff:
-                        buff = buff.split("@nokia.com.")
-                        updated_buff = [buff[1]]
-                    else:
-                        updated_buff = [buff]
-                    new_buff = ""
-                    match_strings = [
-                        cmd_candidate[0],
-                        cmd_candidate[1],
-                        cmd_candidate[2],
-                        cmd_running,
-                    ]
-                    count = 1
-                    for item in updated_buff[0].split("\n"):
-                        row = item.rstrip()
-                        if any(match in item for match in match_strings):
-                            continue
-                        if "[]" in item:
-                            continue
-                        elif self.cmd_line_pattern_re.search(item) or not row:
-                            continue
-                        elif "persistent-indices" in item:
-                            break
-                        else:
-                            if "configure" in row and len(row) == 11:
-                                new_buff += row.strip() + "\n"
-                                count = count + 1
-                            else:
-                                if count == 1:
-                                    continue
-                                new_buff += row + "\n"
-                    return new_buff[: new_buff.rfind("\n")]
+                cmd_running = CLI_RUNNING_CONFIG_COMMAND
+                cmd_candidate = CLI_CANDIDATE_CONFIG_COMMANDS
 
                 if retrieve == "running":
                     buff_running = self._perform_cli_commands([cmd_running], True)
-                    configuration["running"] = _update_buff(buff_running)
+                    configuration["running"] = self._cli_config(buff_running)
                     return configuration
                 elif retrieve == "startup":
                     buff_running = self._perform_cli_commands([cmd_running], True)
-                    configuration["startup"] = _update_buff(buff_running)
+                    configuration["startup"] = self._cli_config(buff_running)
                     return configuration
                 elif retrieve == "candidate":
                     buff_candidate = self._perform_cli_commands(cmd_candidate, True)
-                    configuration["candidate"] = _update_buff(buff_candidate)
+                    configuration["candidate"] = self._cli_config(buff_candidate)
                     return configuration
                 elif retrieve == "all":
                     buff_running = self._perform_cli_commands([cmd_running], True)
                     buff_candidate = self._perform_cli_commands(cmd_candidate, True)
-                    configuration["running"] = _update_buff(buff_running)
-                    configuration["startup"] = _update_buff(buff_running)
-                    configuration["candidate"] = _update_buff(buff_candidate)
+                    configuration["running"] = self._cli_config(buff_running)
+                    configuration["startup"] = self._cli_config(buff_running)
+                    configuration["candidate"] = self._cli_config(buff_candidate)
                     return configuration
 
             # returning the config in xml format
             elif self.sros_get_format == "xml" or format == "xml":
                 config_data_running_xml = ""
+                if retrieve in ("running", "startup", "all"):
+                    config_data_running_xml = self._running_config_xml()
                 if retrieve == "running" or retrieve == "all":
-                    config_data_running = to_ele(
-                        self.conn.get_config(source="running").data_xml
-                    )
-                    config_data_running_xml = to_xml(
-                        config_data_running.xpath(
-                            "configure_ns:configure", namespaces=self.nsmap
-                        )[0]
-                    )
-                    # remove xml declaration
-                    config_data_running_xml = re.sub(
-                        r"<\?xml.*\?>", "", config_data_running_xml
-                    )
                     configuration["running"] = config_data_running_xml
 
                 if retrieve == "startup" or retrieve == "all":
@@ -1213,7 +1674,7 @@ class NokiaSROSDriver(NetworkDriver):
 
                 if retrieve == "candidate" or retrieve == "all":
                     config_data_candidate = to_ele(
-                        self.conn.get_config(source="candidate").data_xml
+                        self._nc_get_config("get_config", source="candidate").data_xml
                     )
                     config_data_candidate_xml = to_xml(
                         config_data_candidate.xpath(
@@ -1229,6 +1690,87 @@ class NokiaSROSDriver(NetworkDriver):
             print("Error in method get config : {}".format(e))
             log.error("Error in method get config : %s" % traceback.format_exc())
 
+    def _cli_config(self, buff):
+        """Returns the configuration in the output of the MD-CLI configuration commands."""
+        if "@nokia.com" in buff:
+            buff = buff.split("@nokia.com.")
+            updated_buff = [buff[1]]
+        else:
+            updated_buff = [buff]
+        return "\n".join(self._config_lines(updated_buff[0].split("\n")))
+
+    def _config_lines(self, lines):
+        """
+        Yields the configuration lines of the output of the MD-CLI configuration commands,
+        without the echoed commands, prompts and persistent indices.
+        """
+        match_strings = CLI_CANDIDATE_CONFIG_COMMANDS + [CLI_RUNNING_CONFIG_COMMAND]
+        count = 1
+        for item in lines:
+            row = item.rstrip()
+            if any(match in item for match in match_strings):
+                continue
+            if "[]" in item:
+                continue
+            elif self.cmd_line_pattern_re.search(item) or not row:
+                continue
+            elif "persistent-indices" in item:
+                break
+            else:
+                if "configure" in row and len(row) == 11:
+                    yield row.strip()
+                    count = count + 1
+                else:
+                    if count == 1:
+                        continue
+                    yield row
+
+    def _config_change_marker(self):
+        """
+        Returns the id and time of the last configuration commit, or None if the commit
+        history is not available.
+        """
+        try:
+            result = to_ele(self.conn.get(filter=GET_COMMIT_HISTORY["_"]).data_xml)
+        except Exception as e:
+            log.warning("Cannot retrieve the commit history: %s", e)
+            return None
+        last = None
+        for commit in result.xpath(
+            "//state_ns:management-interface/state_ns:commit-history/state_ns:commit-id",
+            namespaces=self.nsmap,
+        ):
+            commit_id = self._find_txt(commit, "state_ns:id", namespaces=self.nsmap)
+            if commit_id.isdigit() and (last is None or int(commit_id) > last[0]):
+                last = (int(commit_id), self._find_txt(
+                    commit, "state_ns:timestamp", namespaces=self.nsmap
+                ))
+        return "{}@{}".format(*last) if last is not None else None
+
+    def _running_config_xml(self):
+        """
+        Returns the running configuration as XML, from the running config cache if the
+        device has not committed a change since it was stored.
+        """
+        marker = None
+        if self.running_config_cache is not None:
+            marker = self._config_change_marker()
+            if marker is not None:
+                cached = self.running_config_cache.get(self.hostname, marker)
+                if cached is not None:
+                    return cached
+        config_data_running = to_ele(
+            self._nc_get_config("get_config", source="running").data_xml
+        )
+        config_data_running_xml = to_xml(
+            config_data_running.xpath("configure_ns:configure", namespaces=self.nsmap)[0]
+        )
+        # remove xml declaration
+        config_data_running_xml = re.sub(r"<\?xml.*\?>", "", config_data_running_xml)
+        if marker is not None:
+            self.running_config_cache.put(self.hostname, marker, config_data_running_xml)
+        return config_data_running_xml
+
     def get_optics(self):
         """
             Fetches the power usage on the various transceivers installed on the switch (in dbm),
@@ -1257,81 +1799,85 @@ class NokiaSROSDriver(NetworkDriver):
                                     max (float)
         """
         try:
-            optics_dict = {}
-
             result = to_ele(
-                self.conn.get(filter=GET_OPTICS["_"], with_defaults="report-all").data_xml
+                self._nc_get(
+                    "get_optics", filter=GET_OPTICS["_"], with_defaults="report-all"
+                ).data_xml
             )
+            return self._parse_optics(result)
+        except Exception as e:
+            print("Error in method get optics : {}".format(e))
+            log.error("Error in method get optics : %s" % traceback.format_exc())
 
-            for port in result.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
-                port_id = self._find_txt(
-                    port, "state_ns:port-id", namespaces=self.nsmap
-                )  # port-name
-                optics_dict[port_id] = {"physical_channels": {"channel": []}}
+    def _parse_optics(self, result):
+        optics_dict = {}
 
-                for lane in port.xpath(
-                    "state_ns:transceiver/state_ns:digital-diagnostic-monitoring/state_ns:lane",
-                    namespaces=self.nsmap,
-                ):
-                    optics_dict[port_id]["physical_channels"]["channel"].append(
-                        {
-                            "index": convert(
-                                int,
-                                self._find_txt(
-                                    lane, "state_ns:lane-id", namespaces=self.nsmap
-                                ),
-                                default=-1,
+        for port in result.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
+            port_id = self._find_txt(
+                port, "state_ns:port-id", namespaces=self.nsmap
+            )  # port-name
+            optics_dict[port_id] = {"physical_channels": {"channel": []}}
+
+            for lane in port.xpath(
+                "state_ns:transceiver/state_ns:digital-diagnostic-monitoring/state_ns:lane",
+                namespaces=self.nsmap,
+            ):
+                optics_dict[port_id]["physical_channels"]["channel"].append(
+                    {
+                        "index": convert(
+                            int,
+                            self._find_txt(
+                                lane, "state_ns:lane-id", namespaces=self.nsmap
                             ),
-                            "state": {
-                                "input_power": {
-                                    "instant": convert(
-                                        float,
-                                        self._find_txt(
-                                            lane,
-                                            "state_ns:received-optical-power/state_ns:current",
-                                            namespaces=self.nsmap,
-                                        ),
-                                        default=-1.0,
+                            default=-1,
+                        ),
+                        "state": {
+                            "input_power": {
+                                "instant": convert(
+                                    float,
+                                    self._find_txt(
+                                        lane,
+                                        "state_ns:received-optical-power/state_ns:current",
+                                        namespaces=self.nsmap,
                                     ),
-                                    "avg": -1.0,  # default value as avg information in YANG
-                                    "min": -1.0,  # default value as min information in YANG
-                                    "max": -1.0,  # default value as max information in YANG
-                                },
-                                "output_power": {
-                                    "instant": convert(
-                                        float,
-                                        self._find_txt(
-                                            lane,
-                                            "state_ns:transmit-output-power/state_ns:current",
-                                            namespaces=self.nsmap,
-                                        ),
-                                        default=-1.0,
+                                    default=-1.0,
+                                ),
+                                "avg": -1.0,  # default value as avg information in YANG
+                                "min": -1.0,  # default value as min information in YANG
+                                "max": -1.0,  # default value as max information in YANG
+                            },
+                            "output_power": {
+                                "instant": convert(
+                                    float,
+                                    self._find_txt(
+                                        lane,
+                                        "state_ns:transmit-output-power/state_ns:current",
+                                        namespaces=self.nsmap,
                                     ),
-                                    "avg": -1.0,  # default value as avg information in YANG
-                                    "min": -1.0,  # default value as min information in YANG
-                                    "max": -1.0,  # default value as max information in YANG
-                                },
-                                "laser_bias_current": {
-                                    "instant": convert(
-                                        float,
-                                        self._find_txt(
-                                            lane,
-                                            "state_ns:transmit-bias-current/state_ns:current",
-                                            namespaces=self.nsmap,
-                                        ),
-                                        default=-1.0,
+                                    default=-1.0,
+                                ),
+                                "avg": -1.0,  # default value as avg information in YANG
+                                "min": -1.0,  # default value as min information in YANG
+                                "max": -1.0,  # default value as max information in YANG
+                            },
+                            "laser_bias_current": {
+                                "instant": convert(
+                                    float,
+                                    self._find_txt(
+                                        lane,
+                                        "state_ns:transmit-bias-current/state_ns:current",
+                                        namespaces=self.nsmap,
                                     ),
-                                    "avg": -1.0,  # default value as avg information in YANG
-                                    "min": -1.0,  # default value as min information in YANG
-                                    "max": -1.0,  # default value as max information in YANG
-                                },
+                                    default=-1.0,
+                                ),
+                                "avg": -1.0,  # default value as avg information in YANG
+                                "min": -1.0,  # default value as min information in YANG
+                                "max": -1.0,  # default value as max information in YANG
                             },
-                        }
-                    )
-            return optics_dict
-        except Exception as e:
-            print("Error in method get optics : {}".format(e))
-            log.error("Error in method get optics : %s" % traceback.format_exc())
+                        },
+                    }
+                )
+        return optics_dict
 
     def get_arp_table(self, vrf=""):
         """
@@ -1348,80 +1894,50 @@ class NokiaSROSDriver(NetworkDriver):
             used is included in the output.
         """
         try:
-            arp_table = []
-
-            # helper function
-
-            def _get_arp_table(neighbor_discovered):
-
-                arp_table.append(
-                    {
-                        "interface": interface_name,
-                        "mac": self._find_txt(
-                            neighbor_discovered,
-                            "state_ns:mac-address",
-                            namespaces=self.nsmap,
-                        ),
-                        "ip": self._find_txt(
-                            neighbor_discovered,
-                            "state_ns:ipv4-address",
-                            namespaces=self.nsmap,
-                        ),
-                        "age": convert(
-                            float,
-                            self._find_txt(
-                                neighbor_discovered,
-                                "state_ns:timer",
-                                namespaces=self.nsmap,
-                            ),
-                        ),
-                    }
-                )
-
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_arp_table",
                     filter=GET_ARP_TABLE["_"].format(vrf=vrf), with_defaults="report-all",
                 ).data_xml
             )
-
-            for interface in result.xpath(
-                "state_ns:state/state_ns:router/state_ns:interface", namespaces=self.nsmap
-            ):
-                interface_name = self._find_txt(
-                    interface, "state_ns:interface-name", namespaces=self.nsmap
-                )
-
-                for neighbor in interface.xpath(
-                    "state_ns:ipv4/state_ns:neighbor-discovery/state_ns:neighbor",
-                    namespaces=self.nsmap,
-                ):
-
-                    discovered_nei_ip = self._find_txt(
-                        neighbor, "state_ns:ipv4-address", namespaces=self.nsmap,
-                    )
-                    if discovered_nei_ip == "":
-                        continue
-                    _get_arp_table(neighbor)
-
-            for interface in result.xpath(
-                "state_ns:state/state_ns:service/state_ns:vprn/state_ns:interface",
-                namespaces=self.nsmap,
-            ):
-                for neighbor in interface.xpath(
-                    "state_ns:ipv4/state_ns:neighbor-discovery/state_ns:neighbor",
-                    namespaces=self.nsmap,
-                ):
-                    discovered_nei_ip = self._find_txt(
-                        interface, "state_ns:ipv4-address", namespaces=self.nsmap,
-                    )
-                    if discovered_nei_ip == "":
-                        continue
-                    _get_arp_table(neighbor)
-            return arp_table
+            return self._parse_arp_table(result)
         except Exception as e:
             print("Error in method get arp table : {}".format(e))
             log.error("Error in method get arp table : %s" % traceback.format_exc())
 
+    def _parse_arp_table(self, result):
+        arp_table = []
+        for interface in result.xpath(
+            "state_ns:state/state_ns:router/state_ns:interface"
+            " | state_ns:state/state_ns:service/state_ns:vprn/state_ns:interface",
+            namespaces=self.nsmap,
+        ):
+            interface_name = self._find_txt(
+                interface, "state_ns:interface-name", namespaces=self.nsmap
+            )
+            for neighbor in interface.xpath(
+                "state_ns:ipv4/state_ns:neighbor-discovery/state_ns:neighbor",
+                namespaces=self.nsmap,
+            ):
+                entry = self._arp_entry(interface_name, neighbor)
+                if entry is not None:
+                    arp_table.append(entry)
+        return arp_table
+
+    def _arp_entry(self, interface_name, neighbor):
+        ip_address = self._find_txt(neighbor, "state_ns:ipv4-address", namespaces=self.nsmap)
+        if ip_address == "":
+            return None
+        return {
+            "interface": interface_name,
+            "mac": self._find_txt(neighbor, "state_ns:mac-address", namespaces=self.nsmap),
+            "ip": ip_address,
+            "age": convert(
+                float,
+                self._find_txt(neighbor, "state_ns:timer", namespaces=self.nsmap),
+            ),
+        }
+
     def get_interfaces_ip(self):
         # per router/interface and service/vprn/interface
         """
@@ -1433,86 +1949,89 @@ class NokiaSROSDriver(NetworkDriver):
                 prefix_length (int)
         """
         try:
-            interfaces_ip = {}
-
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_interfaces_ip",
                     filter=GET_INTERFACES_IP["_"], with_defaults="report-all"
                 ).data_xml
             )
+            return self._parse_interfaces_ip(result)
+        except Exception as e:
+            print("Error in method get interfaces ip : {}".format(e))
+            log.error("Error in method get interfaces ip : %s" % traceback.format_exc())
 
-            xpath_iface_filter = "configure_ns:configure/configure_ns:router/configure_ns:interface | \
-                            configure_ns:configure/configure_ns:service/configure_ns:vprn/configure_ns:interface"
+    def _parse_interfaces_ip(self, result):
+        interfaces_ip = {}
 
-            for interface in result.xpath(xpath_iface_filter, namespaces=self.nsmap):
-                interface_name = self._find_txt(
-                    interface, "configure_ns:interface-name", namespaces=self.nsmap
-                )
-                if interface_name == "":
-                    continue
-                interfaces_ip[interface_name] = {}
-                ipv4_primary_address = self._find_txt(
-                    interface,
-                    "configure_ns:ipv4/configure_ns:primary/configure_ns:address",
-                    namespaces=self.nsmap,
-                )
-                if ipv4_primary_address != "":
-                    interfaces_ip[interface_name]["ipv4"] = {
-                        ipv4_primary_address: {
-                            "prefix_length": convert(
-                                int,
-                                self._find_txt(
-                                    interface,
-                                    "configure_ns:ipv4/configure_ns:primary/configure_ns:prefix-length",
-                                    namespaces=self.nsmap,
-                                ),
-                                default="N/A",
-                            )
-                        }
+        xpath_iface_filter = "configure_ns:configure/configure_ns:router/configure_ns:interface | \
+                        configure_ns:configure/configure_ns:service/configure_ns:vprn/configure_ns:interface"
+
+        for interface in result.xpath(xpath_iface_filter, namespaces=self.nsmap):
+            interface_name = self._find_txt(
+                interface, "configure_ns:interface-name", namespaces=self.nsmap
+            )
+            if interface_name == "":
+                continue
+            interfaces_ip[interface_name] = {}
+            ipv4_primary_address = self._find_txt(
+                interface,
+                "configure_ns:ipv4/configure_ns:primary/configure_ns:address",
+                namespaces=self.nsmap,
+            )
+            if ipv4_primary_address != "":
+                interfaces_ip[interface_name]["ipv4"] = {
+                    ipv4_primary_address: {
+                        "prefix_length": convert(
+                            int,
+                            self._find_txt(
+                                interface,
+                                "configure_ns:ipv4/configure_ns:primary/configure_ns:prefix-length",
+                                namespaces=self.nsmap,
+                            ),
+                            default="N/A",
+                        )
                     }
-                ipv4_secondary_address = self._find_txt(
-                    interface,
-                    "configure_ns:ipv4/configure_ns:secondary/configure_ns:address",
-                    namespaces=self.nsmap,
-                )
-                if ipv4_secondary_address != "":
-                    interfaces_ip[interface_name]["ipv4"] = {
-                        ipv4_secondary_address: {
-                            "prefix_length": convert(
-                                int,
-                                self._find_txt(
-                                    interface,
-                                    "configure_ns:ipv4/configure_ns:secondary/configure_ns:prefix-length",
-                                    namespaces=self.nsmap,
-                                ),
-                                default="N/A",
-                            )
-                        }
+                }
+            ipv4_secondary_address = self._find_txt(
+                interface,
+                "configure_ns:ipv4/configure_ns:secondary/configure_ns:address",
+                namespaces=self.nsmap,
+            )
+            if ipv4_secondary_address != "":
+                interfaces_ip[interface_name]["ipv4"] = {
+                    ipv4_secondary_address: {
+                        "prefix_length": convert(
+                            int,
+                            self._find_txt(
+                                interface,
+                                "configure_ns:ipv4/configure_ns:secondary/configure_ns:prefix-length",
+                                namespaces=self.nsmap,
+                            ),
+                            default="N/A",
+                        )
                     }
-                ipv6_address = self._find_txt(
-                    interface,
-                    "configure_ns:ipv6/configure_ns:address/configure_ns:ipv6-address",
-                    namespaces=self.nsmap,
-                )
-                if ipv6_address != "":
-                    interfaces_ip[interface_name]["ipv6"] = {
-                        ipv6_address: {
-                            "prefix_length": convert(
-                                int,
-                                self._find_txt(
-                                    interface,
-                                    "configure_ns:ipv6/configure_ns:address/configure_ns:prefix-length",
-                                    namespaces=self.nsmap,
-                                ),
-                                default="N/A",
-                            )
-                        }
+                }
+            ipv6_address = self._find_txt(
+                interface,
+                "configure_ns:ipv6/configure_ns:address/configure_ns:ipv6-address",
+                namespaces=self.nsmap,
+            )
+            if ipv6_address != "":
+                interfaces_ip[interface_name]["ipv6"] = {
+                    ipv6_address: {
+                        "prefix_length": convert(
+                            int,
+                            self._find_txt(
+                                interface,
+                                "configure_ns:ipv6/configure_ns:address/configure_ns:prefix-length",
+                                namespaces=self.nsmap,
+                            ),
+                            default="N/A",
+                        )
                     }
+                }
 
-            return interfaces_ip
-        except Exception as e:
-            print("Error in method get interfaces ip : {}".format(e))
-            log.error("Error in method get interfaces ip : %s" % traceback.format_exc())
+        return interfaces_ip
 
     def get_ntp_peers(self):
         """
@@ -1521,31 +2040,35 @@ class NokiaSROSDriver(NetworkDriver):
             Inner dictionaries do not have yet any available keys.
         """
         try:
-            ntp_peers = {}
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_ntp_peers",
                     filter=GET_NTP_PEERS["_"], with_defaults="report-all"
                 ).data_xml
             )
-
-            for peer in result.xpath(
-                "state_ns:state/state_ns:system/state_ns:time/state_ns:ntp/state_ns:peer",
-                namespaces=self.nsmap,
-            ):
-                ntp_peers.update(
-                    {
-                        ip(
-                            self._find_txt(
-                                peer, "state_ns:ip-address", namespaces=self.nsmap
-                            )
-                        ): {}
-                    }
-                )
-            return ntp_peers
+            return self._parse_ntp_peers(result)
         except Exception as e:
             print("Error in method get ntp peers : {}".format(e))
             log.error("Error in method get ntp peers : %s" % traceback.format_exc())
 
+    def _parse_ntp_peers(self, result):
+        ntp_peers = {}
+
+        for peer in result.xpath(
+            "state_ns:state/state_ns:system/state_ns:time/state_ns:ntp/state_ns:peer",
+            namespaces=self.nsmap,
+        ):
+            ntp_peers.update(
+                {
+                    ip(
+                        self._find_txt(
+                            peer, "state_ns:ip-address", namespaces=self.nsmap
+                        )
+                    ): {}
+                }
+            )
+        return ntp_peers
+
     def get_ntp_servers(self):
         """
             Returns the NTP servers configuration as dictionary.
@@ -1553,31 +2076,35 @@ class NokiaSROSDriver(NetworkDriver):
             Inner dictionaries do not have yet any available keys.
         """
         try:
-            ntp_servers = {}
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_ntp_servers",
                     filter=GET_NTP_SERVERS["_"], with_defaults="report-all"
                 ).data_xml
             )
-
-            for server in result.xpath(
-                "state_ns:state/state_ns:system/state_ns:time/state_ns:ntp/state_ns:server",
-                namespaces=self.nsmap,
-            ):
-                ntp_servers.update(
-                    {
-                        ip(
-                            self._find_txt(
-                                server, "state_ns:ip-address", namespaces=self.nsmap
-                            )
-                        ): {}
-                    }
-                )
-            return ntp_servers
+            return self._parse_ntp_servers(result)
         except Exception as e:
             print("Error in method get ntp servers : {}".format(e))
             log.error("Error in method get ntp servers : %s" % traceback.format_exc())
 
+    def _parse_ntp_servers(self, result):
+        ntp_servers = {}
+
+        for server in result.xpath(
+            "state_ns:state/state_ns:system/state_ns:time/state_ns:ntp/state_ns:server",
+            namespaces=self.nsmap,
+        ):
+            ntp_servers.update(
+                {
+                    ip(
+                        self._find_txt(
+                            server, "state_ns:ip-address", namespaces=self.nsmap
+                        )
+                    ): {}
+                }
+            )
+        return ntp_servers
+
     def get_ntp_stats(self):
         """
         Returns a list of NTP synchronization statistics.
@@ -1594,55 +2121,58 @@ class NokiaSROSDriver(NetworkDriver):
             jitter (float)
         """
         try:
-            ntp_stats_list = []
-
-            # helper method
-            def _get_ntp_stats_data(buff):
-                dashed_row = False
-                temp_dict = {}
-                for item in buff.split("\n"):
-                    if "---" in item:
-                        dashed_row = True
-                        continue
-                    if self.ipv4_address_re.search(item) or dashed_row:
-                        row = item.strip()
-                        row_list = row.split()
-                        if len(row_list) == 8:
-                            temp_dict = {
-                                "referenceid": row_list[1],
-                                "synchronized": True if row_list[0] == "chosen" else False,
-                                "stratum": convert(int, row_list[2]),
-                                "type": row_list[3],
-                                "hostpoll": convert(int, row_list[5]),
-                                "offset": convert(float, row_list[7]),
-                            }
-
-                        if len(row_list) == 2:
-                            dashed_row = False
-                            temp_dict.update(
-                                {
-                                    "remote": row_list[1],
-                                    "when": "",
-                                    "reachability": -1,
-                                    "delay": -1.0,
-                                    "jitter": -1.0,
-                                }
-                            )
-                ntp_stats_list.append(temp_dict)
-                return ntp_stats_list
-
             cmd = ["/show system ntp servers"]
             buff_servers = self._perform_cli_commands(cmd, True, no_more=True)
-            ntp_stats_list = _get_ntp_stats_data(buff_servers)
             cmd = ["/show system ntp peers"]
             buff_peers = self._perform_cli_commands(cmd, True, no_more=True)
-            ntp_stats_list = _get_ntp_stats_data(buff_peers)
-
-            return ntp_stats_list
+            return self._parse_ntp_stats(buff_servers, buff_peers)
         except Exception as e:
             print("Error in method get ntp stats : {}".format(e))
             log.error("Error in method get ntp stats : %s" % traceback.format_exc())
 
+    def _parse_ntp_stats(self, buff_servers, buff_peers):
+        ntp_stats_list = []
+
+        # helper method
+        def _get_ntp_stats_data(buff):
+            dashed_row = False
+            temp_dict = {}
+            for item in buff.split("\n"):
+                if "---" in item:
+                    dashed_row = True
+                    continue
+                if self.ipv4_address_re.search(item) or dashed_row:
+                    row = item.strip()
+                    row_list = row.split()
+                    if len(row_list) == 8:
+                        temp_dict = {
+                            "referenceid": row_list[1],
+                            "synchronized": True if row_list[0] == "chosen" else False,
+                            "stratum": convert(int, row_list[2]),
+                            "type": row_list[3],
+                            "hostpoll": convert(int, row_list[5]),
+                            "offset": convert(float, row_list[7]),
+                        }
+
+                    if len(row_list) == 2:
+                        dashed_row = False
+                        temp_dict.update(
+                            {
+                                "remote": row_list[1],
+                                "when": "",
+                                "reachability": -1,
+                                "delay": -1.0,
+                                "jitter": -1.0,
+                            }
+                        )
+            ntp_stats_list.append(temp_dict)
+            return ntp_stats_list
+
+        ntp_stats_list = _get_ntp_stats_data(buff_servers)
+        ntp_stats_list = _get_ntp_stats_data(buff_peers)
+
+        return ntp_stats_list
+
     def get_snmp_information(self):
 
         """
@@ -1656,57 +2186,61 @@ class NokiaSROSDriver(NetworkDriver):
                     mode (string) # read-write (rw), read-only (ro)
         """
         try:
-            snmp_information = {}
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_snmp_information",
                     filter=GET_SNMP_INFORMATION["_"], with_defaults="report-all"
                 ).data_xml
             )
+            return self._parse_snmp_information(result)
+        except Exception as e:
+            print("Error in method get snmp information : {}".format(e))
+            log.error("Error in method get snmp information : %s" % traceback.format_exc())
+
+    def _parse_snmp_information(self, result):
+        snmp_information = {}
+
+        for system in result.xpath(
+            "configure_ns:configure/configure_ns:system", namespaces=self.nsmap
+        ):
+            snmp_information["chassis_id"] = self._find_txt(
+                system, "configure_ns:name", namespaces=self.nsmap
+            )
+            snmp_information["contact"] = self._find_txt(
+                system, "configure_ns:contact", namespaces=self.nsmap
+            )
+            snmp_information["location"] = self._find_txt(
+                system, "configure_ns:location", namespaces=self.nsmap
+            )
+            snmp_information["community"] = {}
 
-            for system in result.xpath(
-                "configure_ns:configure/configure_ns:system", namespaces=self.nsmap
+            for community in system.xpath(
+                "configure_ns:security/configure_ns:snmp/configure_ns:community",
+                namespaces=self.nsmap,
             ):
-                snmp_information["chassis_id"] = self._find_txt(
-                    system, "configure_ns:name", namespaces=self.nsmap
-                )
-                snmp_information["contact"] = self._find_txt(
-                    system, "configure_ns:contact", namespaces=self.nsmap
+                community_string = self._find_txt(
+                    community, "configure_ns:community-string", namespaces=self.nsmap
                 )
-                snmp_information["location"] = self._find_txt(
-                    system, "configure_ns:location", namespaces=self.nsmap
+                if community_string == "":
+                    continue
+                if community_string not in snmp_information["community"].keys():
+                    snmp_information["community"].update({community_string: {}})
+                snmp_information["community"][community_string].update(
+                    {
+                        "acl": self._find_txt(
+                            community,
+                            "configure_ns:source-access-list",
+                            namespaces=self.nsmap,
+                        ),
+                        "mode": self._find_txt(
+                            community,
+                            "configure_ns:access-permissions",
+                            namespaces=self.nsmap,
+                        ),
+                    }
                 )
-                snmp_information["community"] = {}
-
-                for community in system.xpath(
-                    "configure_ns:security/configure_ns:snmp/configure_ns:community",
-                    namespaces=self.nsmap,
-                ):
-                    community_string = self._find_txt(
-                        community, "configure_ns:community-string", namespaces=self.nsmap
-                    )
-                    if community_string == "":
-                        continue
-                    if community_string not in snmp_information["community"].keys():
-                        snmp_information["community"].update({community_string: {}})
-                    snmp_information["community"][community_string].update(
-                        {
-                            "acl": self._find_txt(
-                                community,
-                                "configure_ns:source-access-list",
-                                namespaces=self.nsmap,
-                            ),
-                            "mode": self._find_txt(
-                                community,
-                                "configure_ns:access-permissions",
-                                namespaces=self.nsmap,
-                            ),
-                        }
-                    )
 
-            return snmp_information
-        except Exception as e:
-            print("Error in method get snmp information : {}".format(e))
-            log.error("Error in method get snmp information : %s" % traceback.format_exc())
+        return snmp_information
 
     def get_users(self):
         """
@@ -1720,58 +2254,63 @@ class NokiaSROSDriver(NetworkDriver):
             and 15 represents full access to the device.
         """
         try:
-            users_dict = {}
-            profile_dict = {}
             result = to_ele(
-                self.conn.get(filter=GET_USERS["_"], with_defaults="report-all").data_xml
+                self._nc_get(
+                    "get_users", filter=GET_USERS["_"], with_defaults="report-all"
+                ).data_xml
             )
+            return self._parse_users(result)
+        except Exception as e:
+            print("Error in method get users : {}".format(e))
+            log.error("Error in method get users : %s" % traceback.format_exc())
 
-            for profile in result.xpath(
-                "configure_ns:configure/configure_ns:system/configure_ns:security/configure_ns:aaa/configure_ns:local-profiles/configure_ns:profile",
-                namespaces=self.nsmap,
-            ):
-                profile_name = self._find_txt(
-                    profile, "configure_ns:user-profile-name", namespaces=self.nsmap
-                )
-                if profile_name == "":
-                    continue
-                number = ""
-                if any(i.isdigit() for i in profile_name):
-                    number = int("".join(filter(str.isdigit, profile_name)))
-                profile_dict.update({profile_name: number})
+    def _parse_users(self, result):
+        users_dict = {}
+        profile_dict = {}
+
+        for profile in result.xpath(
+            "configure_ns:configure/configure_ns:system/configure_ns:security/configure_ns:aaa/configure_ns:local-profiles/configure_ns:profile",
+            namespaces=self.nsmap,
+        ):
+            profile_name = self._find_txt(
+                profile, "configure_ns:user-profile-name", namespaces=self.nsmap
+            )
+            if profile_name == "":
+                continue
+            number = ""
+            if any(i.isdigit() for i in profile_name):
+                number = int("".join(filter(str.isdigit, profile_name)))
+            profile_dict.update({profile_name: number})
+
+        for user in result.xpath(
+            "configure_ns:configure/configure_ns:system/configure_ns:security/configure_ns:user-params/configure_ns:local-user/configure_ns:user",
+            namespaces=self.nsmap,
+        ):
+            user_name = self._find_txt(
+                user, "configure_ns:user-name", namespaces=self.nsmap
+            )
+            password = self._find_txt(
+                user, "configure_ns:password", namespaces=self.nsmap
+            )
+            member = self._find_txt(
+                user, "configure_ns:console/configure_ns:member", namespaces=self.nsmap
+            )
+            level = profile_dict.get(member)
+            keys_list = []
 
-            for user in result.xpath(
-                "configure_ns:configure/configure_ns:system/configure_ns:security/configure_ns:user-params/configure_ns:local-user/configure_ns:user",
+            for key in user.xpath(
+                "configure_ns:public-keys/configure_ns:rsa/configure_ns:rsa-key",
                 namespaces=self.nsmap,
             ):
-                user_name = self._find_txt(
-                    user, "configure_ns:user-name", namespaces=self.nsmap
-                )
-                password = self._find_txt(
-                    user, "configure_ns:password", namespaces=self.nsmap
+                keys_list.append(
+                    self._find_txt(key, "configure_ns:key-value", namespaces=self.nsmap)
                 )
-                member = self._find_txt(
-                    user, "configure_ns:console/configure_ns:member", namespaces=self.nsmap
-                )
-                level = profile_dict.get(member)
-                keys_list = []
-
-                for key in user.xpath(
-                    "configure_ns:public-keys/configure_ns:rsa/configure_ns:rsa-key",
-                    namespaces=self.nsmap,
-                ):
-                    keys_list.append(
-                        self._find_txt(key, "configure_ns:key-value", namespaces=self.nsmap)
-                    )
-                users_dict[user_name] = {
-                    "level": convert(int, level, default=0),
-                    "password": password,
-                    "sshkeys": keys_list,
-                }
-            return users_dict
-        except Exception as e:
-            print("Error in method get users : {}".format(e))
-            log.error("Error in method get users : %s" % traceback.format_exc())
+            users_dict[user_name] = {
+                "level": convert(int, level, default=0),
+                "password": password,
+                "sshkeys": keys_list,
+            }
+        return users_dict
 
     def get_route_to(self, destination="", protocol="", longer=False):
         """
@@ -1808,6 +2347,19 @@ class NokiaSROSDriver(NetworkDriver):
             ISIS:
                 level (int)
         """
+        use_state = self._use_state_getter("get_route_to")
+        if use_state and not destination:
+            # the state tree is only read for a destination, not for the whole table
+            raise ValueError("get_route_to needs a destination prefix or address")
+        # wider longer lookups use "route-table <prefix> longer" below rather than
+        # retrieving every route of the state tree
+        if use_state and route_to_scoped(destination, longer):
+            try:
+                return get_route_to(self.conn, destination, protocol, longer)
+            except Exception as e:
+                print("Error in method get route to : {}".format(e))
+                log.error("Error in method get route to : %s" % traceback.format_exc())
+                return {}
 
         # helper functions
         try:
@@ -2111,7 +2663,9 @@ class NokiaSROSDriver(NetworkDriver):
                                     d["protocol_attributes"].update({"cost": row_1_list[2]})
 
             result = to_ele(
-                self.conn.get(filter=GET_ROUTE_TO["_"], with_defaults="report-all").data_xml
+                self._nc_get(
+                    "get_route_to", filter=GET_ROUTE_TO["_"], with_defaults="report-all"
+                ).data_xml
             )
 
             name_list = []
@@ -2205,11 +2759,19 @@ class NokiaSROSDriver(NetworkDriver):
             global_test_max_delay (float)
             global_test_avg_delay (float)
         """
+        if self._use_state_getter("get_probes_results"):
+            try:
+                return get_probes_results_state(self.conn)
+            except Exception as e:
+                print("Error in method get probes results : {}".format(e))
+                log.error("Error in method get probes results : %s" % traceback.format_exc())
+                return {}
         try:
             probes_results = {}
 
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_probes_results",
                     filter=GET_PROBES_CONFIG["_"], with_defaults="report-all"
                 ).data_xml,
             )
@@ -2357,68 +2919,71 @@ class NokiaSROSDriver(NetworkDriver):
             test_interval (int)
         """
         try:
-            probes_config = {}
-
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_probes_config",
                     filter=GET_PROBES_CONFIG["_"], with_defaults="report-all"
                 ).data_xml
             )
+            return self._parse_probes_config(result)
+        except Exception as e:
+            print("Error in method get probes config : {}".format(e))
+            log.error("Error in method get probes config : %s" % traceback.format_exc())
 
-            for probe in result.xpath(
-                "configure_ns:configure/configure_ns:saa/configure_ns:owner",
-                namespaces=self.nsmap,
-            ):
-                probe_name = self._find_txt(
-                    probe, "configure_ns:owner-name", namespaces=self.nsmap
-                )
-                if probe_name == "":
-                    continue
-                test_name = self._find_txt(
-                    probe, "configure_ns:test", namespaces=self.nsmap
-                )
-                if test_name == "":
-                    continue
-                path = "configure_ns:type/configure_ns:icmp-ping"
-                if probe_name not in probes_config.keys():
-                    probes_config = {probe_name: {test_name: {}}}
-                else:
-                    probes_config[probe_name].update({test_name: {}})
-                probes_config[probe_name][test_name].update(
-                    {
-                        "probe_type": "icmp-ping",
-                        "target": self._find_txt(
-                            probe,
-                            f"{path}/configure_ns:destination-address",
-                            namespaces=self.nsmap,
+    def _parse_probes_config(self, result):
+        probes_config = {}
+
+        for probe in result.xpath(
+            "configure_ns:configure/configure_ns:saa/configure_ns:owner",
+            namespaces=self.nsmap,
+        ):
+            probe_name = self._find_txt(
+                probe, "configure_ns:owner-name", namespaces=self.nsmap
+            )
+            if probe_name == "":
+                continue
+            test_name = self._find_txt(
+                probe, "configure_ns:test", namespaces=self.nsmap
+            )
+            if test_name == "":
+                continue
+            path = "configure_ns:type/configure_ns:icmp-ping"
+            if probe_name not in probes_config.keys():
+                probes_config = {probe_name: {test_name: {}}}
+            else:
+                probes_config[probe_name].update({test_name: {}})
+            probes_config[probe_name][test_name].update(
+                {
+                    "probe_type": "icmp-ping",
+                    "target": self._find_txt(
+                        probe,
+                        f"{path}/configure_ns:destination-address",
+                        namespaces=self.nsmap,
+                    ),
+                    "source": self._find_txt(
+                        probe,
+                        f"{path}/configure_ns:source-address",
+                        namespaces=self.nsmap,
+                    ),
+                    "probe_count": convert(
+                        int,
+                        self._find_txt(
+                            probe, f"{path}/configure_ns:count", namespaces=self.nsmap,
                         ),
-                        "source": self._find_txt(
+                        default=-1,
+                    ),
+                    "test_interval": convert(
+                        int,
+                        self._find_txt(
                             probe,
-                            f"{path}/configure_ns:source-address",
+                            f"{path}/configure_ns:interval",
                             namespaces=self.nsmap,
                         ),
-                        "probe_count": convert(
-                            int,
-                            self._find_txt(
-                                probe, f"{path}/configure_ns:count", namespaces=self.nsmap,
-                            ),
-                            default=-1,
-                        ),
-                        "test_interval": convert(
-                            int,
-                            self._find_txt(
-                                probe,
-                                f"{path}/configure_ns:interval",
-                                namespaces=self.nsmap,
-                            ),
-                            default=-1,
-                        ),
-                    }
-                )
-            return probes_config
-        except Exception as e:
-            print("Error in method get probes config : {}".format(e))
-            log.error("Error in method get probes config : %s" % traceback.format_exc())
+                        default=-1,
+                    ),
+                }
+            )
+        return probes_config
 
     def get_mac_address_table(self):
         """
@@ -2433,55 +2998,93 @@ class NokiaSROSDriver(NetworkDriver):
             moves (int)
             last_move (float)
         """
+        if self._use_state_getter("get_mac_address_table") and not getattr(self, "R19", False):
+            try:
+                return list(iter_mac_address_table(self))
+            except Exception as e:
+                print("Error in method get mac address : {}".format(e))
+                log.error("Error in method get mac address : %s" % traceback.format_exc())
+                return []
         try:
-            mac_address_list = []
-
             cmd = "/show service fdb-mac"
             buff = self._perform_cli_commands([cmd], True, no_more=True)
-            template = "textfsm_templates//nokia_sros_show_service_fdb_mac.tpl"
-            # template = "textfsm_templates\\nokia_sros_show_service_fdb_mac.tpl"
-            output_list = parse_with_textfsm(template, buff)
-            new_records = []
-            for record in output_list:
-                new_dict = {}
-                for k, v in record.items():
-                    if k.endswith("_"):
-                        new_dict[k.replace("__", "")] = new_dict[k.replace("__", "")] + v
-                    else:
-                        new_dict[k] = v
-                new_records.append(new_dict)
-
-            for record in new_records:
-                source_identifier = record.get("Source_Identifier")
-                temp_list = []
-                if ":" in source_identifier:
-                    temp_list = source_identifier.split(":")
-                static = False
-                if (
-                    record.get("Type").lower().find("static") > -1
-                    or record.get("Type").find("S") > -1
-                ):
-                    static = True
-
-                mac_address_list.append(
-                    {
-                        "mac": record.get("MAC"),
-                        "interface": source_identifier
-                        if len(temp_list) == 0
-                        else temp_list[0] + ":" + temp_list[1],
-                        "vlan": -1 if len(temp_list) == 0 else convert(int, temp_list[2]),
-                        "static": static,
-                        "active": False,
-                        "moves": -1,
-                        "last_move": -1.0,
-                    }
-                )
-
-            return mac_address_list
+            return self._parse_mac_address_table(buff)
         except Exception as e:
             print("Error in method get mac address : {}".format(e))
             log.error("Error in method get mac address : %s" % traceback.format_exc())
 
+    def _parse_mac_address_table(self, buff):
+        """Parses the output of '/show service fdb-mac'."""
+        mac_address_list = []
+        template = "textfsm_templates//nokia_sros_show_service_fdb_mac.tpl"
+        # template = "textfsm_templates\\nokia_sros_show_service_fdb_mac.tpl"
+        output_list = parse_with_textfsm(template, buff)
+        new_records = []
+        for record in output_list:
+            new_dict = {}
+            for k, v in record.items():
+                if k.endswith("_"):
+                    new_dict[k.replace("__", "")] = new_dict[k.replace("__", "")] + v
+                else:
+                    new_dict[k] = v
+            new_records.append(new_dict)
+
+        for record in new_records:
+            source_identifier = record.get("Source_Identifier")
+            temp_list = []
+            if ":" in source_identifier:
+                temp_list = source_identifier.split(":")
+            static = False
+            if (
+                record.get("Type").lower().find("static") > -1
+                or record.get("Type").find("S") > -1
+            ):
+                static = True
+
+            mac_address_list.append(
+                {
+                    "mac": record.get("MAC"),
+                    "interface": source_identifier
+                    if len(temp_list) == 0
+                    else temp_list[0] + ":" + temp_list[1],
+                    "vlan": -1 if len(temp_list) == 0 else convert(int, temp_list[2]),
+                    "static": static,
+                    "active": False,
+                    "moves": -1,
+                    "last_move": -1.0,
+                }
+            )
+
+        return mac_address_list
+
+    def _mac_entry(self, mac):
+        """Builds a MAC address table entry from an FDB entry of the state tree."""
+        address = self._find_txt(mac, "state_ns:address", namespaces=self.nsmap)
+        if address == "":
+            return None
+        # reported like the Source-Identifier column of the CLI, e.g. sap:1/1/2:10 or sdp:1:100
+        sap = self._find_txt(mac, "state_ns:sap", namespaces=self.nsmap)
+        sdp = self._find_txt(mac, "state_ns:sdp", namespaces=self.nsmap)
+        interface = self._find_txt(mac, "state_ns:locale", namespaces=self.nsmap)
+        vlan = -1
+        for kind, binding in (("sap", sap), ("sdp", sdp)):
+            if binding:
+                port, _, tag = binding.rpartition(":")
+                interface = "{}:{}".format(kind, port or binding)
+                vlan = convert(int, tag, default=-1) if port else -1
+                break
+        return {
+            "mac": address,
+            "interface": interface,
+            "vlan": vlan,
+            "static": "static" in self._find_txt(
+                mac, "state_ns:type", namespaces=self.nsmap
+            ).lower(),
+            "active": False,
+            "moves": -1,
+            "last_move": -1.0,
+        }
+
     def get_bgp_neighbors(self):
         """
             Returns a dictionary of dictionaries. The keys for the first dictionary will be the vrf
@@ -2513,9 +3116,11 @@ class NokiaSROSDriver(NetworkDriver):
           log.error("Error in method get bgp neighbors : %s" % traceback.format_exc())
           return {}
 
-    def get_bgp_neighbors_detail(self, neighbor_address=""):
+    def get_bgp_neighbors_detail(self, neighbor_address="", *, vrf=""):
         """
         :param neighbor_address:
+        :param vrf: only retrieve the neighbors of this routing instance, "global" or a VPRN
+            service name; all instances if empty
         :return:
             Returns a dictionary of dictionaries. The keys for the first dictionary will be the vrf (global if no vrf).
             The keys of the inner dictionary represent the AS number of the neighbors.
@@ -2558,7 +3163,7 @@ class NokiaSROSDriver(NetworkDriver):
 
         """
         try:
-          return get_bgp_neighbors_detail(self.conn,neighbor_address)
+          return get_bgp_neighbors_detail(self.conn,neighbor_address,vrf)
         except Exception as e:
           print(e)
           log.error("Error in method get bgp neighbors detail : %s" % traceback.format_exc())
@@ -2618,344 +3223,347 @@ class NokiaSROSDriver(NetworkDriver):
         # Does not (cannot) report dynamic neighbors, only static ones
         #
         try:
-            bgp_config = {}
+            bgp_running_config = to_ele(
+                self._nc_get(
+                    "get_bgp_config",
+                    filter=GET_BGP_CONFIG["_"].format(group_name=group, neighbor=neighbor),
+                    with_defaults="report-all",
+                ).data_xml
+            )
+            return self._parse_bgp_config(bgp_running_config, group, neighbor)
+        except Exception as e:
+            print("Error in method get bgp config : {}".format(e))
+            log.error("Error in method get bgp config : %s" % traceback.format_exc())
 
-            # helpers
+    def _parse_bgp_config(self, bgp_running_config, group, neighbor):
+        bgp_config = {}
 
-            def _build_prefix_limit(peer_xml):
-                prefix_limit = {}
-                for pl in peer_xml.xpath(
-                    "configure_ns:prefix-limit", namespaces=self.nsmap
-                ):
-                    af = self._find_txt(
-                        pl, "configure_ns:family", namespaces=self.nsmap
-                    ).lower()
-                    if "ipv6" in af:
-                        prefix_type = "inet6"
-                    else:
-                        prefix_type = "inet"
+        # helpers
 
-                    prefix_limit.update(
-                        {
-                            prefix_type: {
-                                af: {
-                                    "limit": self._find_txt(
-                                        pl, "configure_ns:maximum", namespaces=self.nsmap
+        def _build_prefix_limit(peer_xml):
+            prefix_limit = {}
+            for pl in peer_xml.xpath(
+                "configure_ns:prefix-limit", namespaces=self.nsmap
+            ):
+                af = self._find_txt(
+                    pl, "configure_ns:family", namespaces=self.nsmap
+                ).lower()
+                if "ipv6" in af:
+                    prefix_type = "inet6"
+                else:
+                    prefix_type = "inet"
+
+                prefix_limit.update(
+                    {
+                        prefix_type: {
+                            af: {
+                                "limit": self._find_txt(
+                                    pl, "configure_ns:maximum", namespaces=self.nsmap
+                                ),
+                                "teardown": {
+                                    "threshold": self._find_txt(
+                                        pl,
+                                        "configure_ns:threshold",
+                                        namespaces=self.nsmap,
                                     ),
-                                    "teardown": {
-                                        "threshold": self._find_txt(
-                                            pl,
-                                            "configure_ns:threshold",
-                                            namespaces=self.nsmap,
-                                        ),
-                                        "timeout": self._find_txt(
-                                            pl,
-                                            "configure_ns:idle-timeout",
-                                            namespaces=self.nsmap,
-                                        ),
-                                    },
-                                }
+                                    "timeout": self._find_txt(
+                                        pl,
+                                        "configure_ns:idle-timeout",
+                                        namespaces=self.nsmap,
+                                    ),
+                                },
                             }
                         }
-                    )
-                return prefix_limit
+                    }
+                )
+            return prefix_limit
 
-            def _get_policies(policies_xml):
-                policies = [ele.text for ele in policies_xml]
-                return ", ".join(policies)
+        def _get_policies(policies_xml):
+            policies = [ele.text for ele in policies_xml]
+            return ", ".join(policies)
 
-            def _route_reflect(xml):
-              _cluster_id = self._find_txt(xml,"configure_ns:cluster/configure_ns:cluster-id",namespaces=self.nsmap)
-              _client_reflect = self._find_txt(xml,"configure_ns:client-reflect", namespaces=self.nsmap)
-              return (bool(_cluster_id),_client_reflect) # keep client_reflect as string to distinguish between not set and 'false'
+        def _route_reflect(xml):
+          _cluster_id = self._find_txt(xml,"configure_ns:cluster/configure_ns:cluster-id",namespaces=self.nsmap)
+          _client_reflect = self._find_txt(xml,"configure_ns:client-reflect", namespaces=self.nsmap)
+          return (bool(_cluster_id),_client_reflect) # keep client_reflect as string to distinguish between not set and 'false'
 
-            def _get_bgp_neighbor_group(bgp_neighbors,global_autonomous):
-                for bgp_neighbor in bgp_neighbors:
-                    group_name = self._find_txt(
-                        bgp_neighbor, "configure_ns:group", namespaces=self.nsmap
-                    )
+        def _get_bgp_neighbor_group(bgp_neighbors,global_autonomous):
+            for bgp_neighbor in bgp_neighbors:
+                group_name = self._find_txt(
+                    bgp_neighbor, "configure_ns:group", namespaces=self.nsmap
+                )
 
-                    def _group_attr(attr):
-                      return bgp_groups[group_name][attr] if group_name in bgp_groups and attr in bgp_groups[group_name] else None
+                def _group_attr(attr):
+                  return bgp_groups[group_name][attr] if group_name in bgp_groups and attr in bgp_groups[group_name] else None
 
-                    peer = ip(
-                        self._find_txt(
-                            bgp_neighbor, "configure_ns:ip-address", namespaces=self.nsmap
-                        )
+                peer = ip(
+                    self._find_txt(
+                        bgp_neighbor, "configure_ns:ip-address", namespaces=self.nsmap
                     )
+                )
 
-                    if neighbor != "" and peer != neighbor:
-                        continue
+                if neighbor != "" and peer != neighbor:
+                    continue
 
-                    # JvB note: 'type' configuration allows implicit peer AS configuration for iBGP
-                    type_ = self._find_txt(
-                        bgp_neighbor, "configure_ns:type", namespaces=self.nsmap
-                    ) or _group_attr('type')
+                # JvB note: 'type' configuration allows implicit peer AS configuration for iBGP
+                type_ = self._find_txt(
+                    bgp_neighbor, "configure_ns:type", namespaces=self.nsmap
+                ) or _group_attr('type')
 
-                    _nhs = self._find_txt(
-                        bgp_neighbor,"configure_ns:next-hop-self",namespaces=self.nsmap,
-                    )
-                    _next_hop_self = (_nhs != "false") if _nhs else _group_attr('_nhs')
+                _nhs = self._find_txt(
+                    bgp_neighbor,"configure_ns:next-hop-self",namespaces=self.nsmap,
+                )
+                _next_hop_self = (_nhs != "false") if _nhs else _group_attr('_nhs')
 
-                    _cluster_id,_client_reflect = _route_reflect(bgp_neighbor)
-                    route_reflector = (_cluster_id or _group_attr('_cluster_id')) \
-                                  and (_group_attr('_client_reflect') and _client_reflect=="")
+                _cluster_id,_client_reflect = _route_reflect(bgp_neighbor)
+                route_reflector = (_cluster_id or _group_attr('_cluster_id')) \
+                              and (_group_attr('_client_reflect') and _client_reflect=="")
 
-                    explicit_local_as = self._find_txt(
-                        bgp_neighbor,
-                        "configure_ns:local-as/configure_ns:as-number",
-                        namespaces=self.nsmap,
-                    )
+                explicit_local_as = self._find_txt(
+                    bgp_neighbor,
+                    "configure_ns:local-as/configure_ns:as-number",
+                    namespaces=self.nsmap,
+                )
 
-                    # Order of priority:
-                    # 1. Neighbor level local-as
-                    # 2. Group level local-as
-                    # 3. Global AS
-                    local_as = explicit_local_as or _group_attr('local_as') or global_autonomous
+                # Order of priority:
+                # 1. Neighbor level local-as
+                # 2. Group level local-as
+                # 3. Global AS
+                local_as = explicit_local_as or _group_attr('local_as') or global_autonomous
 
-                    explicit_peer_as = self._find_txt(
-                        bgp_neighbor, "configure_ns:peer-as", namespaces=self.nsmap
-                    )
+                explicit_peer_as = self._find_txt(
+                    bgp_neighbor, "configure_ns:peer-as", namespaces=self.nsmap
+                )
 
-                    if explicit_peer_as:
-                      peer_as = explicit_peer_as
-                    else:
-                      group_remote_as = _group_attr('remote_as')
-                      if group_remote_as:
-                        peer_as = group_remote_as
-                      elif type_=="internal": # implicit peer_as configuration
-                        peer_as = local_as
-                      else:
-                        peer_as = 0 # Not configured
-
-                    if group_name not in bgp_group_neighbors.keys():
-                        bgp_group_neighbors[group_name] = {}
-                    bgp_group_neighbors[group_name][peer] = {
-                        "description": self._find_txt(
-                            bgp_neighbor, "configure_ns:description", namespaces=self.nsmap
-                        ),
-                        "local_as": as_number(local_as),
-                        "remote_as": as_number(peer_as),
-                        "prefix_limit": _build_prefix_limit(bgp_neighbor),
-                        "import_policy": _get_policies(
-                            bgp_neighbor.xpath(
-                                "configure_ns:import/configure_ns:policy",
-                                namespaces=self.nsmap,
-                            )
-                        ),
-                        "export_policy": _get_policies(
-                            bgp_neighbor.xpath(
-                                "configure_ns:export/configure_ns:policy",
-                                namespaces=self.nsmap,
-                            )
-                        ),
-                        "local_address": convert(
-                            ip,
-                            self._find_txt(
-                                bgp_neighbor,
-                                "configure_ns:local-address",
-                                namespaces=self.nsmap,
-                            ),
-                        ),
-                        # Note: ignoring any group level authentication key here
-                        "authentication_key": self._find_txt(
-                            bgp_neighbor,
-                            "configure_ns:authentication-key",
+                if explicit_peer_as:
+                  peer_as = explicit_peer_as
+                else:
+                  group_remote_as = _group_attr('remote_as')
+                  if group_remote_as:
+                    peer_as = group_remote_as
+                  elif type_=="internal": # implicit peer_as configuration
+                    peer_as = local_as
+                  else:
+                    peer_as = 0 # Not configured
+
+                if group_name not in bgp_group_neighbors.keys():
+                    bgp_group_neighbors[group_name] = {}
+                bgp_group_neighbors[group_name][peer] = {
+                    "description": self._find_txt(
+                        bgp_neighbor, "configure_ns:description", namespaces=self.nsmap
+                    ),
+                    "local_as": as_number(local_as),
+                    "remote_as": as_number(peer_as),
+                    "prefix_limit": _build_prefix_limit(bgp_neighbor),
+                    "import_policy": _get_policies(
+                        bgp_neighbor.xpath(
+                            "configure_ns:import/configure_ns:policy",
                             namespaces=self.nsmap,
-                        ),
-                        "nhs": bool(_next_hop_self),
-                        "route_reflector_client": route_reflector,
-                    }
-                    if neighbor != "" and peer == neighbor:
-                        break
-
-            def _get_bgp_group_data(bgp_groups_list,local_as_number,g_cluster_id,g_client_reflect):
-                for bgp_group in bgp_groups_list:
-                    group_name = self._find_txt(
-                        bgp_group, "configure_ns:group-name", namespaces=self.nsmap
-                    )
-                    if group != "" and group != group_name:
-                        continue
-
-                    remove_private = (
-                        True
-                        if self._find_txt(
-                            bgp_group,
-                            "configure_ns:remove-private/configure_ns:limited",
+                        )
+                    ),
+                    "export_policy": _get_policies(
+                        bgp_neighbor.xpath(
+                            "configure_ns:export/configure_ns:policy",
                             namespaces=self.nsmap,
                         )
-                        == "true"
-                        else False
-                    )
-                    type_ = self._find_txt(
-                        bgp_group, "configure_ns:type", namespaces=self.nsmap
-                    )
-                    explicit_local_as = self._find_txt(
-                        bgp_group,
-                        "configure_ns:local-as/configure_ns:as-number",
+                    ),
+                    "local_address": convert(
+                        ip,
+                        self._find_txt(
+                            bgp_neighbor,
+                            "configure_ns:local-address",
+                            namespaces=self.nsmap,
+                        ),
+                    ),
+                    # Note: ignoring any group level authentication key here
+                    "authentication_key": self._find_txt(
+                        bgp_neighbor,
+                        "configure_ns:authentication-key",
                         namespaces=self.nsmap,
-                    )
-                    local_as = int(explicit_local_as or local_as_number)
+                    ),
+                    "nhs": bool(_next_hop_self),
+                    "route_reflector_client": route_reflector,
+                }
+                if neighbor != "" and peer == neighbor:
+                    break
 
-                    explicit_peer_as = self._find_txt(
-                        bgp_group, "configure_ns:peer-as", namespaces=self.nsmap
-                    )
-                    if explicit_peer_as:
-                      peer_as = int(explicit_peer_as)
-                      type_ = "internal" if peer_as==local_as else "external"
-                    elif type_=="internal":
-                      peer_as = local_as # Implicitly configured
-                    else:
-                      peer_as = 0 # Not configured, type_ may be 'no-type'
+        def _get_bgp_group_data(bgp_groups_list,local_as_number,g_cluster_id,g_client_reflect):
+            for bgp_group in bgp_groups_list:
+                group_name = self._find_txt(
+                    bgp_group, "configure_ns:group-name", namespaces=self.nsmap
+                )
+                if group != "" and group != group_name:
+                    continue
 
-                    xbgp = "ibgp" if type_=="internal" else "ebgp"
-                    max_path = self._find_txt(
+                remove_private = (
+                    True
+                    if self._find_txt(
                         bgp_group,
-                        f"../configure_ns:multipath/configure_ns:{xbgp}",
+                        "configure_ns:remove-private/configure_ns:limited",
                         namespaces=self.nsmap,
                     )
-                    multipath = bool( peer_as and max_path and int(max_path)>1 )
-
-                    _nhs = self._find_txt(bgp_group, "configure_ns:next-hop-self", namespaces=self.nsmap)
-                    # Can only set client_reflect to 'false' at group level
-                    _cluster_id,_client_reflect = _route_reflect(bgp_group)
-
-                    apply_groups_list = []
-                    for apply_group in bgp_group.xpath(
-                        "configure_ns:apply-groups", namespaces=self.nsmap
-                    ):
-                        apply_groups_list.append(apply_group)
-
-                    bgp_groups[group_name] = {
-                        "type": type_,
-                        "description": self._find_txt(
-                            bgp_group, "configure_ns:description", namespaces=self.nsmap
-                        ),
-                        "apply_groups": apply_groups_list,
-                        "local_as": as_number(local_as),
-                        "remote_as": as_number(peer_as),
-                        "remove_private_as": remove_private,
-                        "import_policy": _get_policies(
-                            bgp_group.xpath(
-                                "configure_ns:import/configure_ns:policy",
-                                namespaces=self.nsmap,
-                            )
-                        ),
-                        "export_policy": _get_policies(
-                            bgp_group.xpath(
-                                "configure_ns:export/configure_ns:policy",
-                                namespaces=self.nsmap,
-                            )
-                        ),
-                        "local_address": convert(
-                            ip,
-                            self._find_txt(
-                                bgp_group,
-                                "configure_ns:local-address",
-                                namespaces=self.nsmap,
-                            ),
-                        ),
-                        "multipath": multipath,
-                        "multihop_ttl": convert(
-                            int,
-                            self._find_txt(
-                                bgp_group, "configure_ns:multihop", namespaces=self.nsmap
-                            ),
-                            default=-1,
-                        ),
-                        "prefix_limit": _build_prefix_limit(bgp_group),
-                        "_nhs": bool(_nhs != "false"),
-                        "_cluster_id": g_cluster_id or bool(_cluster_id),
-                        "_client_reflect": g_client_reflect and _client_reflect=="",
-                        "neighbors": {},
-                    }
-                    if group != "" and group == group_name:
-                        break
-
-            bgp_running_config = to_ele(
-                self.conn.get(
-                    filter=GET_BGP_CONFIG["_"].format(group_name=group, neighbor=neighbor),
-                    with_defaults="report-all",
-                ).data_xml
-            )
-            # print( to_xml(bgp_running_config, pretty_print=True) )
-
-            bgp_group_neighbors = {}
-            bgp_groups = {}
-            global_as = self._find_txt(
-                bgp_running_config,
-                "configure_ns:configure/configure_ns:router/configure_ns:autonomous-system",
-                namespaces=self.nsmap,
-            )
-
-            for router in bgp_running_config.xpath(
-                "configure_ns:configure/configure_ns:router/configure_ns:bgp",
-                namespaces=self.nsmap,
-            ):
-                _cluster_id,_client_reflect = _route_reflect(router)
-                _get_bgp_group_data(
-                    router.xpath("configure_ns:group", namespaces=self.nsmap),
-                    local_as_number=int(global_as),
-                    g_cluster_id=_cluster_id,g_client_reflect=_client_reflect
+                    == "true"
+                    else False
                 )
-                _get_bgp_neighbor_group(
-                    router.xpath("configure_ns:neighbor", namespaces=self.nsmap),
-                    global_as,
+                type_ = self._find_txt(
+                    bgp_group, "configure_ns:type", namespaces=self.nsmap
                 )
-
-            for vprn in bgp_running_config.xpath(
-                "configure_ns:configure/configure_ns:service/configure_ns:vprn/configure_ns:bgp",
-                namespaces=self.nsmap,
-            ):
-                vprn_as = self._find_txt(
-                    vprn,"../configure_ns:autonomous-system",
+                explicit_local_as = self._find_txt(
+                    bgp_group,
+                    "configure_ns:local-as/configure_ns:as-number",
                     namespaces=self.nsmap,
                 )
-                _cluster_id,_client_reflect = _route_reflect(vprn)
-                _get_bgp_group_data(
-                    vprn.xpath("configure_ns:group", namespaces=self.nsmap),
-                    local_as_number=int(vprn_as),
-                    g_cluster_id=_cluster_id,g_client_reflect=_client_reflect
+                local_as = int(explicit_local_as or local_as_number)
+
+                explicit_peer_as = self._find_txt(
+                    bgp_group, "configure_ns:peer-as", namespaces=self.nsmap
                 )
-                _get_bgp_neighbor_group(
-                    vprn.xpath("configure_ns:neighbor",namespaces=self.nsmap),
-                    vprn_as,
+                if explicit_peer_as:
+                  peer_as = int(explicit_peer_as)
+                  type_ = "internal" if peer_as==local_as else "external"
+                elif type_=="internal":
+                  peer_as = local_as # Implicitly configured
+                else:
+                  peer_as = 0 # Not configured, type_ may be 'no-type'
+
+                xbgp = "ibgp" if type_=="internal" else "ebgp"
+                max_path = self._find_txt(
+                    bgp_group,
+                    f"../configure_ns:multipath/configure_ns:{xbgp}",
+                    namespaces=self.nsmap,
                 )
+                multipath = bool( peer_as and max_path and int(max_path)>1 )
+
+                _nhs = self._find_txt(bgp_group, "configure_ns:next-hop-self", namespaces=self.nsmap)
+                # Can only set client_reflect to 'false' at group level
+                _cluster_id,_client_reflect = _route_reflect(bgp_group)
+
+                apply_groups_list = []
+                for apply_group in bgp_group.xpath(
+                    "configure_ns:apply-groups", namespaces=self.nsmap
+                ):
+                    apply_groups_list.append(apply_group)
 
-            # Assemble groups and neighbors
-            for grp_name, grp_data in bgp_groups.items():
-                neighbors = bgp_group_neighbors.get(grp_name, {})
-
-                grp_data.pop("_nhs")  # remove temporary keys
-                grp_data.pop("_cluster_id")
-                grp_data.pop("_client_reflect")
-
-                grp_data["neighbors"] = neighbors  # Add updated neighbors to group
-
-                bgp_config[grp_name] = grp_data  # Add group with neighbors to output dict
-
-            if "" in bgp_group_neighbors.keys():
-                bgp_config["_"] = {
-                    "apply_groups": [],
-                    "description": "",
-                    "local_as": 0,
-                    "type": "",
-                    "import_policy": "",
-                    "export_policy": "",
-                    "local_address": "",
-                    "multipath": False,
-                    "multihop_ttl": 0,
-                    "remote_as": 0,
-                    "remove_private_as": False,
-                    "prefix_limit": {},
-                    "neighbors": bgp_group_neighbors.get("", {}),
+                bgp_groups[group_name] = {
+                    "type": type_,
+                    "description": self._find_txt(
+                        bgp_group, "configure_ns:description", namespaces=self.nsmap
+                    ),
+                    "apply_groups": apply_groups_list,
+                    "local_as": as_number(local_as),
+                    "remote_as": as_number(peer_as),
+                    "remove_private_as": remove_private,
+                    "import_policy": _get_policies(
+                        bgp_group.xpath(
+                            "configure_ns:import/configure_ns:policy",
+                            namespaces=self.nsmap,
+                        )
+                    ),
+                    "export_policy": _get_policies(
+                        bgp_group.xpath(
+                            "configure_ns:export/configure_ns:policy",
+                            namespaces=self.nsmap,
+                        )
+                    ),
+                    "local_address": convert(
+                        ip,
+                        self._find_txt(
+                            bgp_group,
+                            "configure_ns:local-address",
+                            namespaces=self.nsmap,
+                        ),
+                    ),
+                    "multipath": multipath,
+                    "multihop_ttl": convert(
+                        int,
+                        self._find_txt(
+                            bgp_group, "configure_ns:multihop", namespaces=self.nsmap
+                        ),
+                        default=-1,
+                    ),
+                    "prefix_limit": _build_prefix_limit(bgp_group),
+                    "_nhs": bool(_nhs != "false"),
+                    "_cluster_id": g_cluster_id or bool(_cluster_id),
+                    "_client_reflect": g_client_reflect and _client_reflect=="",
+                    "neighbors": {},
                 }
+                if group != "" and group == group_name:
+                    break
 
-            return bgp_config
+        # print( to_xml(bgp_running_config, pretty_print=True) )
 
-        except Exception as e:
-            print("Error in method get bgp config : {}".format(e))
-            log.error("Error in method get bgp config : %s" % traceback.format_exc())
+        bgp_group_neighbors = {}
+        bgp_groups = {}
+        global_as = self._find_txt(
+            bgp_running_config,
+            "configure_ns:configure/configure_ns:router/configure_ns:autonomous-system",
+            namespaces=self.nsmap,
+        )
+
+        for router in bgp_running_config.xpath(
+            "configure_ns:configure/configure_ns:router/configure_ns:bgp",
+            namespaces=self.nsmap,
+        ):
+            _cluster_id,_client_reflect = _route_reflect(router)
+            _get_bgp_group_data(
+                router.xpath("configure_ns:group", namespaces=self.nsmap),
+                local_as_number=int(global_as),
+                g_cluster_id=_cluster_id,g_client_reflect=_client_reflect
+            )
+            _get_bgp_neighbor_group(
+                router.xpath("configure_ns:neighbor", namespaces=self.nsmap),
+                global_as,
+            )
+
+        for vprn in bgp_running_config.xpath(
+            "configure_ns:configure/configure_ns:service/configure_ns:vprn/configure_ns:bgp",
+            namespaces=self.nsmap,
+        ):
+            vprn_as = self._find_txt(
+                vprn,"../configure_ns:autonomous-system",
+                namespaces=self.nsmap,
+            )
+            _cluster_id,_client_reflect = _route_reflect(vprn)
+            _get_bgp_group_data(
+                vprn.xpath("configure_ns:group", namespaces=self.nsmap),
+                local_as_number=int(vprn_as),
+                g_cluster_id=_cluster_id,g_client_reflect=_client_reflect
+            )
+            _get_bgp_neighbor_group(
+                vprn.xpath("configure_ns:neighbor",namespaces=self.nsmap),
+                vprn_as,
+            )
+
+        # Assemble groups and neighbors
+        for grp_name, grp_data in bgp_groups.items():
+            neighbors = bgp_group_neighbors.get(grp_name, {})
+
+            grp_data.pop("_nhs")  # remove temporary keys
+            grp_data.pop("_cluster_id")
+            grp_data.pop("_client_reflect")
+
+            grp_data["neighbors"] = neighbors  # Add updated neighbors to group
+
+            bgp_config[grp_name] = grp_data  # Add group with neighbors to output dict
+
+        if "" in bgp_group_neighbors.keys():
+            bgp_config["_"] = {
+                "apply_groups": [],
+                "description": "",
+                "local_as": 0,
+                "type": "",
+                "import_policy": "",
+                "export_policy": "",
+                "local_address": "",
+                "multipath": False,
+                "multihop_ttl": 0,
+                "remote_as": 0,
+                "remove_private_as": False,
+                "prefix_limit": {},
+                "neighbors": bgp_group_neighbors.get("", {}),
+            }
+
+        return bgp_config
 
     def get_lldp_neighbors(self):
         """
@@ -2965,48 +3573,52 @@ class NokiaSROSDriver(NetworkDriver):
                 port
         """
         try:
-            lldp_neighbors = {}
+            root = to_ele(
+                self._nc_get("get_lldp_neighbors", filter=GET_LLDP_NEIGHBORS["_"]).data_xml
+            )
+            return self._parse_lldp_neighbors(root)
+        except Exception as e:
+            print("Error in method get lldp neighbors : {}".format(e))
+            log.error("Error in method get lldp neighbors : %s" % traceback.format_exc())
 
-            root = to_ele(self.conn.get(filter=GET_LLDP_NEIGHBORS["_"]).data_xml)
+    def _parse_lldp_neighbors(self, root):
+        lldp_neighbors = {}
 
-            path = (
-                "state_ns:ethernet/state_ns:lldp/state_ns:dest-mac/state_ns:remote-system/"
+        path = (
+            "state_ns:ethernet/state_ns:lldp/state_ns:dest-mac/state_ns:remote-system/"
+        )
+        for port in root.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
+            port_id = self._find_txt(
+                port, "state_ns:port-id", namespaces=self.nsmap
+            )  # port name
+            port_op_state = self._find_txt(
+                port, "state_ns:oper-state", namespaces=self.nsmap
+            ).lower()
+            if port_op_state != "up" or port_id == "":
+                continue
+            # if no remote_chassis_id is present (mandatory TLV),
+            # then no LLDP neighbor is behind the port
+            remote_chassis_id = self._find_txt(
+                port, f"{path}state_ns:chassis-id", namespaces=self.nsmap
             )
-            for port in root.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
-                port_id = self._find_txt(
-                    port, "state_ns:port-id", namespaces=self.nsmap
-                )  # port name
-                port_op_state = self._find_txt(
-                    port, "state_ns:oper-state", namespaces=self.nsmap
-                ).lower()
-                if port_op_state != "up" or port_id == "":
-                    continue
-                # if no remote_chassis_id is present (mandatory TLV),
-                # then no LLDP neighbor is behind the port
-                remote_chassis_id = self._find_txt(
-                    port, f"{path}state_ns:chassis-id", namespaces=self.nsmap
-                )
-                if remote_chassis_id == "":
-                    continue
-                remote_system_name = self._find_txt(
-                    port, f"{path}state_ns:system-name", namespaces=self.nsmap
-                )
-                remote_port_id = self._find_txt(
-                    port, f"{path}state_ns:remote-port-id", namespaces=self.nsmap
+            if remote_chassis_id == "":
+                continue
+            remote_system_name = self._find_txt(
+                port, f"{path}state_ns:system-name", namespaces=self.nsmap
+            )
+            remote_port_id = self._find_txt(
+                port, f"{path}state_ns:remote-port-id", namespaces=self.nsmap
+            )
+            if port_id not in lldp_neighbors.keys():
+                lldp_neighbors[port_id] = [
+                    {"hostname": remote_system_name, "port": remote_port_id}
+                ]
+            else:
+                lldp_neighbors[port_id].append(
+                    {"hostname": remote_system_name, "port": remote_port_id}
                 )
-                if port_id not in lldp_neighbors.keys():
-                    lldp_neighbors[port_id] = [
-                        {"hostname": remote_system_name, "port": remote_port_id}
-                    ]
-                else:
-                    lldp_neighbors[port_id].append(
-                        {"hostname": remote_system_name, "port": remote_port_id}
-                    )
 
-            return lldp_neighbors
-        except Exception as e:
-            print("Error in method get lldp neighbors : {}".format(e))
-            log.error("Error in method get lldp neighbors : %s" % traceback.format_exc())
+        return lldp_neighbors
 
     def get_lldp_neighbors_detail(self, interface=""):
         """
@@ -3034,71 +3646,75 @@ class NokiaSROSDriver(NetworkDriver):
             remote_system_enabled_capab (list)
         """
         try:
-            lldp_neighbors_details = {}
-
             root = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_lldp_neighbors_detail",
                     filter=GET_LLDP_NEIGHBORS_DETAIL["_"].format(port_id=interface)
                 ).data_xml
             )
-            for port in root.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
-                port_id = self._find_txt(
-                    port, "state_ns:port-id", namespaces=self.nsmap
-                )  # port name
-                port_op_state = self._find_txt(
-                    port, "state_ns:oper-state", namespaces=self.nsmap
-                ).lower()
-                if port_id == "" or port_op_state != "up":
-                    continue
-                path = "state_ns:ethernet/state_ns:lldp/state_ns:dest-mac/state_ns:remote-system/"
-                remote_chassis_id = self._find_txt(
-                    port, f"{path}state_ns:chassis-id", namespaces=self.nsmap
-                )
-                # if no remote_chassis_id is present (mandatory TLV),
-                # then no LLDP neighbor is behind the port
-                if remote_chassis_id == "":
-                    continue
-                remote_system_name = self._find_txt(
-                    port, f"{path}state_ns:system-name", namespaces=self.nsmap
-                )
-                remote_port_id = self._find_txt(
-                    port, f"{path}state_ns:remote-port-id", namespaces=self.nsmap
-                )
-                remote_port_desc = self._find_txt(
-                    port, f"{path}state_ns:port-description", namespaces=self.nsmap
-                )
-                remote_system_description = self._find_txt(
-                    port, f"{path}state_ns:system-description", namespaces=self.nsmap
-                )
-                remote_system_capab = self._find_txt(
-                    port,
-                    f"{path}state_ns:system-supported-capabilities",
-                    namespaces=self.nsmap,
-                )
-                remote_system_enable_capab = self._find_txt(
-                    port,
-                    f"{path}state_ns:system-enabled-capabilities",
-                    namespaces=self.nsmap,
-                )
-                if port_id not in lldp_neighbors_details.keys():
-                    lldp_neighbors_details[port_id] = []
-                lldp_neighbors_details[port_id].append(
-                    {
-                        "parent_interface": "",
-                        "remote_chassis_id": remote_chassis_id,
-                        "remote_system_name": remote_system_name,
-                        "remote_port": remote_port_id,
-                        "remote_port_description": remote_port_desc,
-                        "remote_system_description": remote_system_description,
-                        "remote_system_capab": remote_system_capab.split(),
-                        "remote_system_enable_capab": remote_system_enable_capab.split(),
-                    }
-                )
-            return lldp_neighbors_details
+            return self._parse_lldp_neighbors_detail(root)
         except Exception as e:
             print("Error in method get lldp neighbors detail : {}".format(e))
             log.error("Error in method get lldp neighbors detail : %s" % traceback.format_exc())
 
+    def _parse_lldp_neighbors_detail(self, root):
+        lldp_neighbors_details = {}
+
+        for port in root.xpath("state_ns:state/state_ns:port", namespaces=self.nsmap):
+            port_id = self._find_txt(
+                port, "state_ns:port-id", namespaces=self.nsmap
+            )  # port name
+            port_op_state = self._find_txt(
+                port, "state_ns:oper-state", namespaces=self.nsmap
+            ).lower()
+            if port_id == "" or port_op_state != "up":
+                continue
+            path = "state_ns:ethernet/state_ns:lldp/state_ns:dest-mac/state_ns:remote-system/"
+            remote_chassis_id = self._find_txt(
+                port, f"{path}state_ns:chassis-id", namespaces=self.nsmap
+            )
+            # if no remote_chassis_id is present (mandatory TLV),
+            # then no LLDP neighbor is behind the port
+            if remote_chassis_id == "":
+                continue
+            remote_system_name = self._find_txt(
+                port, f"{path}state_ns:system-name", namespaces=self.nsmap
+            )
+            remote_port_id = self._find_txt(
+                port, f"{path}state_ns:remote-port-id", namespaces=self.nsmap
+            )
+            remote_port_desc = self._find_txt(
+                port, f"{path}state_ns:port-description", namespaces=self.nsmap
+            )
+            remote_system_description = self._find_txt(
+                port, f"{path}state_ns:system-description", namespaces=self.nsmap
+            )
+            remote_system_capab = self._find_txt(
+                port,
+                f"{path}state_ns:system-supported-capabilities",
+                namespaces=self.nsmap,
+            )
+            remote_system_enable_capab = self._find_txt(
+                port,
+                f"{path}state_ns:system-enabled-capabilities",
+                namespaces=self.nsmap,
+            )
+            if port_id not in lldp_neighbors_details.keys():
+                lldp_neighbors_details[port_id] = []
+            lldp_neighbors_details[port_id].append(
+                {
+                    "parent_interface": "",
+                    "remote_chassis_id": remote_chassis_id,
+                    "remote_system_name": remote_system_name,
+                    "remote_port": remote_port_id,
+                    "remote_port_description": remote_port_desc,
+                    "remote_system_description": remote_system_description,
+                    "remote_system_capab": remote_system_capab.split(),
+                    "remote_system_enable_capab": remote_system_enable_capab.split(),
+                }
+            )
+        return lldp_neighbors_details
+
     def get_environment(self):
         """
             Returns a dictionary where:
@@ -3120,190 +3736,188 @@ class NokiaSROSDriver(NetworkDriver):
                     used_ram (int) - RAM in use in the device
         """
         try:
-            environment_data = {
-                "fans": {},
-                "power": {},
-                "temperature": {},
-                "memory": {},
-            }
-
-            # helpers functions
-            def _build_temperature_dict(instance, choice=1):
-                temp = convert(
-                    float,
-                    self._find_txt(
-                        instance,
-                        "state_ns:hardware-data/state_ns:temperature",
-                        namespaces=self.nsmap,
-                    ),
-                )
-                if temp == "":
-                    return
-                temp_thresh = convert(
-                    float,
-                    self._find_txt(
-                        instance,
-                        "state_ns:hardware-data/state_ns:temperature-threshold",
-                        namespaces=self.nsmap,
-                    ),
-                )
-                if temp_thresh == "":
-                    return
-
-                # Assume warning temperature is 80% of the threshold tempearature
-                temp_warn = 0.8 * temp_thresh
-
-                data = {
-                    "temperature": temp,
-                    "is_alert": True if temp >= temp_warn else False,
-                    "is_critical": True if temp >= temp_thresh else False,
-                }
-
-                if choice == 1:
-                    environment_data["temperature"].update({"cpm": {}})
-                    environment_data["temperature"]["cpm"].update(data)
-                elif choice == 2:
-                    environment_data["temperature"].update({"card": {}})
-                    environment_data["temperature"]["card"].update(data)
-                elif choice == 3:
-                    environment_data["temperature"].update({"mda": {}})
-                    environment_data["temperature"]["mda"].update(data)
-
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_environment",
                     filter=GET_ENVIRONMENT["_"], with_defaults="report-all"
                 ).data_xml
             )
+            return self._parse_environment(result)
+        except Exception as e:
+            print("Error in method get environment data : {}".format(e))
+            log.error("Error in method get environment data : %s" % traceback.format_exc())
 
-            for fan in result.xpath(
-                "state_ns:state/state_ns:chassis/state_ns:fan", namespaces=self.nsmap
-            ):
-                fan_slot = self._find_txt(fan, "state_ns:fan-slot", namespaces=self.nsmap)
+    def _parse_environment(self, result, power_output=None):
+        environment_data = {
+            "fans": {},
+            "power": {},
+            "temperature": {},
+            "memory": {},
+        }
 
-                oper_state = (
-                    True
-                    if self._find_txt(
-                        fan,
-                        "state_ns:hardware-data/state_ns:oper-state",
-                        namespaces=self.nsmap,
-                    )
-                    == "in-service"
-                    else False
-                )
-                environment_data["fans"].update({fan_slot: {"status": oper_state}})
-
-            # get the output of each power-module using MD-CLI
-            buff = self._perform_cli_commands(
-                [
-                    "/show chassis power-management utilization detail",
-                    # JvB: on VSR this is 'power-supply'
-                ],
-                True,
-                no_more=True
-            )
-            total_power_modules = 0
-            output = 0.0
-            for item in buff.split("\n"):
-                if "Power Module" in item:
-                    total_power_modules = total_power_modules + 1
-                if "Current Util." in item:
-                    item.strip()
-                    watts = re.match(r"^.*:\s*(\d+[.]\d+) Watts.*$", item)
-                    if watts:
-                        output = float(watts.groups()[0])
-
-            for power_module in result.xpath(
-                "state_ns:state/state_ns:chassis/state_ns:power-shelf/state_ns:power-module",
-                namespaces=self.nsmap,
-            ):
-                power_module_id = convert(
-                    int,
-                    self._find_txt(
-                        power_module, "state_ns:power-module-id", namespaces=self.nsmap
-                    ),
-                )
-                oper_state = (
-                    True
-                    if self._find_txt(
-                        power_module,
-                        "state_ns:hardware-data/state_ns:oper-state",
-                        namespaces=self.nsmap,
-                    )
-                    == "in-service"
-                    else False
+        # helpers functions
+        def _build_temperature_dict(instance, choice=1):
+            temp = convert(
+                float,
+                self._find_txt(
+                    instance,
+                    "state_ns:hardware-data/state_ns:temperature",
+                    namespaces=self.nsmap,
+                ),
+            )
+            if temp == "":
+                return
+            temp_thresh = convert(
+                float,
+                self._find_txt(
+                    instance,
+                    "state_ns:hardware-data/state_ns:temperature-threshold",
+                    namespaces=self.nsmap,
+                ),
+            )
+            if temp_thresh == "":
+                return
+
+            # Assume warning temperature is 80% of the threshold tempearature
+            temp_warn = 0.8 * temp_thresh
+
+            data = {
+                "temperature": temp,
+                "is_alert": True if temp >= temp_warn else False,
+                "is_critical": True if temp >= temp_thresh else False,
+            }
+
+            if choice == 1:
+                environment_data["temperature"].update({"cpm": {}})
+                environment_data["temperature"]["cpm"].update(data)
+            elif choice == 2:
+                environment_data["temperature"].update({"card": {}})
+                environment_data["temperature"]["card"].update(data)
+            elif choice == 3:
+                environment_data["temperature"].update({"mda": {}})
+                environment_data["temperature"]["mda"].update(data)
+
+        for fan in result.xpath(
+            "state_ns:state/state_ns:chassis/state_ns:fan", namespaces=self.nsmap
+        ):
+            fan_slot = self._find_txt(fan, "state_ns:fan-slot", namespaces=self.nsmap)
+
+            oper_state = (
+                True
+                if self._find_txt(
+                    fan,
+                    "state_ns:hardware-data/state_ns:oper-state",
+                    namespaces=self.nsmap,
                 )
-                capacity = convert(
-                    float,
-                    self._find_txt(
-                        power_module, "state_ns:available-wattage", namespaces=self.nsmap
-                    ),
+                == "in-service"
+                else False
+            )
+            environment_data["fans"].update({fan_slot: {"status": oper_state}})
+
+        # get the output of each power-module using MD-CLI, unless the caller already did
+        if power_output is None:
+            power_output = self._perform_cli_commands(
+                [POWER_UTILIZATION_COMMAND], True, no_more=True
+            )
+        total_power_modules = 0
+        output = 0.0
+        for item in power_output.split("\n"):
+            if "Power Module" in item:
+                total_power_modules = total_power_modules + 1
+            if "Current Util." in item:
+                item.strip()
+                watts = re.match(r"^.*:\s*(\d+[.]\d+) Watts.*$", item)
+                if watts:
+                    output = float(watts.groups()[0])
+
+        for power_module in result.xpath(
+            "state_ns:state/state_ns:chassis/state_ns:power-shelf/state_ns:power-module",
+            namespaces=self.nsmap,
+        ):
+            power_module_id = convert(
+                int,
+                self._find_txt(
+                    power_module, "state_ns:power-module-id", namespaces=self.nsmap
+                ),
+            )
+            oper_state = (
+                True
+                if self._find_txt(
+                    power_module,
+                    "state_ns:hardware-data/state_ns:oper-state",
+                    namespaces=self.nsmap,
                 )
-                environment_data["power"].update(
-                    {
-                        str(power_module_id): {
-                            "status": oper_state,
-                            "capacity": capacity,
-                            "output": output / total_power_modules,
-                        }
+                == "in-service"
+                else False
+            )
+            capacity = convert(
+                float,
+                self._find_txt(
+                    power_module, "state_ns:available-wattage", namespaces=self.nsmap
+                ),
+            )
+            environment_data["power"].update(
+                {
+                    str(power_module_id): {
+                        "status": oper_state,
+                        "capacity": capacity,
+                        "output": output / total_power_modules,
                     }
-                )
-
-            for cpm in result.xpath("state_ns:state/state_ns:cpm", namespaces=self.nsmap):
-                _build_temperature_dict(cpm, choice=1)
-
-            for card in result.xpath("state_ns:state/state_ns:card", namespaces=self.nsmap):
-                _build_temperature_dict(card, choice=2)
-                for mda in card.xpath("state_ns:mda", namespaces=self.nsmap):
-                    _build_temperature_dict(mda, choice=3)
+                }
+            )
 
-            for system in result.xpath(
-                "state_ns:state/state_ns:system", namespaces=self.nsmap
+        for cpm in result.xpath("state_ns:state/state_ns:cpm", namespaces=self.nsmap):
+            _build_temperature_dict(cpm, choice=1)
+
+        for card in result.xpath("state_ns:state/state_ns:card", namespaces=self.nsmap):
+            _build_temperature_dict(card, choice=2)
+            for mda in card.xpath("state_ns:mda", namespaces=self.nsmap):
+                _build_temperature_dict(mda, choice=3)
+
+        for system in result.xpath(
+            "state_ns:state/state_ns:system", namespaces=self.nsmap
+        ):
+            available_ram = convert(
+                int,
+                self._find_txt(
+                    system,
+                    "state_ns:memory-pools/state_ns:summary/state_ns:available-memory",
+                    namespaces=self.nsmap,
+                ),
+            )
+            used_ram = convert(
+                int,
+                self._find_txt(
+                    system,
+                    "state_ns:memory-pools/state_ns:summary/state_ns:total-in-use",
+                    namespaces=self.nsmap,
+                ),
+            )
+            environment_data.update({"cpu": {}})
+            for cpu in result.xpath(
+                "state_ns:state/state_ns:system/state_ns:cpu", namespaces=self.nsmap
             ):
-                available_ram = convert(
+                sample_period = convert(
                     int,
                     self._find_txt(
-                        system,
-                        "state_ns:memory-pools/state_ns:summary/state_ns:available-memory",
-                        namespaces=self.nsmap,
+                        cpu, "state_ns:sample-period", namespaces=self.nsmap
                     ),
                 )
-                used_ram = convert(
-                    int,
+                cpu_usage = convert(
+                    float,
                     self._find_txt(
-                        system,
-                        "state_ns:memory-pools/state_ns:summary/state_ns:total-in-use",
+                        cpu,
+                        "state_ns:summary/state_ns:usage/state_ns:cpu-usage",
                         namespaces=self.nsmap,
                     ),
+                    default=-1,
                 )
-                environment_data.update({"cpu": {}})
-                for cpu in result.xpath(
-                    "state_ns:state/state_ns:system/state_ns:cpu", namespaces=self.nsmap
-                ):
-                    sample_period = convert(
-                        int,
-                        self._find_txt(
-                            cpu, "state_ns:sample-period", namespaces=self.nsmap
-                        ),
-                    )
-                    cpu_usage = convert(
-                        float,
-                        self._find_txt(
-                            cpu,
-                            "state_ns:summary/state_ns:usage/state_ns:cpu-usage",
-                            namespaces=self.nsmap,
-                        ),
-                        default=-1,
-                    )
-                    environment_data["cpu"].update({str(sample_period): {"%usage": cpu_usage}})
-
-                environment_data["memory"].update(
-                    {"available_ram": available_ram + used_ram, "used_ram": used_ram}
-                )
-            return environment_data
-        except Exception as e:
-            print("Error in method get environment data : {}".format(e))
-            log.error("Error in method get environment data : %s" % traceback.format_exc())
+                environment_data["cpu"].update({str(sample_period): {"%usage": cpu_usage}})
 
+            environment_data["memory"].update(
+                {"available_ram": available_ram + used_ram, "used_ram": used_ram}
+            )
+        return environment_data
 
     def get_ipv6_neighbors_table(self):
         """
@@ -3318,8 +3932,17 @@ class NokiaSROSDriver(NetworkDriver):
             state (string)
         """
         try:
+            if self._use_state_getter("get_ipv6_neighbors_table"):
+                result = to_ele(
+                    self._nc_get(
+                        "get_ipv6_neighbors_table",
+                        filter=GET_IPV6_NEIGHBORS_STATE["_"], with_defaults="report-all"
+                    ).data_xml
+                )
+                return self._parse_ipv6_neighbors_table(result)
             result = to_ele(
-                self.conn.get(
+                self._nc_get(
+                    "get_ipv6_neighbors_table",
                     filter=GET_IPV6_NEIGHBORS_TABLE["_"], with_defaults="report-all"
                 ).data_xml
             )
@@ -3377,6 +4000,49 @@ class NokiaSROSDriver(NetworkDriver):
             print("Error in method get ipv6 neighbors : {}".format(e))
             log.error("Error in method get ipv6 neighbors : %s" % traceback.format_exc())
 
+    def _parse_ipv6_neighbors_table(self, result):
+        # keyed by routing instance, interface and address, an entry reported twice is listed
+        # once; the same interface name and link-local address are common across VPRNs
+        neighbors = {}
+        for interface in result.xpath(
+            "state_ns:state/state_ns:router/state_ns:interface"
+            " | state_ns:state/state_ns:service/state_ns:vprn/state_ns:interface",
+            namespaces=self.nsmap,
+        ):
+            interface_name = self._find_txt(
+                interface, "state_ns:interface-name", namespaces=self.nsmap
+            )
+            instance_name = self._find_txt(
+                interface.getparent(),
+                "state_ns:router-name | state_ns:service-name",
+                namespaces=self.nsmap,
+            )
+            for neighbor in interface.xpath(
+                "state_ns:ipv6/state_ns:neighbor-discovery/state_ns:neighbor",
+                namespaces=self.nsmap,
+            ):
+                ip_address = self._find_txt(
+                    neighbor, "state_ns:ipv6-address", namespaces=self.nsmap
+                )
+                if ip_address == "":
+                    continue
+                neighbors[(instance_name, interface_name, ip_address)] = {
+                    "interface": interface_name,
+                    "mac": self._find_txt(
+                        neighbor, "state_ns:mac-address", namespaces=self.nsmap
+                    ),
+                    "ip": ip_address,
+                    "age": convert(
+                        float,
+                        self._find_txt(neighbor, "state_ns:timer", namespaces=self.nsmap),
+                        default=-1,
+                    ),
+                    "state": self._find_txt(
+                        neighbor, "state_ns:state", namespaces=self.nsmap
+                    ).lower(),
+                }
+        return list(neighbors.values())
+
     def ping(
         self,
         destination,
@@ -3550,22 +4216,46 @@ class NokiaSROSDriver(NetworkDriver):
             raise NotImplementedError("%s is not a supported encoding" % encoding)
         try:
             cli_output = {}
+            use_rpc = self.sros_cli_transport == "rpc" and any(
+                OPER_GLOBAL_NS in c for c in self.conn.server_capabilities
+            )
             for cmd in commands:
-                buff = self._perform_cli_commands([cmd], True)
-                new_buff = ""
-                for item in buff.split("\n"):
-                    if "[]" in item:
-                        continue
-                    elif self.cmd_line_pattern_re.search(item):
-                        continue
-                    else:
-                        row = item.strip()
-                        if row == cmd:
-                            continue
-                        new_buff += row
-                        new_buff += "\n"
-                cli_output.update({cmd: new_buff})
+                if use_rpc:
+                    buff = self._md_cli_raw_command(cmd)
+                else:
+                    buff = self._perform_cli_commands([cmd], True)
+                cli_output.update({cmd: self._clean_cli_output(cmd, buff)})
             return cli_output
         except Exception as e:
             print("Error in method cli : {}".format(e))
             log.error("Error in method cli : %s" % traceback.format_exc())
+
+    def _md_cli_raw_command(self, cmd):
+        """Runs an MD-CLI command over NETCONF, returns its output or error message."""
+        try:
+            reply = self.conn.dispatch(to_ele(MD_CLI_RAW_COMMAND.format(command=escape(cmd))))
+        except RPCError as e:
+            return "{}\n".format(e.message or e).lstrip()
+        root = to_ele(reply.xml)
+        blocks = root.xpath("//*[local-name()='md-cli-output-block']")
+        return "".join(block.text or "" for block in blocks)
+
+    def _clean_cli_output(self, cmd, buff):
+        """
+        Strips the echoed command, the prompts and the leading and trailing blank lines from
+        the output of a command, read from the shell or from md-cli-raw-command alike.
+        """
+        rows = []
+        for item in buff.split("\n"):
+            row = item.strip()
+            if "[]" in row or self.cli_prompt_line_re.search(row):
+                continue
+            if row == cmd:
+                continue
+            rows.append(row)
+        while rows and rows[-1] == "":
+            rows.pop()
+        start = 0
+        while start < len(rows) and rows[start] == "":
+            start += 1
+        return "".join(row + "\n" for row in rows[start:])
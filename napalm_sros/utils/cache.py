@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""Caches of NETCONF replies and configurations."""
+import collections
+import os
+import re
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    LRU cache of RPC replies with a time to live per getter.
+
+    Entries are stored with the time they were fetched. Whether an entry is still fresh is
+    decided by the TTL of the getter asking for it, so a getter with a short TTL does not
+    reuse a reply that a getter with a long TTL would still accept.
+
+    :param ttl: default time to live in seconds
+    :param ttls: time to live per getter name, e.g. {"get_facts": 300}
+    :param maxsize: maximum number of cached replies
+    :param clock: monotonic time source
+    """
+
+    def __init__(self, ttl=30, ttls=None, maxsize=128, clock=time.monotonic):
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, getter):
+        return self.ttls.get(getter, self.ttl)
+
+    def get(self, key, getter=None):
+        """Returns the cached reply for key, or None if there is no fresh one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry[0] < self.ttl_for(getter):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def fetch(self, key, fetch, getter=None):
+        """
+        Returns the cached reply for key, calling fetch() to retrieve it when needed.
+
+        :param key: hashable key, e.g. (filter, with-defaults, datastore)
+        :param fetch: callable returning the reply
+        :param getter: name of the getter, selects the time to live
+        """
+        value = self.get(key, getter)
+        if value is None:
+            value = fetch()
+            self.put(key, value)
+        return value
+
+    def invalidate(self):
+        """Drops all cached replies, e.g. after the configuration has changed."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class ConfigStore:
+    """
+    Last running configuration of each device, with the change marker it was retrieved at.
+
+    Kept in memory, and also in a directory when one is given, so that later processes (e.g.
+    the next run of a backup job) can reuse it.
+
+    :param directory: directory to persist the configurations in, None to keep them in memory
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, hostname, suffix):
+        name = re.sub(r"[^\w.-]", "_", hostname)
+        return os.path.join(self.directory, name + suffix)
+
+    def get(self, hostname, marker):
+        """Returns the stored configuration if it was retrieved at marker, else None."""
+        with self._lock:
+            entry = self._entries.get(hostname)
+        if entry is None and self.directory is not None:
+            try:
+                with open(self._path(hostname, ".marker"), encoding="utf-8") as f:
+                    stored_marker = f.read()
+                if stored_marker == marker:
+                    with open(self._path(hostname, ".xml"), encoding="utf-8") as f:
+                        entry = (stored_marker, f.read())
+            except OSError:
+                return None
+        if entry is None or entry[0] != marker:
+            return None
+        return entry[1]
+
+    def put(self, hostname, marker, config):
+        with self._lock:
+            self._entries[hostname] = (marker, config)
+        if self.directory is not None:
+            # drop the old marker first, so a partial update never pairs a marker with
+            # another configuration
+            try:
+                os.remove(self._path(hostname, ".marker"))
+            except FileNotFoundError:
+                pass
+            for suffix, content in ((".xml", config), (".marker", marker)):
+                path = self._path(hostname, suffix)
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    f.write(content)
+                os.replace(path + ".tmp", path)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""Rates computed from consecutive get_interfaces_counters results."""
+import array
+import math
+import threading
+import time
+
+# counters of get_interfaces_counters, in the order of the rates
+FIELDS = (
+    "tx_errors",
+    "rx_errors",
+    "tx_discards",
+    "rx_discards",
+    "tx_octets",
+    "rx_octets",
+    "tx_unicast_packets",
+    "rx_unicast_packets",
+    "tx_multicast_packets",
+    "rx_multicast_packets",
+    "tx_broadcast_packets",
+    "rx_broadcast_packets",
+)
+
+WRAP = 1 << 64
+# stored for counters the device does not report (-1 in get_interfaces_counters)
+MISSING = WRAP - 1
+
+
+class _Device:
+    """Previous sample of a device, one row of len(FIELDS) counters per interface."""
+
+    def __init__(self):
+        self.index = {}  # interface name -> row
+        self.names = []
+        self.values = array.array("Q")
+        self.cleared = []
+        self.seen = array.array("Q")  # sample number an interface was last reported in
+        self.time = None
+        self.samples = 0
+
+
+class CounterSampler:
+    """
+    Computes per second rates of the interface counters of devices from consecutive samples.
+
+    The previous sample of each device is kept in flat array('Q') storage, indexed by a
+    stable row per interface, so a sample of tens of thousands of interfaces costs one pass
+    over two arrays rather than a dictionary lookup per counter.
+
+    A counter lower than in the previous sample has either wrapped around 2**64 or been
+    cleared. The counters of an interface whose last-cleared-time changed are counted from
+    zero; otherwise a decrease by less than 2**63 is taken as a wrap and a larger one as a
+    clear.
+
+    :param clock: time source of the samples, in seconds
+    """
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._devices = {}
+        self._lock = threading.Lock()
+
+    def interfaces(self, device):
+        """Returns the interface names of a device, in the order of the rows of the rates."""
+        with self._lock:
+            state = self._devices.get(device)
+            return list(state.names) if state is not None else []
+
+    def update(self, device, counters, timestamp=None, cleared=None):
+        """
+        Stores a sample and returns the rates since the previous sample of the device.
+
+        The rates of all rows are computed in one pass over the flat arrays. Without NumPy
+        this is still an interpreted loop, one comprehension per sample rather than
+        vectorised arithmetic, about 0.2 s per 50,000 interfaces.
+
+        :param device: name of the device
+        :param counters: result of get_interfaces_counters
+        :param timestamp: time of the sample, now if None
+        :param cleared: dict of interface name to last-cleared-time, if known
+        :return: (names, rates): the interface names of the rows, and array('d') of
+            len(FIELDS) rates per row; NaN for counters not reported in both samples, all
+            of them for the first sample
+        """
+        timestamp = self.clock() if timestamp is None else timestamp
+        cleared = cleared or {}
+        width = len(FIELDS)
+        with self._lock:
+            state = self._devices.setdefault(device, _Device())
+            previous = array.array("Q", state.values)
+            previous_cleared = list(state.cleared)
+            previous_seen = array.array("Q", state.seen)
+            elapsed = timestamp - state.time if state.time is not None else 0.0
+            first = state.samples == 0
+            state.samples += 1
+            current = state.values
+            for name, values in counters.items():
+                row = state.index.get(name)
+                if row is None:
+                    row = state.index[name] = len(state.names)
+                    state.names.append(name)
+                    state.cleared.append("")
+                    state.seen.append(0)
+                    previous_seen.append(0)
+                    current.extend([MISSING] * width)
+                    previous.extend([MISSING] * width)
+                    previous_cleared.append("")
+                state.seen[row] = state.samples
+                state.cleared[row] = cleared.get(name, "")
+                current[row * width:(row + 1) * width] = array.array(
+                    "Q", [MISSING if v is None or v < 0 else v for v in map(values.get, FIELDS)]
+                )
+            state.time = timestamp
+            names = list(state.names)
+
+            if first or elapsed <= 0:
+                return names, array.array("d", [math.nan]) * (len(names) * width)
+            # a decrease of 2**63 or more is a clear, not a wrap: count from zero
+            deltas = [(now - before) % WRAP for now, before in zip(current, previous)]
+            rates = array.array("d", [
+                math.nan if now == MISSING or before == MISSING
+                else (delta if delta < WRAP >> 1 else now) / elapsed
+                for now, before, delta in zip(current, previous, deltas)
+            ])
+            # rows not in both samples have no rate, cleared rows count from zero
+            unknown = array.array("d", [math.nan]) * width
+            for row in range(len(names)):
+                start = row * width
+                if state.seen[row] != state.samples or previous_seen[row] != state.samples - 1:
+                    rates[start:start + width] = unknown
+                elif "" != previous_cleared[row] != state.cleared[row] != "":
+                    rates[start:start + width] = array.array("d", [
+                        math.nan if now == MISSING or previous[i] == MISSING else now / elapsed
+                        for i, now in enumerate(current[start:start + width], start)
+                    ])
+            return names, rates
+
+    def rates(self, device, counters, timestamp=None, cleared=None):
+        """
+        Same as update, as a dict of interface name to dict of rates per counter.
+
+        Interfaces without rates (first sample, or not in the previous sample) are left out.
+        """
+        names, rates = self.update(device, counters, timestamp, cleared)
+        width = len(FIELDS)
+        result = {}
+        for row, name in enumerate(names):
+            values = rates[row * width:(row + 1) * width]
+            if name in counters and not all(math.isnan(v) for v in values):
+                result[name] = dict(zip(FIELDS, values))
+        return result
+
+    def forget(self, device):
+        """Drops the previous sample of a device."""
+        with self._lock:
+            self._devices.pop(device, None)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""Splitting of large <config> documents into several edit-config payloads."""
+import copy
+
+from lxml import etree
+
+NC_NS = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+
+def _elements(node):
+    return [c for c in node if isinstance(c.tag, str)]
+
+
+def _has_operation(node):
+    return any(etree.QName(k).localname == "operation" for k in node.attrib)
+
+
+def _size(node, sizes):
+    size = 1
+    for child in _elements(node):
+        size += _size(child, sizes)
+    sizes[node] = size
+    return size
+
+
+def _units(node, key, path, chunk_size, sizes, units):
+    """
+    Collects the subtrees of node that are sent as a whole, with the path of shells (tag,
+    attributes and key leaf of each ancestor) they are to be inserted in.
+    """
+    leaves = []
+    for child in _elements(node):
+        if child is key:
+            # already part of the shell of node
+            continue
+        splittable = (
+            sizes[child] > chunk_size and _elements(child) and not _has_operation(child)
+        )
+        if not splittable:
+            if not _elements(child):
+                # leaves stay together, with the shell of their parent
+                leaves.append(child)
+            else:
+                units.append((path, [child]))
+            continue
+        first = _elements(child)[0]
+        child_key = first if not _elements(first) else None
+        _units(child, child_key, path + ((child, child_key),), chunk_size, sizes, units)
+    if leaves:
+        units.append((path, leaves))
+
+
+def _shell(element, key):
+    shell = etree.Element(element.tag, attrib=dict(element.attrib), nsmap=element.nsmap)
+    if key is not None:
+        etree.SubElement(shell, key.tag, attrib=dict(key.attrib)).text = key.text
+    return shell
+
+
+def split_config(config, chunk_size):
+    """
+    Splits a <config> element into <config> elements of about chunk_size elements each.
+
+    Subtrees larger than chunk_size are split into their children, e.g. one service or one
+    router interface at a time; the ancestors of each part are repeated with their key leaf
+    (their first leaf), so merging the parts one after the other gives the original
+    configuration. Subtrees carrying an operation attribute are never split.
+
+    :param config: <config> element (or its <configure> child)
+    :param chunk_size: target number of elements per part
+    :return: list of callables, each building the <config> element of one part
+    """
+    if etree.QName(config).localname != "config":
+        root = etree.Element("{%s}config" % NC_NS)
+        root.append(config)
+        config = root
+    sizes = {}
+    _size(config, sizes)
+    units = []
+    _units(config, None, (), chunk_size, sizes, units)
+
+    batches = []
+    current, current_size = [], 0
+    for unit in units:
+        size = sum(sizes[e] for e in unit[1])
+        if current and current_size + size > chunk_size:
+            batches.append(current)
+            current, current_size = [], 0
+        current.append(unit)
+        current_size += size
+    if current:
+        batches.append(current)
+    return [lambda batch=batch: _build(config, batch) for batch in batches]
+
+
+def _build(config, batch):
+    root = etree.Element(config.tag, attrib=dict(config.attrib), nsmap=config.nsmap)
+    shells = {}
+    for path, elements in batch:
+        parent = root
+        for depth in range(len(path)):
+            key = tuple(id(e) for e, _ in path[: depth + 1])
+            if key not in shells:
+                shells[key] = _shell(*path[depth])
+                parent.append(shells[key])
+            parent = shells[key]
+        for element in elements:
+            part = copy.deepcopy(element)
+            part.tail = None
+            parent.append(part)
+    return root
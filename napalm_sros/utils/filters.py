@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""Helpers to combine NETCONF subtree filters."""
+import copy
+
+from lxml import etree
+
+
+def _is_element(node):
+    return isinstance(node.tag, str)
+
+
+def _children(node):
+    return [c for c in node if _is_element(c)]
+
+
+def _is_content_match(node):
+    return not _children(node) and bool((node.text or "").strip())
+
+
+def _is_selection(node):
+    return not _children(node) and not (node.text or "").strip()
+
+
+def _identity(node):
+    """
+    Identifies a filter node among its siblings.
+
+    Selection nodes are identified by their tag, containment nodes by their tag and the
+    content match nodes (e.g. list keys) they hold, so that two entries of the same list
+    with different keys are kept apart.
+    """
+    if _is_selection(node):
+        return (node.tag, None)
+    if _is_content_match(node):
+        return (node.tag, node.text.strip())
+    matches = tuple(
+        sorted((c.tag, c.text.strip()) for c in _children(node) if _is_content_match(c))
+    )
+    return (node.tag, matches)
+
+
+def _merge_children(target, source):
+    index = {_identity(c): c for c in _children(target)}
+    for child in _children(source):
+        if _is_content_match(child):
+            # part of the identity of the parent, already present in target
+            continue
+        key = _identity(child)
+        if (child.tag, None) in index:
+            # a selection node already returns the complete subtree
+            continue
+        if _is_selection(child):
+            # the selection node supersedes any containment node with the same tag
+            for k in [k for k in index if k[0] == child.tag and not isinstance(k[1], str)]:
+                target.remove(index.pop(k))
+            new = copy.deepcopy(child)
+            target.append(new)
+            index[key] = new
+        elif key in index:
+            _merge_children(index[key], child)
+        else:
+            new = copy.deepcopy(child)
+            target.append(new)
+            index[key] = new
+
+
+def merge_filters(*filters):
+    """
+    Merges NETCONF subtree filters into one filter that selects the union of their data.
+
+    :param filters: filter strings (or elements), each with a <filter> root element
+    :return: the merged filter as a string
+    """
+    roots = [
+        f if etree.iselement(f) else etree.fromstring(f.strip().encode("utf-8"))
+        for f in filters
+    ]
+    merged = copy.deepcopy(roots[0])
+    for root in roots[1:]:
+        _merge_children(merged, root)
+    return etree.tostring(merged, encoding="unicode")
+
+
+def scope_filter(filter, lists):
+    """
+    Restricts the entries of lists of a NETCONF subtree filter to given keys.
+
+    Each list entry of the filter found at one of the paths is replaced by one copy per key,
+    with the key leaf set as content match node, e.g. <port><port-id>1/1/1</port-id>...
+    for every port. Paths are relative to the datastore roots (<state>, <configure>), so
+    the state and the configuration of the same entries are selected.
+
+    :param filter: filter string (or element) with a <filter> root element
+    :param lists: dict mapping paths of local names, e.g. ("router", "interface"), to
+        (key leaf, keys) tuples. Lists with keys None are left as they are, lists with no
+        keys are removed
+    :return: the scoped filter as a string
+    """
+    root = copy.deepcopy(
+        filter if etree.iselement(filter) else etree.fromstring(filter.strip().encode("utf-8"))
+    )
+    for path, (key, values) in lists.items():
+        if values is None:
+            continue
+        for datastore in _children(root):
+            for entry in _find_path(datastore, path):
+                parent = entry.getparent()
+                position = parent.index(entry)
+                parent.remove(entry)
+                tag = etree.QName(etree.QName(entry).namespace, key).text
+                for value in reversed(list(values)):
+                    scoped = copy.deepcopy(entry)
+                    leaf = scoped.find(tag)
+                    if leaf is None:
+                        leaf = etree.SubElement(scoped, tag)
+                        scoped.insert(0, leaf)
+                    leaf.text = value
+                    parent.insert(position, scoped)
+                # an emptied containment node would become a selection node of the subtree
+                while parent is not root and not _children(parent):
+                    grandparent = parent.getparent()
+                    grandparent.remove(parent)
+                    parent = grandparent
+    return etree.tostring(root, encoding="unicode")
+
+
+def _find_path(node, path):
+    nodes = [node]
+    for name in path:
+        nodes = [c for n in nodes for c in _children(n) if etree.QName(c).localname == name]
+    return nodes
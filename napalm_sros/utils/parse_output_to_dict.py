@@ -1,25 +1,145 @@
+import copy
 import os
+import threading
+
 import textfsm
 
 
+def _ended(fsm):
+    """
+    Returns True if the FSM reached the End state and ignores the rest of the output.
+
+    TextFSM has no public accessor for the state: this reads the attribute ParseText
+    checks itself, and if a TextFSM release renames it the output is read to its end.
+    """
+    return getattr(fsm, "_cur_state_name", None) in ("End", "EOF")
+
+
+class TemplateRegistry:
+    """
+    Loads and compiles each TextFSM template once per process.
+
+    A parse runs on an FSM cloned from the compiled template, so the template file is not
+    read and its regular expressions are not compiled again. Clones are kept once a parse
+    is done and reset for the next one.
+
+    :param directory: directory the template names are relative to
+    """
+
+    def __init__(self, directory=os.path.dirname(os.path.realpath(__file__))):
+        self.directory = directory
+        self._templates = {}  # path -> (compiled FSM, header, idle clones)
+        self._lock = threading.Lock()
+
+    def _load(self, template):
+        path = os.path.normpath(os.path.join(self.directory, template))
+        with self._lock:
+            entry = self._templates.get(path)
+            if entry is None:
+                with open(path, "r") as template_file:
+                    fsm = textfsm.TextFSM(template_file)
+                entry = self._templates[path] = (fsm, tuple(fsm.header), [])
+        return entry
+
+    def header(self, template):
+        """Returns the names of the values of a template."""
+        return self._load(template)[1]
+
+    def _acquire(self, template):
+        fsm, header, idle = self._load(template)
+        with self._lock:
+            clone = idle.pop() if idle else None
+        if clone is None:
+            # compiled regular expressions are shared, not copied
+            clone = copy.deepcopy(fsm)
+        clone.Reset()
+        return clone, header, idle
+
+    def parse_iter(self, template, command_output):
+        """
+        Parses command output and yields each row as soon as the FSM records it.
+
+        Rows are final once yielded, so templates with Fillup values, which fill in earlier
+        rows, are not supported.
+
+        :param template: TextFSM template to parse command
+        :param command_output: Command output from a node, as a string or an iterable of lines
+        :return: generator of dicts. Dict per FSM row.
+        :raises ValueError: if the template has a Fillup value
+        """
+        fillup = [
+            value.name for value in self._load(template)[0].values
+            if "Fillup" in value.OptionNames()
+        ]
+        if fillup:
+            raise ValueError(
+                "{} cannot be parsed row by row, Fillup values: {}".format(
+                    template, ", ".join(fillup)
+                )
+            )
+        if isinstance(command_output, str):
+            command_output = command_output.splitlines()
+        return self._iter_rows(template, command_output)
+
+    def _iter_rows(self, template, lines):
+        fsm, header, idle = self._acquire(template)
+        try:
+            sent = 0
+            for line in lines:
+                # a trailing newline keeps empty lines, which ParseText would skip
+                rows = fsm.ParseText(line.rstrip("\r\n") + "\n", eof=False)
+                for row in rows[sent:]:
+                    yield dict(zip(header, row))
+                sent = len(rows)
+                if _ended(fsm):
+                    break
+            rows = fsm.ParseText("", eof=True)
+            for row in rows[sent:]:
+                yield dict(zip(header, row))
+        finally:
+            # also when the generator is closed before the end of the output
+            fsm.Reset()
+            with self._lock:
+                idle.append(fsm)
+
+    def parse(self, template, command_output):
+        """
+        :param template: TextFSM template to parse command
+        :param command_output: Command output from a node
+        :return: List of dicts. Dict per FSM row.
+        """
+        fsm, header, idle = self._acquire(template)
+        try:
+            return [dict(zip(header, row)) for row in fsm.ParseText(command_output)]
+        finally:
+            fsm.Reset()
+            with self._lock:
+                idle.append(fsm)
+
+
+# templates shipped with the driver, in textfsm_templates
+TEMPLATES = TemplateRegistry()
+
+
 def parse_with_textfsm(template, command_output):
     """
     :param template: TextFSM template to parse command
     :param command_output: Command output from a node
     :return: List of dicts. Dict per FSM row.
     """
-    with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), template), "r") as template_file:
-        fsm = textfsm.TextFSM(template_file)
-        fsm_results = fsm.ParseText(command_output)
-    output_list = []
-    # print fsm.header
-    for index, line in enumerate(fsm_results, 1):
-        # print line
-        textfsm_dict = {}
-        for number, value in enumerate(line):
-            textfsm_dict[fsm.header[number]] = value
-        output_list.append(textfsm_dict)
-    return output_list
+    return TEMPLATES.parse(template, command_output)
+
+
+def parse_iter(template, command_output):
+    """
+    Same as parse_with_textfsm, one row at a time
+
+    :param template: TextFSM template to parse command
+    :param command_output: Command output from a node, as a string or an iterable of lines
+    :return: generator of dicts. Dict per FSM row.
+    :raises ValueError: if the template has a Fillup value
+    """
+    return TEMPLATES.parse_iter(template, command_output)
 
 
 def parse_with_textfsm_by_first_value(template, command_output):
@@ -28,17 +148,12 @@ def parse_with_textfsm_by_first_value(template, command_output):
     :param command_output: Command output from a node
     :return: Dict per first(top) textFSM template value
     """
-    with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), template), "r") as template_file:
-        fsm = textfsm.TextFSM(template_file)
-        fsm_results = fsm.ParseText(command_output)
+    first, *others = TEMPLATES.header(template)
     textfsm_dict = {}
-    # print fsm.header
-    for line in fsm_results:
-        # print line
-        textfsm_dict[line[0]] = {}
-        for number, value in enumerate(line):
-            if value != line[0]:
-                textfsm_dict[line[0]].update({fsm.header[number]: value})
+    for row in TEMPLATES.parse(template, command_output):
+        key = row[first]
+        # like before, the other values equal to the first one are left out
+        textfsm_dict[key] = {name: row[name] for name in others if row[name] != key}
     return textfsm_dict
 
 
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pool of idle NETCONF and SSH sessions, shared by the drivers of a process."""
+import collections
+import logging
+import threading
+import time
+
+log = logging.getLogger(__file__)
+
+
+class SessionPool:
+    """
+    Keeps the sessions of closed drivers open for reuse by the next driver to the same device.
+
+    Sessions are kept per key (e.g. kind of session, host, port and credentials). A session
+    idle for longer than idle_timeout, or failing its health check, is closed instead of
+    being reused. While sessions are idle a daemon thread closes them as they expire, so
+    they are not left open when the pool is not used again. When more than max_size
+    sessions are idle, the oldest one is closed.
+
+    :param max_size: maximum number of idle sessions
+    :param idle_timeout: seconds after which an idle session is closed
+    :param clock: monotonic time source
+    """
+
+    def __init__(self, max_size=64, idle_timeout=300, clock=time.monotonic):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self._idle = collections.OrderedDict()  # (key, id) -> (released at, session, close)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._reaper = None
+
+    def __len__(self):
+        return len(self._idle)
+
+    def _expired(self, now):
+        return [k for k, (t, _, _) in self._idle.items() if now - t >= self.idle_timeout]
+
+    def _reap(self):
+        """Closes idle sessions as they expire, until none is left."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    self._reaper = None
+                    return
+                now = self.clock()
+                expired = [self._idle.pop(k) for k in self._expired(now)]
+                if not expired:
+                    oldest = min(t for t, _, _ in self._idle.values())
+                    self._changed.wait(oldest + self.idle_timeout - now)
+                    continue
+            for _, session, close in expired:
+                self._close(session, close)
+
+    @staticmethod
+    def _close(session, close):
+        try:
+            close(session)
+        except Exception:
+            log.debug("Error closing an idle session", exc_info=True)
+
+    def acquire(self, key, factory, check=None):
+        """
+        Returns an idle session for key, or a new one from factory().
+
+        :param key: hashable key of the session
+        :param factory: callable opening a new session
+        :param check: callable returning whether an idle session is still usable; sessions
+            failing the check, or raising, are closed
+        """
+        while True:
+            with self._lock:
+                expired = [self._idle.pop(k) for k in self._expired(self.clock())]
+                entry = None
+                for k in reversed(self._idle):
+                    if k[0] == key:
+                        entry = self._idle.pop(k)
+                        break
+            for _, session, close in expired:
+                self._close(session, close)
+            if entry is None:
+                return factory()
+            _, session, close = entry
+            try:
+                usable = check is None or check(session)
+            except Exception:
+                log.debug("Error checking an idle session", exc_info=True)
+                usable = False
+            if usable:
+                return session
+            self._close(session, close)
+
+    def release(self, key, session, close):
+        """
+        Returns a session to the pool.
+
+        :param key: hashable key of the session
+        :param session: the session
+        :param close: callable closing the session, called with the session as argument
+        """
+        with self._lock:
+            self._idle[(key, id(session))] = (self.clock(), session, close)
+            evicted = [self._idle.pop(k) for k in self._expired(self.clock())]
+            while len(self._idle) > self.max_size:
+                evicted.append(self._idle.popitem(last=False)[1])
+            if self._reaper is None:
+                self._reaper = threading.Thread(
+                    target=self._reap, name="session-pool-reaper", daemon=True
+                )
+                self._reaper.start()
+            self._changed.notify()
+        for _, evicted_session, evicted_close in evicted:
+            self._close(evicted_session, evicted_close)
+
+    def clear(self):
+        """Closes all idle sessions."""
+        with self._lock:
+            entries = list(self._idle.values())
+            self._idle.clear()
+            self._changed.notify()
+        for _, session, close in entries:
+            self._close(session, close)
+
+
+# pool used by the drivers opened with optional_args session_pool=True
+SESSION_POOL = SessionPool()
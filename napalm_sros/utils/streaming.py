@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""Incremental parsing of NETCONF replies."""
+import io
+
+from lxml import etree
+from ncclient.operations import TimeoutExpiredError
+from ncclient.operations.retrieve import Get, GetConfig
+from ncclient.operations.rpc import RPCReply
+
+from ..api.util import NSMAP
+
+# characters encoded per read of a reply given as text
+CHUNK_SIZE = 1 << 16
+
+
+class _RawReply(RPCReply):
+    """Reply whose tree is only built when it reports an error."""
+
+    def parse(self):
+        if self._parsed:
+            return
+        if "rpc-error" in self._raw:
+            # error replies carry no data, parse them as usual
+            super().parse()
+        else:
+            self._parsed = True
+
+
+class RawGet(Get):
+    """<get> that leaves the reply unparsed, always asynchronous, see raw_reply."""
+
+    REPLY_CLS = _RawReply
+
+    def __init__(self, *args, **kwargs):
+        kwargs["async_mode"] = True
+        super().__init__(*args, **kwargs)
+
+
+class RawGetConfig(GetConfig):
+    """<get-config> that leaves the reply unparsed, always asynchronous, see raw_reply."""
+
+    REPLY_CLS = _RawReply
+
+    def __init__(self, *args, **kwargs):
+        kwargs["async_mode"] = True
+        super().__init__(*args, **kwargs)
+
+
+def raw_reply(conn, operation, **kwargs):
+    """
+    Runs an RPC on an ncclient manager and returns the text of its reply.
+
+    ncclient builds the tree of every reply before returning it; RawGet and RawGetConfig
+    skip that, so a large reply is held once, as the text received from the session, and
+    can be parsed incrementally with iter_entries.
+
+    :param conn: ncclient manager
+    :param operation: RawGet or RawGetConfig
+    :param kwargs: arguments of the RPC, e.g. filter and with_defaults
+    :return: the <rpc-reply> as a string
+    :raises RPCError: if the reply reports an error
+    """
+    rpc = conn.execute(operation, **kwargs)
+    if not rpc.event.wait(rpc.timeout):
+        raise TimeoutExpiredError("ncclient timed out while waiting for an rpc reply.")
+    if rpc.error is not None:
+        raise rpc.error
+    if rpc.reply.error is not None:
+        raise rpc.reply.error
+    return rpc.reply.xml
+
+
+class TextReader:
+    """File-like object reading the UTF-8 encoding of a string, one chunk at a time."""
+
+    def __init__(self, text):
+        self.text = text
+        self.offset = 0
+
+    def read(self, size=-1):
+        # size is in bytes, the encoded chunk can be longer: lxml keeps the rest for later
+        size = CHUNK_SIZE if size is None or size < 0 else min(size, CHUNK_SIZE)
+        chunk = self.text[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk.encode("utf-8")
+
+
+def reply_bytes(reply):
+    """
+    Returns the serialized reply of an RPC as bytes.
+
+    ncclient keeps the raw reply text in ``reply.xml``; parsing that avoids serializing the
+    <data> element again (``data_xml``) and building a second tree from the string.
+
+    :param reply: reply of an RPC, e.g. conn.get(...)
+    :return: bytes
+    """
+    raw = getattr(reply, "xml", None)
+    if raw is None:
+        raw = reply.data_xml
+    if etree.iselement(raw):
+        return etree.tostring(raw)
+    if isinstance(raw, str):
+        return raw.encode("utf-8")
+    return raw
+
+
+def _clark(path, namespaces):
+    tags = []
+    for step in path.split("/"):
+        prefix, _, name = step.rpartition(":")
+        tags.append("{%s}%s" % (namespaces[prefix], name) if prefix else name)
+    return tuple(tags)
+
+
+def iter_entries(source, paths, namespaces=NSMAP):
+    """
+    Parses a NETCONF reply incrementally and yields the list entries found at given paths.
+
+    Paths are relative to the <data> element, e.g. "state_ns:state/state_ns:port". An entry
+    is yielded once it has been parsed completely, and cleared as soon as the consumer asks
+    for the next one. The ancestors of the entries are cleared in the same way when they
+    end, so memory use does not grow with the number of entries. Consumers can still read
+    the preceding siblings of an ancestor (e.g. the key of the enclosing list entry).
+
+    :param source: serialized reply (bytes or str, e.g. from raw_reply) or a file-like object
+    :param paths: XPath-like location paths of the entries to yield
+    :param namespaces: prefix to namespace mapping used in the paths
+    :return: generator of (path, element) tuples, in document order
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    targets = {_clark(p, namespaces): p for p in paths}
+    ancestors = {t[:i] for t in targets for i in range(1, len(t))}
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif isinstance(source, str):
+        source = TextReader(source)
+
+    stack = []
+    base = None
+    for event, element in etree.iterparse(
+        source, events=("start", "end"), huge_tree=True, remove_blank_text=True
+    ):
+        if event == "start":
+            stack.append(element.tag)
+            if base is None and etree.QName(element).localname == "data":
+                base = len(stack)
+            continue
+
+        relative = tuple(stack[base:]) if base is not None else ()
+        stack.pop()
+        if relative in targets:
+            yield targets[relative], element
+        elif relative not in ancestors:
+            continue
+        # done with this entry, release it and anything parsed before it
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while parent is not None and element.getprevious() is not None:
+            del parent[0]
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+# © 2026 Nokia
+# Licensed under the Apache License 2.0 License
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Structural diff of two XML documents.
+
+Reports differences as dictdiffer.diff() does over the xmltodict.parse() output of both
+documents, without building either dictionary:
+
+* subtrees are hashed, so identical branches are skipped without being visited twice
+* entries of YANG lists are matched by their key (the first leaf of each entry), so an
+  entry inserted or removed in the middle of a list is reported once instead of as a
+  change of every entry that follows it
+* only the values that are reported are converted to dictionaries
+
+Apart from list entries that were inserted, removed or moved, the output is identical to
+that of dictdiffer.
+"""
+import hashlib
+
+from lxml import etree
+
+CHANGE, ADD, REMOVE = "change", "add", "remove"
+
+_PARSER = etree.XMLParser(huge_tree=True, remove_comments=True, remove_pis=True)
+
+
+class _Tree:
+    """Names, values and digests of the elements of one document."""
+
+    def __init__(self, process_namespaces):
+        self.process_namespaces = process_namespaces
+        self._digests = {}
+
+    def name(self, element):
+        qname = etree.QName(element)
+        if self.process_namespaces:
+            return "{}:{}".format(qname.namespace, qname.localname) if qname.namespace \
+                else qname.localname
+        return "{}:{}".format(element.prefix, qname.localname) if element.prefix \
+            else qname.localname
+
+    @staticmethod
+    def declarations(element):
+        """Returns the namespaces declared on an element."""
+        parent = element.getparent()
+        inherited = parent.nsmap if parent is not None else {}
+        return {p: u for p, u in element.nsmap.items() if inherited.get(p) != u}
+
+    def attributes(self, element):
+        attributes = []
+        declarations = self.declarations(element)
+        if not self.process_namespaces:
+            for prefix, uri in declarations.items():
+                attributes.append(("@xmlns:" + prefix if prefix else "@xmlns", uri))
+        for key, value in element.attrib.items():
+            qname = etree.QName(key)
+            if qname.namespace is None:
+                name = qname.localname
+            elif self.process_namespaces:
+                name = "{}:{}".format(qname.namespace, qname.localname)
+            else:
+                prefix = next(
+                    (p for p, u in element.nsmap.items() if u == qname.namespace and p), None
+                )
+                name = "{}:{}".format(prefix, qname.localname) if prefix else qname.localname
+            attributes.append(("@" + name, value))
+        if self.process_namespaces and declarations:
+            # xmltodict reports the declarations as one dictionary, after the attributes
+            attributes.append(("@xmlns", {p or "": u for p, u in declarations.items()}))
+        return attributes
+
+    @staticmethod
+    def text(element):
+        pieces = [element.text or ""] + [child.tail or "" for child in element]
+        return "".join(pieces).strip() or None
+
+    def items(self, element):
+        """
+        Returns the keys and values of an element the way xmltodict orders them: the
+        attributes, the child elements grouped by name, then the text.
+        """
+        items = {}
+        for key, value in self.attributes(element):
+            items[key] = ("mapping" if isinstance(value, dict) else "scalar", value)
+        for child in element:
+            if isinstance(child.tag, str):
+                items.setdefault(self.name(child), ("group", []))[1].append(child)
+        text = self.text(element)
+        if text is not None and len(items):
+            items["#text"] = ("scalar", text)
+        return items
+
+    def value(self, element):
+        """Returns ("scalar", text) for leaves and ("element", element) for the others."""
+        if len(element.attrib) == 0 and not any(isinstance(c.tag, str) for c in element) \
+                and not self.declarations(element):
+            return ("scalar", self.text(element))
+        return ("element", element)
+
+    def group_value(self, elements):
+        if len(elements) == 1:
+            return self.value(elements[0])
+        return ("list", elements)
+
+    def digest(self, element):
+        digest = self._digests.get(element)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(self.name(element).encode())
+            for key, value in self.attributes(element):
+                if isinstance(value, dict):
+                    value = repr(sorted(value.items()))
+                h.update(b"\0@%s=%s" % (key.encode(), value.encode()))
+            h.update(b"\0#" + (self.text(element) or "").encode())
+            for child in element:
+                if isinstance(child.tag, str):
+                    h.update(self.digest(child))
+            digest = self._digests[element] = h.digest()
+        return digest
+
+    def to_python(self, value):
+        """Converts a value to what xmltodict would have returned for it."""
+        kind, payload = value
+        if kind == "scalar":
+            return payload
+        if kind == "mapping":
+            return dict(payload)
+        if kind == "list":
+            return [self.to_python(self.value(e)) for e in payload]
+        result = {}
+        for key, item in self.items(payload).items():
+            result[key] = self.to_python(self.item_value(item))
+        return result
+
+    def item_value(self, item):
+        kind, payload = item
+        return self.group_value(payload) if kind == "group" else item
+
+    def list_key(self, element):
+        """Returns the YANG list key of an entry: name and text of its first leaf."""
+        for child in element:
+            if isinstance(child.tag, str):
+                if self.value(child)[0] == "scalar":
+                    return (self.name(child), self.text(child))
+                return None
+        return None
+
+
+def _dotted(node):
+    if all(isinstance(k, str) and "." not in k for k in node):
+        return ".".join(node)
+    return list(node)
+
+
+def _keyed(tree, elements):
+    keys = [tree.list_key(e) for e in elements]
+    if None in keys or len(set(keys)) != len(keys):
+        return None
+    return {key: i for i, key in enumerate(keys)}
+
+
+class _Differ:
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+    def diff(self, a, b, node):
+        if a[0] == "element" and b[0] == "element":
+            yield from self._diff_elements(a[1], b[1], node)
+        elif a[0] == "list" and b[0] == "list":
+            yield from self._diff_lists(a[1], b[1], node)
+        elif a[0] == "scalar" and b[0] == "scalar":
+            if a[1] != b[1]:
+                yield CHANGE, _dotted(node), (a[1], b[1])
+        elif a[0] == "mapping" and b[0] == "mapping":
+            yield from self._diff_mappings(a[1], b[1], node)
+        else:
+            yield CHANGE, _dotted(node), (self.first.to_python(a), self.second.to_python(b))
+
+    def _diff_mappings(self, a, b, node):
+        for key in a:
+            if key in b and a[key] != b[key]:
+                yield CHANGE, _dotted(node + [key]), (a[key], b[key])
+        addition = [(k, b[k]) for k in b if k not in a]
+        if addition:
+            yield ADD, _dotted(node), addition
+        deletion = [(k, a[k]) for k in a if k not in b]
+        if deletion:
+            yield REMOVE, _dotted(node), deletion
+
+    def _diff_elements(self, a, b, node):
+        if self.first.digest(a) == self.second.digest(b):
+            return
+        first = self.first.items(a)
+        second = self.second.items(b)
+        for key in first:
+            if key in second:
+                yield from self.diff(
+                    self.first.item_value(first[key]),
+                    self.second.item_value(second[key]),
+                    node + [key],
+                )
+        addition = [k for k in second if k not in first]
+        if addition:
+            yield ADD, _dotted(node), [
+                (k, self.second.to_python(self.second.item_value(second[k]))) for k in addition
+            ]
+        deletion = [k for k in first if k not in second]
+        if deletion:
+            yield REMOVE, _dotted(node), [
+                (k, self.first.to_python(self.first.item_value(first[k]))) for k in deletion
+            ]
+
+    def _diff_lists(self, a, b, node):
+        first_keys = _keyed(self.first, a)
+        second_keys = _keyed(self.second, b)
+        if first_keys is None or second_keys is None:
+            # no usable keys, compare by position like dictdiffer
+            common = min(len(a), len(b))
+            pairs = [(i, i) for i in range(common)]
+            addition = list(range(common, len(b)))
+            deletion = list(reversed(range(common, len(a))))
+        else:
+            pairs = [(i, second_keys[k]) for k, i in first_keys.items() if k in second_keys]
+            addition = [j for k, j in second_keys.items() if k not in first_keys]
+            deletion = list(reversed([i for k, i in first_keys.items() if k not in second_keys]))
+        for i, j in pairs:
+            yield from self.diff(
+                self.first.value(a[i]), self.second.value(b[j]), node + [i]
+            )
+        if addition:
+            yield ADD, _dotted(node), [
+                (j, self.second.to_python(self.second.value(b[j]))) for j in addition
+            ]
+        if deletion:
+            yield REMOVE, _dotted(node), [
+                (i, self.first.to_python(self.first.value(a[i]))) for i in deletion
+            ]
+
+
+def _root(document):
+    if etree.iselement(document):
+        return document
+    if isinstance(document, str):
+        document = document.encode("utf-8")
+    return etree.fromstring(document, _PARSER)
+
+
+def diff_xml(first, second, process_namespaces=False):
+    """
+    Compares two XML documents.
+
+    :param first: document (string, bytes or element), e.g. the running configuration
+    :param second: document to compare it with, e.g. the candidate configuration
+    :param process_namespaces: name elements by namespace URI instead of prefix, as
+                               xmltodict.parse(process_namespaces=True) does
+    :return: generator of dictdiffer style ("change" | "add" | "remove", path, values)
+             tuples
+    """
+    a, b = _root(first), _root(second)
+    first_tree = _Tree(process_namespaces)
+    second_tree = _Tree(process_namespaces)
+    differ = _Differ(first_tree, second_tree)
+    name_a, name_b = first_tree.name(a), second_tree.name(b)
+    if name_a == name_b:
+        return differ.diff(first_tree.value(a), second_tree.value(b), [name_a])
+    return iter(
+        [
+            (ADD, "", [(name_b, second_tree.to_python(second_tree.value(b)))]),
+            (REMOVE, "", [(name_a, first_tree.to_python(first_tree.value(a)))]),
+        ]
+    )
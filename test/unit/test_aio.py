@@ -0,0 +1,259 @@
+"""Tests for the asyncio driver, over in-memory NETCONF streams."""
+
+import asyncio
+import json
+import os
+
+import pytest
+from lxml import etree
+from napalm.base.exceptions import (
+    CommandErrorException,
+    CommandTimeoutException,
+    ConnectionClosedException,
+    ConnectionException,
+)
+
+from napalm_sros import aio
+from napalm_sros.aio import AsyncNokiaSROSDriver, NetconfSession
+from napalm_sros.sros import NokiaSROSDriver
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), "mocked_data")
+NC = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+SERVER_HELLO = (
+    '<hello xmlns="{}"><capabilities>'
+    "<capability>urn:ietf:params:netconf:base:1.1</capability>"
+    "<capability>urn:nokia.com:sros:ns:yang:sr:state?module=nokia-state"
+    "&amp;revision=2022-10-19</capability>"
+    "</capabilities><session-id>4</session-id></hello>]]>]]>"
+).format(NC).encode()
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    def close(self):
+        self.closed = True
+
+
+def _chunked(reply):
+    # split in two chunks to exercise reassembly
+    half = len(reply) // 2
+    return b"\n#%d\n%s\n#%d\n%s\n##\n" % (half, reply[:half], len(reply) - half, reply[half:])
+
+
+def _session(*replies):
+    reader = asyncio.StreamReader()
+    reader.feed_data(SERVER_HELLO)
+    for reply in replies:
+        reader.feed_data(_chunked(reply))
+    reader.feed_eof()
+    return NetconfSession(reader, FakeWriter())
+
+
+def _reply(data):
+    return '<rpc-reply xmlns="{}" message-id="1">{}</rpc-reply>'.format(NC, data).encode()
+
+
+def test_get_facts():
+    path = os.path.join(MOCKED_DATA, "test_get_facts", "normal")
+    with open(os.path.join(path, "get_facts.xml")) as f:
+        data = f.read()
+    with open(os.path.join(path, "expected_result.json")) as f:
+        expected = json.load(f)
+
+    async def run():
+        device = AsyncNokiaSROSDriver("test", "admin", "pwd")
+        device.netconf = _session(_reply(data))
+        await device.netconf.hello()
+        device.driver._set_state_revisions(device.netconf.server_capabilities)
+        return device, await device.get_facts()
+
+    device, facts = asyncio.run(run())
+    assert facts == expected
+    assert device.netconf.chunked and device.netconf.session_id == "4"
+    assert device.driver.R19 is False
+    # client hello is end-of-message framed, the RPC chunk framed
+    sent = device.netconf.writer.data
+    assert sent.index(b"]]>]]>") < sent.index(b"\n#")
+    assert b"<get><filter" in sent
+
+
+def test_rpc_error():
+    error = "<rpc-error><error-tag>invalid-value</error-tag></rpc-error>"
+
+    async def run():
+        session = _session(_reply(error))
+        await session.hello()
+        await session.get("<filter/>")
+
+    with pytest.raises(CommandErrorException, match="invalid-value"):
+        asyncio.run(run())
+
+
+def _device(*replies, capabilities=SERVER_HELLO):
+    async def open():
+        device = AsyncNokiaSROSDriver("test", "admin", "pwd")
+        device.netconf = _session(*replies)
+        await device.netconf.hello()
+        device.driver._set_state_revisions(device.netconf.server_capabilities)
+        return device
+
+    return open
+
+
+def test_get_config_matches_sync_driver():
+    path = os.path.join(MOCKED_DATA, "test_get_config", "normal")
+    with open(os.path.join(path, "get_config_running.xml")) as f:
+        running = f.read()
+
+    async def run():
+        device = await _device(_reply(running))()
+        return await device.get_config(retrieve="running")
+
+    class FakeConn:
+        def get_config(self, source):
+            return FakeReply(running)
+
+    class FakeReply:
+        def __init__(self, xml):
+            self.data_xml = etree.fromstring(xml.encode())
+
+    config = asyncio.run(run())
+    sync = NokiaSROSDriver("test", "admin", "pwd")
+    sync.conn = FakeConn()
+    assert config == sync.get_config(retrieve="running", format="xml")
+
+
+def test_state_getters():
+    fdb = (
+        '<data xmlns="{}"><state xmlns="urn:nokia.com:sros:ns:yang:sr:state"><service><vpls>'
+        "<service-name>l2</service-name><fdb><mac><address>00:00:5e:00:53:01</address>"
+        "<type>learned</type><sap>1/1/2:10</sap></mac></fdb></vpls></service></state></data>"
+    ).format(NC)
+
+    async def run():
+        device = await _device(_reply(fdb), _reply("<data/>"), _reply("<data/>"))()
+        return (
+            await device.get_mac_address_table(),
+            await device.get_probes_results(),
+            await device.get_ipv6_neighbors_table(),
+        )
+
+    macs, probes, neighbors = asyncio.run(run())
+    assert [(m["mac"], m["interface"], m["vlan"]) for m in macs] == [
+        ("00:00:5e:00:53:01", "sap:1/1/2", 10)
+    ]
+    assert probes == {} and neighbors == []
+
+
+def test_timeout_closes_session():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(SERVER_HELLO)
+        session = NetconfSession(reader, FakeWriter(), timeout=0.01)
+        await session.hello()
+        with pytest.raises(CommandTimeoutException):
+            await session.get("<filter/>")
+        # the late reply must not be taken as the reply of the next RPC
+        reader.feed_data(_chunked(_reply("<data/>")))
+        with pytest.raises(ConnectionClosedException):
+            await session.get("<filter/>")
+        return session
+
+    session = asyncio.run(run())
+    assert session.broken and session.writer.closed
+
+
+def test_framing_error_closes_session():
+    async def run():
+        session = _session(b"not a chunk")
+        await session.hello()
+        with pytest.raises(ConnectionClosedException):
+            await session.get("<filter/>")
+        return session
+
+    assert asyncio.run(run()).broken
+
+
+def test_shell_on_ssh_port(monkeypatch):
+    connections = []
+
+    class FakeConnection:
+        def __init__(self, port):
+            self.port = port
+
+        async def open_session(self, **kwargs):
+            return None, None, None
+
+    class FakeAsyncSSH:
+        Error = OSError
+
+        @staticmethod
+        async def connect(host, port, **kwargs):
+            connections.append(FakeConnection(port))
+            return connections[-1]
+
+    async def no_banner(self, timeout):
+        return ""
+
+    monkeypatch.setattr(aio, "asyncssh", FakeAsyncSSH)
+    monkeypatch.setattr(AsyncNokiaSROSDriver, "_read_until_prompt", no_banner)
+    device = AsyncNokiaSROSDriver("test", "admin", "pwd", optional_args={"ssh_port": 2222})
+    asyncio.run(device._open_shell())
+    assert [c.port for c in connections] == [2222]
+    assert device.cli_ssh is connections[0]
+
+
+def test_failed_open_closes_ssh(monkeypatch):
+    class FakeConnection:
+        def __init__(self):
+            self.closed = False
+
+        async def open_session(self, **kwargs):
+            reader = asyncio.StreamReader()
+            reader.feed_eof()
+            return FakeWriter(), reader, None
+
+        def close(self):
+            self.closed = True
+
+        async def wait_closed(self):
+            pass
+
+    connection = FakeConnection()
+
+    class FakeAsyncSSH:
+        Error = OSError
+
+        @staticmethod
+        async def connect(host, port, **kwargs):
+            return connection
+
+    monkeypatch.setattr(aio, "asyncssh", FakeAsyncSSH)
+    device = AsyncNokiaSROSDriver("test", "admin", "pwd")
+    # the server closes the NETCONF channel before its hello
+    with pytest.raises(ConnectionException):
+        asyncio.run(device.open())
+    assert connection.closed and device.ssh is None
+
+
+def test_get_ntp_stats():
+    path = os.path.join(MOCKED_DATA, "test_get_ntp_stats", "normal")
+    outputs = {}
+    for command in ("servers", "peers"):
+        with open(os.path.join(path, "_show_system_ntp_{}.txt".format(command))) as f:
+            outputs["/show system ntp " + command] = f.read()
+
+    async def perform(self, commands, no_more=False):
+        return outputs[commands[0]]
+
+    device = AsyncNokiaSROSDriver("test", "admin", "pwd")
+    device._perform_cli_commands = perform.__get__(device)
+    with open(os.path.join(path, "expected_result.json")) as f:
+        assert asyncio.run(device.get_ntp_stats()) == json.load(f)
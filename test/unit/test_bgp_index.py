@@ -0,0 +1,103 @@
+"""Tests for the BGP neighbor state index."""
+
+import json
+import os
+
+from lxml import etree
+
+from napalm_sros import sros
+from napalm_sros.api.get_bgp_neighbors_detail import build_filter, get_bgp_neighbors_detail
+from napalm_sros.api.util import _index_bgp_neighbors
+
+STATE = """
+<data>
+  <state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+    <router>
+      <router-name>Base</router-name>
+      <oper-router-id>10.0.0.1</oper-router-id>
+      <bgp><neighbor><ip-address>192.0.2.1</ip-address></neighbor></bgp>
+    </router>
+    <service>
+      <vprn>
+        <service-name>blue</service-name>
+        <oper-router-id>10.0.0.2</oper-router-id>
+        <bgp><neighbor><ip-address>192.0.2.1</ip-address></neighbor></bgp>
+      </vprn>
+    </service>
+  </state>
+</data>
+"""
+
+
+def test_index_keeps_same_address_in_different_instances_apart():
+    neighbors, router_ids = _index_bgp_neighbors(etree.fromstring(STATE))
+    assert set(neighbors) == {("global", "192.0.2.1"), ("blue", "192.0.2.1")}
+    assert neighbors[("blue", "192.0.2.1")].getparent().getparent().tag.endswith("vprn")
+    assert router_ids == {"global": "10.0.0.1", "blue": "10.0.0.2"}
+
+
+class FakeReply:
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def data_xml(self):
+        return etree.fromstring(self._data.encode("UTF-8"))
+
+
+class FakeConn:
+    def __init__(self, data):
+        self.data = data
+        self.filters = []
+
+    def get(self, filter="", with_defaults=""):
+        self.filters.append(filter)
+        return FakeReply(self.data)
+
+
+def _mocked_detail():
+    path = os.path.join(
+        os.path.dirname(__file__), "mocked_data", "test_get_bgp_neighbors_detail", "normal"
+    )
+    with open(os.path.join(path, "get_bgp_neighbors_detail.xml")) as f:
+        data = f.read()
+    with open(os.path.join(path, "expected_result.json")) as f:
+        expected = json.load(f)
+    return data, expected
+
+
+def test_build_filter_scopes_to_vprn():
+    f = etree.fromstring(build_filter("192.0.2.1", "blue"))
+    ns = {"c": "urn:nokia.com:sros:ns:yang:sr:conf", "s": "urn:nokia.com:sros:ns:yang:sr:state"}
+    assert not f.xpath("c:configure/c:router | s:state/s:router", namespaces=ns)
+    assert f.xpath("string(c:configure/c:service/c:vprn/c:service-name)", namespaces=ns) == "blue"
+    assert f.xpath("string(s:state/s:service/s:vprn/s:service-name)", namespaces=ns) == "blue"
+    assert f.xpath(
+        "string(s:state/s:service/s:vprn/s:bgp/s:neighbor/s:ip-address)", namespaces=ns
+    ) == "192.0.2.1"
+
+
+def test_build_filter_scopes_to_base_router():
+    f = etree.fromstring(build_filter(vrf="global"))
+    ns = {"c": "urn:nokia.com:sros:ns:yang:sr:conf"}
+    assert not f.xpath("c:configure/c:service", namespaces=ns)
+    assert f.xpath("string(c:configure/c:router/c:router-name)", namespaces=ns) == "Base"
+
+
+def test_get_bgp_neighbors_detail_vrf():
+    data, expected = _mocked_detail()
+    conn = FakeConn(data)
+    assert json.loads(json.dumps(get_bgp_neighbors_detail(conn))) == expected
+    assert json.loads(json.dumps(get_bgp_neighbors_detail(conn, vrf="test"))) == {
+        "test": expected["test"]
+    }
+
+
+def test_driver_scopes_to_vrf():
+    data, expected = _mocked_detail()
+    driver = sros.NokiaSROSDriver("router", "admin", "admin")
+    driver.conn = FakeConn(data)
+    assert json.loads(json.dumps(driver.get_bgp_neighbors_detail(vrf="test"))) == {
+        "test": expected["test"]
+    }
+    assert driver.conn.filters == [build_filter(vrf="test")]
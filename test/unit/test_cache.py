@@ -0,0 +1,131 @@
+"""Tests for the NETCONF response cache."""
+
+import os
+
+from lxml import etree
+
+from napalm_sros import sros
+from napalm_sros.utils.cache import ConfigStore, ResponseCache
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), "mocked_data")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeReply:
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def data_xml(self):
+        return etree.fromstring(self._data.encode("UTF-8"))
+
+
+class FakeConn:
+    def __init__(self, data):
+        self.data = data
+        self.gets = 0
+        self.commits = 0
+
+    def get(self, filter="", with_defaults=""):
+        self.gets += 1
+        return FakeReply(self.data)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_ttl_per_getter():
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10, ttls={"get_facts": 100}, clock=clock)
+    cache.put("k", "reply")
+    clock.now = 50
+    assert cache.get("k", "get_interfaces") is None
+    assert cache.get("k", "get_facts") == "reply"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_bound():
+    cache = ResponseCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+
+
+def test_driver_cache_and_invalidation():
+    with open(os.path.join(MOCKED_DATA, "test_get_facts", "normal", "get_facts.xml")) as f:
+        data = f.read()
+    device = sros.NokiaSROSDriver(
+        "test", "admin", "pwd", optional_args={"response_cache": True, "config_lock": True}
+    )
+    device.conn = FakeConn(data)
+
+    facts = device.get_facts()
+    assert device.get_facts() == facts
+    assert device.conn.gets == 1
+    assert device.response_cache.stats()["hits"] == 1
+
+    device.fmt = "xml"
+    device.commit_config()
+    assert device.get_facts() == facts
+    assert device.conn.gets == 2
+
+
+def test_driver_cache_disabled_by_default():
+    device = sros.NokiaSROSDriver("test", "admin", "pwd")
+    assert device.response_cache is None
+
+
+COMMIT_HISTORY = """<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<state xmlns="urn:nokia.com:sros:ns:yang:sr:state"><system><management-interface>
+<commit-history>{}</commit-history></management-interface></system></state></data>"""
+
+
+class FakeConfigConn:
+    def __init__(self):
+        self.commits = ["<commit-id><id>7</id><timestamp>t7</timestamp></commit-id>"]
+        self.get_configs = 0
+
+    def get(self, filter="", with_defaults=""):
+        return FakeReply(COMMIT_HISTORY.format("".join(self.commits)))
+
+    def get_config(self, source):
+        self.get_configs += 1
+        with open(os.path.join(MOCKED_DATA, "test_get_config", "normal",
+                               "get_config_running.xml")) as f:
+            return FakeReply(f.read())
+
+
+def test_config_store_persists(tmp_path):
+    ConfigStore(str(tmp_path)).put("10.0.0.1", "7@t7", "<configure/>")
+    store = ConfigStore(str(tmp_path))
+    assert store.get("10.0.0.1", "7@t7") == "<configure/>"
+    assert store.get("10.0.0.1", "8@t8") is None
+    assert store.get("10.0.0.2", "7@t7") is None
+
+
+def test_running_config_revalidated_by_commit_id(tmp_path):
+    store = ConfigStore(str(tmp_path))
+    device = sros.NokiaSROSDriver(
+        "test", "admin", "pwd", optional_args={"running_config_cache": store}
+    )
+    device.conn = FakeConfigConn()
+
+    running = device.get_config(retrieve="running", format="xml")["running"]
+    assert device.get_config(retrieve="running", format="xml")["running"] == running
+    assert device.conn.get_configs == 1
+
+    device.conn.commits.append("<commit-id><id>8</id><timestamp>t8</timestamp></commit-id>")
+    device.get_config(retrieve="running", format="xml")
+    assert device.conn.get_configs == 2
+    assert store.get("test", "8@t8") == running
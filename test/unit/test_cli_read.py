@@ -0,0 +1,119 @@
+"""Tests for reading the output of CLI commands from the SSH channel."""
+
+import socket
+import time
+
+import pytest
+from napalm.base.exceptions import CommandTimeoutException, ConnectionClosedException
+
+from napalm_sros import sros
+
+PROMPT = b"\r\n[/]\r\nA:admin@router# "
+
+
+class ScriptedChannel:
+    """Returns the given chunks one recv() at a time, without readiness polling."""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def recv(self, size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+class SocketChannel:
+    """A channel backed by a socket pair, so that select() can wait on it."""
+
+    def __init__(self):
+        self.sock, self.peer = socket.socketpair()
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def recv_ready(self):
+        return False
+
+    def recv(self, size):
+        return self.sock.recv(size)
+
+    def close(self):
+        self.sock.close()
+        self.peer.close()
+
+
+@pytest.fixture
+def driver():
+    return sros.NokiaSROSDriver("router", "admin", "admin")
+
+
+def test_prompt_split_across_chunks(driver):
+    driver.ssh_channel = ScriptedChannel(
+        [b"System Name : router\r\n\r\n[/]\r\nA:admin@ro", b"uter# ", b"never read"]
+    )
+    output = driver._read_until_prompt(1)
+    assert output == "System Name : router\r\n" + PROMPT.decode()
+    assert driver.cli_at_prompt
+    assert driver.ssh_channel.chunks == [b"never read"]
+
+
+def test_multibyte_character_split_across_chunks(driver):
+    text = "description été\r\n".encode("utf-8")
+    split = text.index(b"\xc3") + 1
+    driver.ssh_channel = ScriptedChannel([text[:split], text[split:] + PROMPT])
+    output = driver._read_until_prompt(1)
+    assert output.startswith("description été\r\n")
+    assert "�" not in output
+
+
+def test_closed_channel(driver):
+    driver.ssh_channel = ScriptedChannel([b"System Name"])
+    with pytest.raises(ConnectionClosedException):
+        driver._read_until_prompt(1)
+
+
+def test_timeout_without_prompt(driver):
+    channel = driver.ssh_channel = SocketChannel()
+    try:
+        channel.peer.sendall(b"System Name : router\r\n")
+        start = time.monotonic()
+        with pytest.raises(CommandTimeoutException):
+            driver._read_until_prompt(0.2)
+        assert time.monotonic() - start < 2
+        assert not driver.cli_at_prompt
+    finally:
+        channel.close()
+
+
+def test_drain_until_idle(driver):
+    channel = driver.ssh_channel = SocketChannel()
+    try:
+        channel.peer.sendall("late output é".encode("utf-8"))
+        assert driver._drain_channel(0.05) == "late output é"
+        assert driver._drain_channel(0.05) == ""
+    finally:
+        channel.close()
+
+
+def test_drain_stops_at_deadline(driver):
+    channel = driver.ssh_channel = SocketChannel()
+    try:
+        channel.peer.sendall(b"output")
+        assert driver._drain_channel(5, deadline=time.monotonic() - 1) == ""
+    finally:
+        channel.close()
+
+
+def test_command_timeouts():
+    driver = sros.NokiaSROSDriver(
+        "router",
+        "admin",
+        "admin",
+        optional_args={
+            "cli_timeout": 10,
+            "cli_command_timeouts": {"admin": 300, "/admin show configuration": 600},
+        },
+    )
+    assert driver._cli_timeout_for("show router route-table") == 10
+    assert driver._cli_timeout_for("admin save\n") == 300
+    assert driver._cli_timeout_for("/admin show configuration | no-more") == 600
+    assert driver._cli_timeout_for("  admin show configuration") == 600
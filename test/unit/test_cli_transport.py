@@ -0,0 +1,132 @@
+"""Tests for running CLI commands over the NETCONF session."""
+
+import pytest
+from lxml import etree
+from ncclient.operations.rpc import RPCError
+
+from napalm_sros import sros
+from napalm_sros.nc_filters import OPER_GLOBAL_NS
+
+RAW_REPLY = """<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+<results xmlns="{}"><md-cli-output-block>
+System Name : router
+</md-cli-output-block></results></rpc-reply>""".format(OPER_GLOBAL_NS)
+
+# what the MD-CLI shell shows for the same commands, from the echo to the next prompt
+SHELL = {
+    "show system information | match Name": (
+        "show system information | match Name\r\n\r\nSystem Name : router\r\n"
+        "\r\n[/]\r\nA:admin@router# "
+    ),
+    "bogus": (
+        "bogus\r\nMINOR: MGMT_CORE #2201: Unknown element\r\n\r\n[/]\r\nA:admin@router# "
+    ),
+}
+
+RPC_ERROR = """<rpc-error xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<error-type>application</error-type><error-tag>operation-failed</error-tag>
+<error-severity>error</error-severity>
+<error-message>MINOR: MGMT_CORE #2201: Unknown element</error-message></rpc-error>"""
+
+
+class FakeChannel:
+    def __init__(self):
+        self.closed = False
+        self.shell = False
+
+    def get_pty(self):
+        pass
+
+    def invoke_shell(self):
+        self.shell = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTransport:
+    def __init__(self, refuse=False):
+        self.refuse = refuse
+        self.channels = []
+
+    def is_active(self):
+        return True
+
+    def open_session(self, timeout=None):
+        if self.refuse:
+            raise EOFError("administratively prohibited")
+        self.channels.append(FakeChannel())
+        return self.channels[-1]
+
+
+class FakeSession:
+    def __init__(self, transport):
+        self._transport = transport
+
+
+class FakeReply:
+    def __init__(self, xml):
+        self.xml = xml
+
+
+class FakeConn:
+    def __init__(self, transport, capabilities=()):
+        self._session = FakeSession(transport)
+        self.server_capabilities = list(capabilities)
+        self.dispatched = []
+
+    def dispatch(self, rpc):
+        self.dispatched.append(etree.tostring(rpc).decode())
+        if "bogus" in self.dispatched[-1]:
+            raise RPCError(etree.fromstring(RPC_ERROR))
+        return FakeReply(RAW_REPLY)
+
+
+def _driver(conn, transport="netconf"):
+    driver = sros.NokiaSROSDriver(
+        "router", "admin", "admin", optional_args={"sros_cli_transport": transport}
+    )
+    driver.conn = conn
+    return driver
+
+
+def test_shell_on_netconf_session(monkeypatch):
+    transport = FakeTransport()
+    driver = _driver(FakeConn(transport))
+    monkeypatch.setattr(driver, "_connect_ssh", lambda: pytest.fail("second login"))
+    driver._create_ssh()
+    assert driver.ssh_channel is transport.channels[0] and driver.ssh_channel.shell
+    assert driver.conn_ssh.get_transport().is_active()
+
+    driver.conn_ssh.close()
+    assert transport.channels[0].closed
+    assert not driver.conn_ssh.get_transport().is_active()
+
+
+def test_falls_back_to_ssh_login(monkeypatch):
+    driver = _driver(FakeConn(FakeTransport(refuse=True)))
+    logins = []
+    monkeypatch.setattr(driver, "_connect_ssh", lambda: logins.append(1) or ("client", "shell"))
+    driver._create_ssh()
+    assert logins == [1] and driver.ssh_channel == "shell"
+
+
+def test_cli_over_rpc():
+    conn = FakeConn(FakeTransport(), capabilities=[OPER_GLOBAL_NS])
+    driver = _driver(conn, transport="rpc")
+    output = driver.cli(["show system information | match Name", "bogus"])
+    assert output["show system information | match Name"] == "System Name : router\n"
+    assert output["bogus"] == "MINOR: MGMT_CORE #2201: Unknown element\n"
+    assert "<md-cli-input-line>show system information | match Name</md-cli-input-line>" \
+        in conn.dispatched[0]
+
+
+def test_cli_transports_return_the_same_output(monkeypatch):
+    commands = list(SHELL)
+    rpc = _driver(FakeConn(FakeTransport(), capabilities=[OPER_GLOBAL_NS]), transport="rpc")
+    shell = _driver(FakeConn(FakeTransport(), capabilities=[OPER_GLOBAL_NS]), transport="ssh")
+    monkeypatch.setattr(shell, "_perform_cli_commands", lambda cmds, is_get: SHELL[cmds[0]])
+    output = shell.cli(commands)
+    assert output == rpc.cli(commands)
+    # error messages are kept, though they contain a "#"
+    assert output["bogus"] == "MINOR: MGMT_CORE #2201: Unknown element\n"
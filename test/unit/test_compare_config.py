@@ -0,0 +1,160 @@
+"""Tests for the device-side compare of compare_config."""
+
+import pytest
+from lxml import etree
+from napalm.base.exceptions import CommandErrorException
+
+from napalm_sros import sros
+from napalm_sros.nc_filters import OPER_GLOBAL_NS
+
+RUNNING = """<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<configure xmlns="urn:nokia.com:sros:ns:yang:sr:conf"><system><name>{}</name></system></configure>
+</data>"""
+
+REPLY = """<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="1">
+<md-compare-output xmlns="{ns}"><changes><md-cli-output-block>
+{block}</md-cli-output-block></changes></md-compare-output>
+</rpc-reply>"""
+
+BLOCK = """    system {{
+-       name "{}"
++       name "{}"
+    }}
+"""
+
+COMPARE_REPLY = REPLY.format(ns=OPER_GLOBAL_NS, block=BLOCK.format("old", "new"))
+
+# MD-CLI shell output of CLI_COMPARE_COMMANDS for the same difference
+CLI_COMPARE = """edit-config read-only\r
+INFO: CLI #2064: Entering read-only configuration mode\r
+\r
+[ro:/configure]\r
+A:admin@router# compare | no-more\r
+    system {\r
+-       name "old"\r
++       name "new"\r
+    }\r
+\r
+[ro:/configure]\r
+A:admin@router# quit-config\r
+INFO: CLI #2065: Exiting read-only configuration mode\r
+\r
+[/]\r
+A:admin@router# """
+
+
+class FakeReply:
+    def __init__(self, xml):
+        self.xml = xml
+        self.data_xml = xml
+
+
+class FakeConn:
+    def __init__(self, capabilities, fail=False):
+        self.server_capabilities = capabilities
+        self.fail = fail
+        self.dispatched = []
+        self.sources = []
+
+    def dispatch(self, rpc):
+        self.dispatched.append(rpc)
+        if self.fail:
+            raise RuntimeError("unknown element")
+        return FakeReply(COMPARE_REPLY)
+
+    def get_config(self, source, filter=None):
+        self.sources.append(source)
+        return FakeReply(RUNNING.format("old" if source == "running" else "new"))
+
+
+def _driver(conn, mode="md-cli"):
+    driver = sros.NokiaSROSDriver(
+        "router", "admin", "admin", optional_args={"sros_compare_mode": mode}
+    )
+    driver.conn = conn
+    driver.fmt = "xml"
+    return driver
+
+
+def test_device_compare():
+    conn = FakeConn(["{}?module=nokia-oper-global".format(OPER_GLOBAL_NS)])
+    diff = _driver(conn).compare_config()
+    assert diff == '    system {\n-       name "old"\n+       name "new"\n    }'
+    assert len(conn.dispatched) == 1
+    assert conn.sources == []
+
+
+def test_fails_without_capability():
+    conn = FakeConn([])
+    with pytest.raises(CommandErrorException):
+        _driver(conn).compare_config()
+    assert conn.dispatched == []
+    # not silently replaced by the local diff, which has another format
+    assert conn.sources == []
+
+
+def test_fails_on_error():
+    conn = FakeConn([OPER_GLOBAL_NS], fail=True)
+    with pytest.raises(CommandErrorException):
+        _driver(conn).compare_config()
+    assert len(conn.dispatched) == 1
+    assert conn.sources == []
+
+
+class CompareConn(FakeConn):
+    """Answers md-compare with the changes from its source to its destination datastore."""
+
+    def dispatch(self, rpc):
+        self.dispatched.append(rpc)
+        names = {"running": "old", "candidate": "new"}
+        compare = rpc.xpath("//*[local-name()='md-compare']")[0]
+        source, destination = [
+            names[etree.QName(compare.xpath("*[local-name()=$n]/*", n=n)[0]).localname]
+            for n in ("source", "destination")
+        ]
+        return FakeReply(REPLY.format(ns=OPER_GLOBAL_NS, block=BLOCK.format(source, destination)))
+
+
+def test_device_compare_direction():
+    # lines added to the candidate are reported with a "+", like the MD-CLI compare
+    diff = _driver(CompareConn([OPER_GLOBAL_NS])).compare_config()
+    assert '-       name "old"' in diff and '+       name "new"' in diff
+
+
+def test_auto_falls_back_to_cli_compare(monkeypatch):
+    conn = FakeConn([])
+    driver = _driver(conn, mode="auto")
+    commands = []
+
+    def perform(cmds, is_get):
+        commands.extend(cmds)
+        return CLI_COMPARE
+
+    monkeypatch.setattr(driver, "_perform_cli_commands", perform)
+    diff = driver.compare_config()
+    assert commands == sros.CLI_COMPARE_COMMANDS
+    assert conn.dispatched == [] and conn.sources == []
+    # the same format as md-compare
+    assert diff == _driver(FakeConn([OPER_GLOBAL_NS])).compare_config()
+
+
+def test_auto_falls_back_on_error(monkeypatch):
+    conn = FakeConn([OPER_GLOBAL_NS], fail=True)
+    driver = _driver(conn, mode="auto")
+    monkeypatch.setattr(driver, "_perform_cli_commands", lambda cmds, is_get: CLI_COMPARE)
+    assert driver.compare_config() == '    system {\n-       name "old"\n+       name "new"\n    }'
+    assert len(conn.dispatched) == 1
+
+
+def test_auto_uses_md_compare():
+    conn = FakeConn([OPER_GLOBAL_NS])
+    _driver(conn, mode="auto").compare_config()
+    assert len(conn.dispatched) == 1
+
+
+def test_local_mode_does_not_ask_device():
+    conn = FakeConn([OPER_GLOBAL_NS])
+    diff = _driver(conn, mode="local").compare_config()
+    assert conn.dispatched == []
+    assert conn.sources == ["running", "candidate"]
+    assert '"old"' in diff and '"new"' in diff
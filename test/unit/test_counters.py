@@ -0,0 +1,100 @@
+"""Tests for the rates computed from consecutive interface counters."""
+
+import math
+
+from napalm_sros import sros
+from napalm_sros.api import sample_interfaces_counters
+from napalm_sros.utils.counters import FIELDS, CounterSampler
+
+
+def _counters(octets, packets=0):
+    counters = dict.fromkeys(FIELDS, packets)
+    counters["rx_octets"] = octets
+    counters["tx_errors"] = -1
+    return counters
+
+
+def test_rates_per_second():
+    sampler = CounterSampler()
+    assert sampler.rates("r1", {"1/1/1": _counters(1000)}, timestamp=0) == {}
+    rates = sampler.rates(
+        "r1", {"1/1/1": _counters(7000, 60), "1/1/2": _counters(5)}, timestamp=60
+    )
+    # new interfaces have no rates yet, counters not reported have none either
+    assert list(rates) == ["1/1/1"]
+    assert rates["1/1/1"]["rx_octets"] == 100.0
+    assert rates["1/1/1"]["tx_unicast_packets"] == 1.0
+    assert math.isnan(rates["1/1/1"]["tx_errors"])
+    assert sampler.interfaces("r1") == ["1/1/1", "1/1/2"]
+    # devices are sampled independently
+    assert sampler.rates("r2", {"1/1/1": _counters(0)}, timestamp=60) == {}
+
+
+def test_wrap_and_clear():
+    sampler = CounterSampler()
+    sampler.update("r1", {"a": _counters(2**64 - 100), "b": _counters(10**12)}, timestamp=0)
+    rates = sampler.rates("r1", {"a": _counters(100), "b": _counters(50)}, timestamp=10)
+    assert rates["a"]["rx_octets"] == 20.0
+    # a decrease that large is a clear
+    assert rates["b"]["rx_octets"] == 5.0
+
+    cleared = {"a": "2026-01-01T00:00:00.0Z"}
+    sampler.update("r1", {"a": _counters(1000)}, timestamp=20, cleared=cleared)
+    cleared = {"a": "2026-01-01T00:00:25.0Z"}
+    rates = sampler.rates("r1", {"a": _counters(2000)}, timestamp=30, cleared=cleared)
+    assert rates["a"]["rx_octets"] == 200.0
+
+
+def test_interface_missing_from_a_sample():
+    sampler = CounterSampler()
+    sampler.update("r1", {"a": _counters(0), "b": _counters(0)}, timestamp=0)
+    sampler.update("r1", {"a": _counters(10)}, timestamp=10)
+    rates = sampler.rates("r1", {"a": _counters(20), "b": _counters(100)}, timestamp=20)
+    assert list(rates) == ["a"]
+
+
+
+def test_update_returns_the_rows():
+    sampler = CounterSampler()
+    names, rates = sampler.update("r1", {"a": _counters(0)}, timestamp=0)
+    assert names == ["a"] and len(rates) == len(FIELDS)
+    # the names are those of this sample, even if another one adds rows meanwhile
+    names, rates = sampler.update("r1", {"a": _counters(10), "b": _counters(0)}, timestamp=10)
+    sampler.update("r1", {"c": _counters(0)}, timestamp=20)
+    assert names == ["a", "b"] and len(rates) == 2 * len(FIELDS)
+    assert rates[FIELDS.index("rx_octets")] == 1.0
+
+
+COUNTERS = """<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+  <port><port-id>1/1/1</port-id><statistics>
+    <in-octets>{}</in-octets><last-cleared-time>{}</last-cleared-time>
+  </statistics></port>
+</state></data>"""
+
+
+class FakeReply:
+    def __init__(self, xml):
+        self.data_xml = xml
+
+
+class FakeConn:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.filters = []
+
+    def get(self, filter="", with_defaults=""):
+        self.filters.append(filter)
+        return FakeReply(self.replies.pop(0))
+
+
+def test_sample_driver():
+    driver = sros.NokiaSROSDriver("router", "admin", "admin")
+    driver.conn = FakeConn([COUNTERS.format(10**12, "t0"), COUNTERS.format(600, "t1")])
+    now = iter([0.0, 60.0])
+    sampler = CounterSampler(clock=lambda: next(now))
+    assert sample_interfaces_counters(driver, sampler, ports=["1/1/1"]) == {}
+    rates = sample_interfaces_counters(driver, sampler, ports=["1/1/1"])
+    assert rates["1/1/1"]["rx_octets"] == 10.0
+    assert "last-cleared-time" in driver.conn.filters[0]
+    assert "<port-id>1/1/1</port-id>" in driver.conn.filters[0]
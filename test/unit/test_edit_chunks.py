@@ -0,0 +1,114 @@
+"""Tests for the chunked edit-config of large XML candidates."""
+
+import os
+
+import pytest
+from lxml import etree
+from napalm.base.exceptions import ReplaceConfigException
+
+from napalm_sros import sros
+from napalm_sros.utils.edit_chunks import split_config
+
+CONFIG = os.path.join(
+    os.path.dirname(__file__), "mocked_data", "test_get_config", "normal", "get_config_running.xml"
+)
+
+
+def _config():
+    with open(CONFIG, "rb") as f:
+        data = etree.fromstring(f.read(), etree.XMLParser(remove_blank_text=True))
+    return data[0]
+
+
+def _leaves(node, path=()):
+    """Returns the leaves of a tree, identified by the tags and first leaves of their ancestors."""
+    children = [c for c in node if isinstance(c.tag, str)]
+    if not children:
+        return {path + ((node.tag, (node.text or "").strip()),)}
+    first = children[0]
+    key = (first.text or "").strip() if len(first) == 0 else None
+    leaves = set()
+    for child in children:
+        leaves |= _leaves(child, path + ((node.tag, key),))
+    return leaves
+
+
+@pytest.mark.parametrize("chunk_size", [5, 20, 100000])
+def test_parts_merge_into_original(chunk_size):
+    configure = _config()
+    expected = _leaves(configure)
+    sizes = sum(1 for _ in configure.iter())
+    parts = [build() for build in split_config(configure, chunk_size)]
+    merged = set()
+    for part in parts:
+        assert etree.QName(part).localname == "config"
+        for element in part:
+            merged |= _leaves(element)
+    assert merged == expected
+    if chunk_size > sizes:
+        assert len(parts) == 1
+    else:
+        assert len(parts) > 1
+
+
+def test_operation_subtrees_are_not_split():
+    configure = _config()
+    card = configure.find("{urn:nokia.com:sros:ns:yang:sr:conf}card")
+    card.set("{urn:ietf:params:xml:ns:netconf:base:1.0}operation", "replace")
+    size = sum(1 for _ in card.iter())
+    parts = [build() for build in split_config(configure, 2)]
+    cards = [c for p in parts for c in p.iter("{urn:nokia.com:sros:ns:yang:sr:conf}card")]
+    assert len(cards) == 1
+    assert sum(1 for _ in cards[0].iter()) == size
+
+
+class FakeConn:
+    def __init__(self, fail_at=None):
+        self.edits = []
+        self.validations = 0
+        self.fail_at = fail_at
+
+    def edit_config(self, config, target, default_operation):
+        if len(self.edits) == self.fail_at:
+            raise RuntimeError("resource exhausted")
+        self.edits.append((default_operation, config))
+
+    def validate(self, source):
+        self.validations += 1
+
+    def lock(self, target):
+        pass
+
+
+def _driver(conn, progress=None):
+    driver = sros.NokiaSROSDriver(
+        "router",
+        "admin",
+        "admin",
+        optional_args={
+            "edit_config_chunk_size": 10,
+            "edit_config_progress": progress,
+            "lock_disable": True,
+        },
+    )
+    driver.conn = conn
+    return driver
+
+
+def test_replace_in_parts():
+    conn = FakeConn()
+    progress = []
+    driver = _driver(conn, lambda sent, total: progress.append((sent, total)))
+    driver.load_replace_candidate(config=etree.tostring(_config()).decode())
+    operations = [op for op, _ in conn.edits]
+    assert operations[0] == "replace" and set(operations[1:]) == {"merge"}
+    assert progress == [(i + 1, len(conn.edits)) for i in range(len(conn.edits))]
+    assert conn.validations == 1
+
+
+def test_failing_part_is_reported():
+    conn = FakeConn(fail_at=2)
+    with pytest.raises(ReplaceConfigException) as e:
+        _driver(conn).load_replace_candidate(config=etree.tostring(_config()).decode())
+    assert "part 3/" in str(e.value)
+    assert conn.validations == 0
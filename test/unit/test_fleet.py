@@ -0,0 +1,161 @@
+"""Tests for the fleet collector."""
+
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from lxml import etree
+
+from napalm_sros import fleet, sros
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), "mocked_data")
+
+
+def _mocked(getter):
+    path = os.path.join(MOCKED_DATA, "test_" + getter, "normal")
+    with open(os.path.join(path, getter + ".xml")) as f:
+        data = f.read()
+    with open(os.path.join(path, "expected_result.json")) as f:
+        expected = json.load(f)
+    return data, expected
+
+
+class FakeReply:
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def data_xml(self):
+        return etree.fromstring(self._data.encode("UTF-8"))
+
+
+class FakeConn:
+    def __init__(self, replies):
+        self.replies = replies
+
+    def get(self, filter="", with_defaults=""):
+        for marker, data in self.replies.items():
+            if marker in filter:
+                return FakeReply(data)
+        raise AssertionError("unexpected filter")
+
+    def close_session(self):
+        pass
+
+
+FACTS, FACTS_EXPECTED = _mocked("get_facts")
+USERS, USERS_EXPECTED = _mocked("get_users")
+OPENS = {}
+
+
+class FakeDriver(sros.NokiaSROSDriver):
+    def open(self):
+        OPENS[self.hostname] = OPENS.get(self.hostname, 0) + 1
+        if self.hostname == "flaky" and OPENS[self.hostname] == 1:
+            return  # connection failure, conn stays None
+        self.conn = FakeConn({"<chassis>": FACTS, "<local-profiles>": USERS})
+        self.R19 = False
+
+
+def _collect(**kwargs):
+    inventory = [
+        {"hostname": name, "username": "admin", "password": "pwd"}
+        for name in ("r1", "r2", "flaky")
+    ]
+    return list(
+        fleet.collect(
+            inventory, ["get_facts", "get_users"], driver_class=FakeDriver, **kwargs
+        )
+    )
+
+
+def test_collect_retries_and_results():
+    OPENS.clear()
+    records = _collect(max_sessions=2, parse_workers=0)
+    assert len(records) == 6
+    assert all(r.error is None for r in records)
+    by_key = {(r.hostname, r.getter): r for r in records}
+    assert by_key[("flaky", "get_facts")].result == FACTS_EXPECTED
+    assert by_key[("r2", "get_users")].result == USERS_EXPECTED
+    assert set(by_key[("r1", "get_facts")].timing) == {"fetch", "parse"}
+    # one session per device, plus the retry
+    assert OPENS == {"r1": 1, "r2": 1, "flaky": 2}
+
+
+def test_collect_reports_errors_after_retries():
+    OPENS.clear()
+    records = _collect(parse_workers=0, retries=0)
+    failed = [r for r in records if r.error is not None]
+    assert [(r.hostname, r.getter) for r in failed] == [("flaky", "get_facts")]
+
+
+def test_collect_parses_in_worker_processes():
+    OPENS.clear()
+    records = _collect(parse_workers=1)
+    assert {r.getter: r.result for r in records if r.hostname == "r1"} == {
+        "get_facts": FACTS_EXPECTED,
+        "get_users": USERS_EXPECTED,
+    }
+
+
+def test_inline_parsers_keep_their_release(monkeypatch):
+    barrier = threading.Barrier(2)
+
+    def parse_release(self, root):
+        # both threads have set the release flag before either one parses
+        barrier.wait(timeout=5)
+        return self.R19
+
+    monkeypatch.setattr(sros.NokiaSROSDriver, "_parse_release", parse_release, raising=False)
+    data = b'<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"/>'
+    with ThreadPoolExecutor(2) as pool:
+        futures = [pool.submit(fleet._parse, "_parse_release", data, r19) for r19 in (True, False)]
+        assert [f.result()[0] for f in futures] == [True, False]
+
+
+def test_worker_processes_are_not_forked(monkeypatch):
+    contexts = []
+
+    class Executor(ProcessPoolExecutor):
+        def __init__(self, workers, mp_context=None):
+            contexts.append(mp_context.get_start_method())
+            super().__init__(workers, mp_context=mp_context)
+
+    monkeypatch.setattr(fleet, "ProcessPoolExecutor", Executor)
+    OPENS.clear()
+    assert all(r.error is None for r in _collect(parse_workers=1))
+    assert contexts and contexts[0] in ("forkserver", "spawn")
+
+
+class HangingDriver(FakeDriver):
+    """<get> blocks until the session is closed, like a device that stopped answering."""
+
+    def open(self):
+        super().open()
+        self.closed = threading.Event()
+
+    def _nc_get(self, getter, filter, with_defaults=None):
+        if not self.closed.wait(timeout=10):
+            raise AssertionError("session not closed")
+        raise ConnectionResetError("session closed")
+
+    def close(self):
+        self.closed.set()
+
+
+def test_timeout_closes_the_session_of_a_hung_getter():
+    inventory = [{"hostname": "r1", "username": "admin", "password": "pwd"}]
+    records = list(
+        fleet.collect(
+            inventory,
+            ["get_facts", "get_users"],
+            parse_workers=0,
+            timeout=0.2,
+            driver_class=HangingDriver,
+        )
+    )
+    assert [(r.getter, type(r.error)) for r in records] == [
+        ("get_facts", TimeoutError),
+        ("get_users", TimeoutError),
+    ]
@@ -0,0 +1,145 @@
+"""Tests for writing configurations to files with api.get_config_to."""
+
+import gzip
+import io
+import os
+import threading
+
+import pytest
+from lxml import etree
+
+from napalm_sros import sros
+from napalm_sros.api import get_config_to
+from napalm_sros.utils.streaming import RawGetConfig, _RawReply
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), "mocked_data", "test_get_config", "normal")
+
+
+def _read(name):
+    with open(os.path.join(MOCKED_DATA, name)) as f:
+        return f.read()
+
+
+class FakeReply:
+    def __init__(self, data):
+        self.xml = data
+
+    @property
+    def data_xml(self):
+        return etree.fromstring(self.xml.encode("UTF-8"))
+
+
+class FakeRPC:
+    def __init__(self, xml):
+        self.event = threading.Event()
+        self.event.set()
+        self.timeout = 30
+        self.error = None
+        self.reply = _RawReply(xml)
+
+
+class FakeConn:
+    def get_config(self, source):
+        return FakeReply(_read("get_config_{}.xml".format(source)))
+
+    def execute(self, operation, source):
+        # the reply is read as text, ncclient does not parse it
+        assert operation is RawGetConfig
+        return FakeRPC(_read("get_config_{}.xml".format(source)))
+
+
+class FakeChannel:
+    """Returns the mocked output of a command in small chunks."""
+
+    def __init__(self):
+        self.pending = b""
+
+    def send(self, command):
+        name = command.split("\n")[0].replace(" ", "_").replace("|", "_")
+        # the device sends a space after the prompt
+        self.pending = (_read(name + ".txt") + " ").encode("utf-8")
+
+    def recv(self, size):
+        chunk, self.pending = self.pending[:64], self.pending[64:]
+        return chunk
+
+
+class FakeTransport:
+    def is_active(self):
+        return True
+
+
+class FakeSSH:
+    def get_transport(self):
+        return FakeTransport()
+
+
+def _driver():
+    driver = sros.NokiaSROSDriver("router", "admin", "admin")
+    driver.conn = FakeConn()
+    driver.conn_ssh = FakeSSH()
+    driver.ssh_channel = FakeChannel()
+    return driver
+
+
+def _canonical(xml):
+    parser = etree.XMLParser(remove_blank_text=True)
+    return etree.tostring(etree.fromstring(xml, parser), method="c14n")
+
+
+@pytest.mark.parametrize("retrieve", ["running", "candidate"])
+def test_xml(retrieve):
+    driver = _driver()
+    out = io.BytesIO()
+    get_config_to(driver, out, retrieve=retrieve)
+    expected = driver.get_config(retrieve=retrieve, format="xml")[retrieve]
+    assert _canonical(out.getvalue()) == _canonical(expected.encode("utf-8"))
+
+
+def test_xml_gzip_file(tmp_path):
+    driver = _driver()
+    path = tmp_path / "running.xml.gz"
+    get_config_to(driver, str(path), compression="gzip")
+    with gzip.open(path) as f:
+        written = f.read()
+    expected = driver.get_config(retrieve="running", format="xml")["running"]
+    assert _canonical(written) == _canonical(expected.encode("utf-8"))
+
+
+def test_cli():
+    driver = _driver()
+    out = io.BytesIO()
+    get_config_to(driver, out, format="cli")
+    expected = driver.get_config(retrieve="running", format="cli")["running"]
+    assert expected
+    assert out.getvalue().decode("utf-8") == expected
+
+
+class BufferedChannel(FakeChannel):
+    """Keeps unread output across commands, like the SSH channel."""
+
+    def send(self, command):
+        command = command.split("\n")[0]
+        if command == "show system information":
+            output = "System Name : router\n\n[/]\nA:netconf@vSR-AUTO-01# "
+        else:
+            name = command.replace(" ", "_").replace("|", "_")
+            output = _read(name + ".txt") + " "
+        self.pending += output.encode("utf-8")
+
+
+def test_cli_reads_output_to_the_prompt():
+    driver = _driver()
+    driver.ssh_channel = BufferedChannel()
+    get_config_to(driver, io.BytesIO(), format="cli")
+    assert driver.ssh_channel.pending == b""
+    lines = list(driver._iter_cli_lines(["show system information"]))
+    assert lines[0] == "System Name : router"
+    assert "persistent-indices" not in "".join(lines)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        get_config_to(_driver(), io.BytesIO(), retrieve="all")
+    with pytest.raises(ValueError):
+        get_config_to(_driver(), io.BytesIO(), compression="lz4")
@@ -0,0 +1,85 @@
+"""Tests for the port and router interface scoped interface getters."""
+
+import threading
+
+from lxml import etree
+
+from napalm_sros import sros
+from napalm_sros.api import get_interfaces_counters
+from napalm_sros.api.get_interfaces import build_filter
+from napalm_sros.api.iter_getters import iter_interfaces_counters
+from napalm_sros.nc_filters import GET_INTERFACES, GET_INTERFACES_COUNTERS
+from napalm_sros.utils.streaming import _RawReply
+
+COUNTERS = """<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<state xmlns="urn:nokia.com:sros:ns:yang:sr:state">
+  <port><port-id>1/1/1</port-id><statistics><in-octets>100</in-octets></statistics></port>
+  <port><port-id>1/1/2</port-id><statistics><in-octets>200</in-octets></statistics></port>
+</state></data>"""
+
+
+def _keys(filter, path):
+    return etree.fromstring(filter.encode()).xpath(
+        path, namespaces={"s": "urn:nokia.com:sros:ns:yang:sr:state",
+                          "c": "urn:nokia.com:sros:ns:yang:sr:conf"}
+    )
+
+
+def test_ports_only():
+    filter = build_filter(GET_INTERFACES(R19=False), ports=["1/1/1", "1/1/2"])
+    assert _keys(filter, "//s:state/s:port/s:port-id/text()") == ["1/1/1", "1/1/2"]
+    assert _keys(filter, "//c:configure/c:port/s:port-id/text()") == []
+    assert _keys(filter, "//c:configure/c:port/c:port-id/text()") == ["1/1/1", "1/1/2"]
+    # the router interfaces are left out, not selected as a whole
+    assert _keys(filter, "//s:router | //c:router") == []
+    assert _keys(filter, "//s:port[s:port-id='1/1/2']/s:ethernet/s:oper-speed")
+    assert _keys(filter, "//s:chassis")
+
+
+def test_interfaces_only():
+    filter = build_filter(GET_INTERFACES_COUNTERS["_"], interfaces=["system", "to_RTR-01"])
+    assert _keys(filter, "//s:router/s:interface/s:interface-name/text()") == [
+        "system", "to_RTR-01"
+    ]
+    assert _keys(filter, "//s:port") == []
+    assert build_filter(GET_INTERFACES_COUNTERS["_"]) == GET_INTERFACES_COUNTERS["_"]
+
+
+class FakeReply:
+    def __init__(self, xml):
+        self.data_xml = xml
+        self.xml = xml
+
+
+class FakeRPC:
+    def __init__(self, xml):
+        self.event = threading.Event()
+        self.event.set()
+        self.timeout = 30
+        self.error = None
+        self.reply = _RawReply(xml)
+
+
+class FakeConn:
+    def __init__(self):
+        self.filters = []
+
+    def get(self, filter="", with_defaults=""):
+        self.filters.append(filter)
+        return FakeReply(COUNTERS)
+
+    def execute(self, operation, filter="", with_defaults=""):
+        self.filters.append(filter)
+        return FakeRPC(COUNTERS)
+
+
+def test_scoped_counters():
+    driver = sros.NokiaSROSDriver("router", "admin", "admin")
+    driver.conn = FakeConn()
+    counters = get_interfaces_counters(driver, ports=["1/1/1", "1/1/2"])
+    assert counters["1/1/2"]["rx_octets"] == 200
+    assert "<port-id>1/1/1</port-id>" in driver.conn.filters[0]
+
+    list(iter_interfaces_counters(driver, ports=["1/1/1"]))
+    assert "<port-id>1/1/1</port-id>" in driver.conn.filters[1]
+    assert "<port-id>1/1/2</port-id>" not in driver.conn.filters[1]
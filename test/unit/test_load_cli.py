@@ -0,0 +1,84 @@
+"""Tests for loading text configurations through the MD-CLI."""
+
+import pytest
+from napalm.base.exceptions import MergeConfigException, ReplaceConfigException
+
+from napalm_sros import sros
+
+PROMPT = "\r\n[ex:/configure]\r\nA:admin@router# "
+
+
+class FakeMDCLI:
+    """Answers every line with its echo, an error for lines containing "bad", and a prompt."""
+
+    def __init__(self):
+        self.received = []
+        self.output = ""
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def sendall(self, data):
+        lines = data.split("\n")
+        assert lines.pop() == ""
+        for line in lines:
+            self.received.append(line)
+            error = "\r\nMINOR: MGMT_CORE #2201: Unknown element" if "bad" in line else ""
+            self.output += line + error + PROMPT
+        self.in_flight += len(lines)
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def recv(self, size):
+        chunk, self.output = self.output[:100], self.output[100:]
+        self.in_flight = self.output.count("# ")
+        return chunk.encode("utf-8")
+
+
+class FakeTransport:
+    def is_active(self):
+        return True
+
+
+class FakeSSH:
+    def get_transport(self):
+        return FakeTransport()
+
+
+def _driver(window=64):
+    driver = sros.NokiaSROSDriver(
+        "router", "admin", "admin", optional_args={"cli_load_window": window}
+    )
+    driver.conn_ssh = FakeSSH()
+    driver.ssh_channel = FakeMDCLI()
+    return driver
+
+
+def test_merge_sends_every_line_within_window():
+    driver = _driver(window=64)
+    config = ["port 1/1/{} admin-state enable".format(i) for i in range(1, 2001)]
+    driver.load_merge_candidate(config="\n".join(config))
+    assert driver.ssh_channel.received == ["edit-config exclusive"] + config
+    assert driver.ssh_channel.max_in_flight <= 64
+
+
+def test_merge_reports_failing_line():
+    driver = _driver()
+    config = ["system name r1"] * 40 + ["bad leaf"] + ["system name r1"] * 40
+    with pytest.raises(MergeConfigException) as e:
+        driver.load_merge_candidate(config="\n".join(config))
+    assert "line 41: bad leaf: MINOR: MGMT_CORE #2201: Unknown element" in str(e.value)
+    # nothing is sent after the window that contained the failing line
+    assert len(driver.ssh_channel.received) < 1 + len(config)
+    assert driver.ssh_channel.output == ""
+
+
+def test_error_text_in_echo_is_not_an_error():
+    driver = _driver()
+    driver.load_merge_candidate(config='port 1/1/1 description "Error: none"')
+
+
+def test_replace_reports_failing_line():
+    driver = _driver()
+    with pytest.raises(ReplaceConfigException) as e:
+        driver.load_replace_candidate(config="system name r1\nbad leaf")
+    assert "line 2: bad leaf" in str(e.value)
+    assert driver.ssh_channel.received[:2] == ["edit-config exclusive", "delete configure"]
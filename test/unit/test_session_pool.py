@@ -0,0 +1,201 @@
+"""Tests for the pool of NETCONF and SSH sessions shared by drivers."""
+
+import select
+import socket
+import time
+
+from napalm_sros import sros
+from napalm_sros.utils.session_pool import SessionPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSession:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.server_capabilities = []
+
+    def close_session(self):
+        self.closed = True
+
+
+def _close(session):
+    session.closed = True
+
+
+def test_reuse_per_key():
+    pool = SessionPool()
+    first = FakeSession()
+    pool.release("a", first, _close)
+    assert pool.acquire("b", FakeSession) is not first
+    assert pool.acquire("a", FakeSession) is first
+    assert len(pool) == 0
+
+
+def test_idle_timeout_and_health_check():
+    clock = FakeClock()
+    pool = SessionPool(idle_timeout=10, clock=clock)
+    stale, broken = FakeSession(), FakeSession()
+    pool.release("a", stale, _close)
+    clock.now = 20
+    pool.release("a", broken, _close)
+    broken.connected = False
+    fresh = pool.acquire("a", FakeSession, check=lambda s: s.connected)
+    assert fresh not in (stale, broken)
+    assert stale.closed and broken.closed
+
+
+def test_idle_sessions_expire_without_reuse():
+    pool = SessionPool(idle_timeout=0.05)
+    sessions = [FakeSession() for _ in range(2)]
+    for session in sessions:
+        pool.release("a", session, _close)
+    deadline = time.monotonic() + 5
+    while len(pool) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(pool) == 0 and all(s.closed for s in sessions)
+    # the reaper is started again for the next idle session
+    later = FakeSession()
+    pool.release("a", later, _close)
+    while not later.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert later.closed
+
+def test_max_size_closes_oldest():
+    pool = SessionPool(max_size=2)
+    sessions = [FakeSession() for _ in range(3)]
+    for session in sessions:
+        pool.release("a", session, _close)
+    assert len(pool) == 2
+    assert sessions[0].closed and not sessions[2].closed
+
+
+def test_drivers_share_netconf_session(monkeypatch):
+    opened = []
+
+    def connect(**kwargs):
+        opened.append(FakeSession())
+        return opened[-1]
+
+    monkeypatch.setattr(sros.manager, "connect", connect)
+    pool = SessionPool()
+    args = {"session_pool": pool}
+    for _ in range(3):
+        driver = sros.NokiaSROSDriver("router", "admin", "admin", optional_args=args)
+        driver.open()
+        driver.close()
+    assert len(opened) == 1 and not opened[0].closed
+
+    other = sros.NokiaSROSDriver("router", "admin", "other", optional_args=args)
+    other.open()
+    assert other.conn is not opened[0]
+
+
+def test_locked_session_is_not_pooled(monkeypatch):
+    monkeypatch.setattr(sros.manager, "connect", lambda **kwargs: FakeSession())
+    pool = SessionPool()
+    driver = sros.NokiaSROSDriver("router", "admin", "admin", optional_args={"session_pool": pool})
+    driver.open()
+    driver.locked = True
+    session = driver.conn
+    driver.close()
+    assert session.closed and len(pool) == 0
+
+
+PROMPT = "\n[/]\nA:admin@router# "
+
+
+class SocketChannel:
+    """CLI channel backed by a socket pair, the device writes to the other end."""
+
+    def __init__(self, device_output=""):
+        self.sock, self.device = socket.socketpair()
+        self.device.sendall(device_output.encode())
+        self.closed = False
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def recv_ready(self):
+        return bool(select.select([self.sock], [], [], 0)[0])
+
+    def recv(self, size):
+        return self.sock.recv(size)
+
+    def send(self, data):
+        self.sock.sendall(data.encode())
+
+
+class FakeTransport:
+    def is_active(self):
+        return True
+
+
+class FakeSSH:
+    def __init__(self):
+        self.closed = False
+
+    def get_transport(self):
+        return FakeTransport()
+
+    def close(self):
+        self.closed = True
+
+
+def _cli_driver(pool):
+    return sros.NokiaSROSDriver(
+        "router", "admin", "admin",
+        optional_args={"session_pool": pool, "cli_idle_timeout": 0.05},
+    )
+
+
+def test_shell_not_at_prompt_is_closed():
+    pool = SessionPool()
+    driver = _cli_driver(pool)
+    ssh = FakeSSH()
+    driver.conn_ssh, driver.ssh_channel = ssh, SocketChannel()
+    # e.g. a command that timed out
+    driver.cli_at_prompt = False
+    driver.close()
+    assert ssh.closed and len(pool) == 0
+
+
+def test_pooled_shell_is_drained_before_reuse():
+    pool = SessionPool()
+    # output of the previous borrower, then the prompt answering the check
+    channel = SocketChannel("late output" + PROMPT + PROMPT)
+    driver = _cli_driver(pool)
+    pool.release(driver._pool_key("ssh", 22), (FakeSSH(), channel), lambda s: s[0].close())
+    driver._create_ssh()
+    assert driver.ssh_channel is channel
+    assert channel.device.recv(16) == b"\n"
+    assert not channel.recv_ready()
+
+
+def test_pooled_shell_without_prompt_is_replaced(monkeypatch):
+    pool = SessionPool()
+    stale = (FakeSSH(), SocketChannel("still running..."))
+    driver = _cli_driver(pool)
+    pool.release(driver._pool_key("ssh", 22), stale, lambda s: s[0].close())
+    fresh = (FakeSSH(), SocketChannel())
+    monkeypatch.setattr(driver, "_connect_ssh", lambda: fresh)
+    driver._create_ssh()
+    assert driver.ssh_channel is fresh[1]
+    assert stale[0].closed
+
+
+def test_shell_at_prompt_is_pooled():
+    pool = SessionPool()
+    driver = _cli_driver(pool)
+    ssh = FakeSSH()
+    driver.conn_ssh, driver.ssh_channel = ssh, SocketChannel()
+    driver.cli_at_prompt = True
+    driver.close()
+    assert not ssh.closed and len(pool) == 1
@@ -0,0 +1,241 @@
+"""Tests for merged NETCONF filters and get_snapshot."""
+
+import copy
+import json
+import os
+
+from lxml import etree
+
+from napalm_sros import sros
+from napalm_sros.api import SNAPSHOT_GETTERS, get_snapshot
+from napalm_sros.utils.filters import merge_filters
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), "mocked_data")
+NC = "urn:ietf:params:xml:ns:netconf:base:1.0"
+
+
+def _filter(body):
+    return '<filter xmlns="{}"><state xmlns="urn:state">{}</state></filter>'.format(NC, body)
+
+
+def _state(merged):
+    return etree.fromstring(merged)[0]
+
+
+# keys of the lists in the mocked replies, returned with every entry like SR OS does
+KEYS = {
+    "port": ("port-id",),
+    "router": ("router-name",),
+    "interface": ("interface-name",),
+    "chassis": ("chassis-class", "chassis-number"),
+    "card": ("slot-number",),
+    "mda": ("mda-slot",),
+    "fan": ("fan-slot",),
+    "power-shelf": ("power-shelf-id",),
+    "power-module": ("power-module-id",),
+    "cpm": ("cpm-slot",),
+    "cpu": ("sample-period",),
+}
+
+
+def _children(element):
+    return [c for c in element if isinstance(c.tag, str)]
+
+
+def _key(element):
+    keys = KEYS.get(etree.QName(element).localname, ())
+    return element.tag, tuple(
+        element.findtext("{%s}%s" % (etree.QName(element).namespace, k), "").strip()
+        for k in keys
+    )
+
+
+def _merge(into, other):
+    """Adds the nodes of other missing from into, entries of a list matched by key."""
+    existing = {}
+    for child in _children(into):
+        existing.setdefault(_key(child), child)
+    for child in _children(other):
+        match = existing.get(_key(child))
+        if match is None:
+            into.append(copy.deepcopy(child))
+        elif len(_children(child)):
+            _merge(match, child)
+
+
+def _select(node, subtree):
+    """Applies a subtree filter node to a data node (RFC 6241 section 6)."""
+    selectors = _children(subtree)
+    if not selectors:
+        return copy.deepcopy(node)
+    for match in [s for s in selectors if not _children(s) and (s.text or "").strip()]:
+        if not any(
+            c.tag == match.tag and (c.text or "").strip() == match.text.strip()
+            for c in _children(node)
+        ):
+            return None
+    keys = KEYS.get(etree.QName(node).localname, ())
+    selected = etree.Element(node.tag, nsmap=node.nsmap)
+    found = False
+    for child in _children(node):
+        results = [_select(child, s) for s in selectors if s.tag == child.tag]
+        result = next((r for r in results if r is not None), None)
+        if result is not None:
+            selected.append(result)
+            found = True
+        elif etree.QName(child).localname in keys:
+            selected.append(copy.deepcopy(child))
+    return selected if found else None
+
+
+class Device:
+    """Datastore of the mocked replies of several getters, answering subtree filters."""
+
+    def __init__(self, getters):
+        self.data = None
+        for getter in getters:
+            path = os.path.join(MOCKED_DATA, "test_" + getter, "normal", getter + ".xml")
+            data = etree.parse(path).getroot()
+            if self.data is None:
+                self.data = data
+            else:
+                _merge(self.data, data)
+        self.requests = []
+
+    def get(self, filter="", with_defaults=""):
+        self.requests.append((filter, with_defaults))
+        reply = etree.Element(self.data.tag, nsmap=self.data.nsmap)
+        for top in _children(etree.fromstring(filter)):
+            for node in _children(self.data):
+                result = _select(node, top) if node.tag == top.tag else None
+                if result is not None:
+                    selected = etree.Element(self.data.tag)
+                    selected.append(result)
+                    _merge(reply, selected)
+        return FakeReply(etree.tostring(reply).decode())
+
+
+class FakeReply:
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def data_xml(self):
+        return etree.fromstring(self._data.encode("UTF-8"))
+
+
+class FakeConn:
+    def __init__(self, data):
+        self.data = data
+        self.requests = []
+
+    def get(self, filter="", with_defaults=""):
+        self.requests.append((filter, with_defaults))
+        return FakeReply(self.data)
+
+
+def test_merge_filters_union_of_containers():
+    merged = _state(
+        merge_filters(
+            _filter("<port><port-id/><oper-state/></port>"),
+            _filter("<port><statistics><in-octets/></statistics></port><router/>"),
+        )
+    )
+    port = merged.find("{urn:state}port")
+    assert len(merged.findall("{urn:state}port")) == 1
+    assert [etree.QName(c).localname for c in port] == ["port-id", "oper-state", "statistics"]
+    assert merged.find("{urn:state}router") is not None
+
+
+def test_merge_filters_selection_supersedes_containment():
+    merged = _state(
+        merge_filters(
+            _filter("<system><cpu><summary/></cpu></system>"),
+            _filter("<system/>"),
+        )
+    )
+    system = merged.findall("{urn:state}system")
+    assert len(system) == 1 and len(system[0]) == 0
+
+
+def test_merge_filters_keeps_content_match_entries_apart():
+    merged = _state(
+        merge_filters(
+            _filter("<port><port-id>1/1/1</port-id><oper-state/></port>"),
+            _filter("<port><port-id>1/1/2</port-id><oper-state/></port>"),
+            _filter("<port><port-id>1/1/1</port-id><description/></port>"),
+        )
+    )
+    ports = merged.findall("{urn:state}port")
+    assert [p.findtext("{urn:state}port-id") for p in ports] == ["1/1/1", "1/1/2"]
+    assert ports[0].find("{urn:state}description") is not None
+
+
+def test_get_snapshot_matches_individual_getter():
+    path = os.path.join(MOCKED_DATA, "test_get_facts", "normal")
+    with open(os.path.join(path, "get_facts.xml")) as f:
+        data = f.read()
+    with open(os.path.join(path, "expected_result.json")) as f:
+        expected = json.load(f)
+
+    device = sros.NokiaSROSDriver("test", "admin", "pwd")
+    device.conn = FakeConn(data)
+    device.R19 = False
+
+    snapshot = get_snapshot(device, ["get_facts", "get_lldp_neighbors"])
+    assert len(device.conn.requests) == 1
+    assert snapshot["get_facts"] == expected
+    assert snapshot["get_facts"] == device.get_facts()
+
+
+def test_get_snapshot_matches_individual_getters(monkeypatch):
+    getters = [
+        "get_facts",
+        "get_lldp_neighbors",
+        "get_interfaces",
+        "get_interfaces_counters",
+        "get_environment",
+    ]
+    with open(
+        os.path.join(
+            MOCKED_DATA,
+            "test_get_environment",
+            "normal",
+            "_show_chassis_power-management_utilization_detail.txt",
+        )
+    ) as f:
+        power = f.read()
+
+    device = sros.NokiaSROSDriver("test", "admin", "pwd")
+    device.conn = Device(getters)
+    device.R19 = False
+    monkeypatch.setattr(device, "_perform_cli_commands", lambda *args, **kwargs: power)
+
+    for getter in getters:
+        # the filters of a getter select its mocked reply from the datastore
+        alone = sros.NokiaSROSDriver("test", "admin", "pwd")
+        alone.conn = Device([getter])
+        alone.R19 = False
+        monkeypatch.setattr(alone, "_perform_cli_commands", lambda *args, **kwargs: power)
+        path = os.path.join(MOCKED_DATA, "test_" + getter, "normal", "expected_result.json")
+        with open(path) as f:
+            assert getattr(alone, getter)() == json.load(f), getter
+
+    snapshot = get_snapshot(device, getters)
+    # one <get> per with-defaults mode
+    assert len(device.conn.requests) == 2
+    for getter in getters:
+        assert snapshot[getter] is not None
+        assert snapshot[getter] == getattr(device, getter)(), getter
+
+
+def test_standalone_counters_keep_entries_without_statistics():
+    data = etree.fromstring(
+        '<data xmlns="{}"><state xmlns="urn:nokia.com:sros:ns:yang:sr:state">'
+        "<port><port-id>1/1/c1</port-id></port></state></data>".format(NC)
+    )
+    device = sros.NokiaSROSDriver("test", "admin", "pwd")
+    # reported by get_interfaces_counters, dropped from a snapshot where only another
+    # getter asked for the port
+    assert device._parse_interfaces_counters(data)["1/1/c1"]["rx_octets"] == -1
+    assert SNAPSHOT_GETTERS["get_interfaces_counters"][2](device, data) == {}
@@ -0,0 +1,368 @@
+"""Tests for the getters reading the YANG state tree instead of CLI output."""
+
+import threading
+
+import pytest
+from lxml import etree
+
+from napalm_sros import sros
+from napalm_sros.api.get_probes_results import build_filter as build_probes_filter
+from napalm_sros.api.get_route_to import _parse_route_to, build_filter, build_neighbors_filter
+from napalm_sros.nc_filters import GET_ROUTE_TO
+from napalm_sros.api.iter_getters import iter_mac_address_table
+from napalm_sros.utils.streaming import _RawReply
+
+DATA = """<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">{}</data>"""
+STATE = """<data xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<state xmlns="urn:nokia.com:sros:ns:yang:sr:state">{}</state></data>"""
+
+ROUTES = STATE.format("""
+<system><current-time>2026-01-01T12:00:00.0Z</current-time></system>
+<router>
+  <router-name>Base</router-name>
+  <autonomous-system>65000</autonomous-system>
+  <route-table><unicast><ipv4>
+    <route>
+      <ipv4-prefix>1.0.4.0/24</ipv4-prefix>
+      <protocol>bgp</protocol><preference>170</preference><metric>0</metric>
+      <active>true</active><last-update>2026-01-01T11:00:00.0Z</last-update>
+      <nexthop><nexthop-id>1</nexthop-id><address>2.1.0.1</address>
+        <interface-name>to_RTR-01</interface-name><active>true</active></nexthop>
+      <nexthop><nexthop-id>2</nexthop-id><address>2.2.0.1</address>
+        <interface-name>to_RTR-02</interface-name><active>false</active></nexthop>
+    </route>
+    <route>
+      <ipv4-prefix>1.0.0.0/8</ipv4-prefix>
+      <protocol>static</protocol><preference>5</preference><metric>1</metric>
+      <active>true</active>
+      <nexthop><nexthop-id>1</nexthop-id><address>2.3.0.1</address></nexthop>
+    </route>
+  </ipv4></unicast></route-table>
+  <bgp><neighbor><ip-address>2.1.0.1</ip-address>
+    <statistics><peer-identifier>10.0.0.1</peer-identifier><peer-as>65001</peer-as></statistics>
+  </neighbor></bgp>
+</router>
+<service><vprn>
+  <service-name>cust</service-name><oper-service-id>100</oper-service-id>
+  <route-table><unicast><ipv4>
+    <route><ipv4-prefix>1.0.4.200/29</ipv4-prefix><protocol>local</protocol>
+      <preference>0</preference><active>true</active>
+      <nexthop><nexthop-id>1</nexthop-id><interface-name>lan</interface-name></nexthop>
+    </route>
+  </ipv4></unicast></route-table>
+</vprn></service>
+""")
+
+
+def _data(xml):
+    return etree.fromstring(xml.encode())
+
+
+def test_route_to_filter_selects_covering_prefixes():
+    prefixes = etree.fromstring(build_filter("1.0.4.1")).xpath(
+        "//*[local-name()='ipv4-prefix']/text()"
+    )
+    assert prefixes[0] == "1.0.4.1/32" and prefixes[-1] == "0.0.0.0/0"
+    # for the base router and for the VPRNs
+    assert len(prefixes) == 2 * 33 and len(set(prefixes)) == 33
+    assert etree.fromstring(build_filter("2001:db8::/32")).xpath(
+        "//*[local-name()='ipv6-prefix']/text()"
+    ) == ["2001:db8::/32"] * 2
+
+
+def test_route_to_longer_filter_lists_more_specific_prefixes():
+    prefixes = etree.fromstring(build_filter("1.0.4.0/26", longer=True)).xpath(
+        "//*[local-name()='ipv4-prefix']/text()"
+    )
+    # the /26 itself, 2 /27s, ... 64 /32s, for the base router and for the VPRNs
+    assert len(prefixes) == 2 * 127 and len(set(prefixes)) == 127
+    assert "1.0.4.0/26" in prefixes and "1.0.4.63/32" in prefixes
+    assert "1.0.4.64/32" not in prefixes
+    # too many more specific prefixes to list, not served from the state tree
+    with pytest.raises(ValueError):
+        build_filter("1.0.4.0/24", longer=True)
+    with pytest.raises(ValueError):
+        build_filter("2001:db8::/64", longer=True)
+
+
+def test_route_to_needs_destination():
+    with pytest.raises(ValueError):
+        build_filter("")
+    with pytest.raises(ValueError):
+        _driver(ROUTES, getters=["get_route_to"]).get_route_to()
+
+
+def test_route_to_neighbors_filter():
+    neighbors = etree.fromstring(build_neighbors_filter(_data(ROUTES), "1.0.4.1"))
+    routers = neighbors.xpath("//*[local-name()='router']")
+    assert [r.xpath("*[local-name()='router-name']/text()") for r in routers] == [["Base"]]
+    # the next-hops of the BGP route only, not the VPRN
+    assert neighbors.xpath("//*[local-name()='ip-address']/text()") == ["2.1.0.1", "2.2.0.1"]
+    assert neighbors.xpath("//*[local-name()='vprn']") == []
+    assert build_neighbors_filter(_data(ROUTES), "1.0.4.1", protocol="static") is None
+
+
+def test_route_to_longest_match_per_instance():
+    result = _parse_route_to(_data(ROUTES), "1.0.4.1", neighbors=_data(ROUTES))
+    assert sorted(result) == ["1.0.4.0/24"]
+    first, second = result["1.0.4.0/24"]
+    assert first == {
+        "protocol": "bgp",
+        "current_active": True,
+        "last_active": False,
+        "age": 3600,
+        "next_hop": "2.1.0.1",
+        "outgoing_interface": "to_RTR-01",
+        "selected_next_hop": True,
+        "preference": 170,
+        "inactive_reason": "",
+        "routing_table": "Base",
+        "protocol_attributes": {
+            "local_as": 65000,
+            "remote_as": 65001,
+            "peer_id": "10.0.0.1",
+            "as_path": "",
+            "communities": [],
+            "local_preference": -1,
+            "preference2": 170,
+            "metric": 0,
+            "metric2": -1,
+        },
+    }
+    assert second["next_hop"] == "2.2.0.1" and not second["selected_next_hop"]
+    assert second["protocol_attributes"]["remote_as"] == -1
+
+
+def test_route_to_longer_and_protocol():
+    result = _parse_route_to(_data(ROUTES), "1.0.4.192/26", longer=True)
+    assert sorted(result) == ["1.0.4.200/29"]
+    assert result["1.0.4.200/29"][0]["routing_table"] == "100"
+    assert _parse_route_to(_data(ROUTES), "1.0.4.1", protocol="static") == {
+        "1.0.0.0/8": [
+            {
+                "protocol": "static",
+                "current_active": True,
+                "last_active": False,
+                "age": 0,
+                "next_hop": "2.3.0.1",
+                "outgoing_interface": "",
+                "selected_next_hop": True,
+                "preference": 5,
+                "inactive_reason": "",
+                "routing_table": "Base",
+                "protocol_attributes": {},
+            }
+        ]
+    }
+
+
+class FakeReply:
+    def __init__(self, xml):
+        self.data_xml = _data(xml)
+
+
+class FakeRPC:
+    def __init__(self, xml):
+        self.event = threading.Event()
+        self.event.set()
+        self.timeout = 30
+        self.error = None
+        self.reply = _RawReply(xml)
+
+
+class FakeConn:
+    def __init__(self, reply):
+        self.reply = reply
+        self.filters = []
+
+    def get(self, filter="", with_defaults=""):
+        self.filters.append(filter)
+        return FakeReply(self.reply)
+
+    def execute(self, operation, filter="", with_defaults=""):
+        self.filters.append(filter)
+        return FakeRPC(self.reply)
+
+
+def _driver(reply, getters=True):
+    driver = sros.NokiaSROSDriver(
+        "router", "admin", "admin", optional_args={"sros_state_getters": getters}
+    )
+    driver.conn = FakeConn(reply)
+    return driver
+
+
+def test_driver_route_to_uses_state():
+    driver = _driver(ROUTES, getters=["get_route_to"])
+    assert list(driver.get_route_to("1.0.4.0/24")) == ["1.0.4.0/24"]
+    # the routes, then the BGP neighbors of their next-hops
+    assert len(driver.conn.filters) == 2
+    assert "<ip-address>2.1.0.1</ip-address>" in driver.conn.filters[1]
+
+
+def test_driver_wide_longer_route_to_uses_cli(monkeypatch):
+    driver = _driver(ROUTES, getters=["get_route_to"])
+    commands = []
+
+    def perform(cmds, *args, **kwargs):
+        commands.extend(cmds)
+        return ""
+
+    monkeypatch.setattr(driver, "_perform_cli_commands", perform)
+    driver.get_route_to("1.0.4.0/24", longer=True)
+    # the instance names only, the routes are read per instance with the CLI
+    assert driver.conn.filters == [GET_ROUTE_TO["_"]]
+    assert commands == [
+        "/show router Base route-table 1.0.4.0/24 longer\n",
+        "/show router 100 route-table 1.0.4.0/24 longer\n",
+    ]
+
+
+IPV6_NEIGHBORS = STATE.format("""
+<router><router-name>Base</router-name><interface>
+  <interface-name>to_vSR-AUTO-02-V6</interface-name>
+  <ipv6><neighbor-discovery><neighbor>
+    <ipv6-address>::ac10:1702</ipv6-address><mac-address>52:54:00:fe:b8:f0</mac-address>
+    <state>REACHABLE</state><timer>3</timer>
+  </neighbor></neighbor-discovery></ipv6>
+</interface></router>
+<service><vprn><service-name>cust</service-name><interface>
+  <interface-name>lan</interface-name>
+  <ipv6><neighbor-discovery><neighbor>
+    <ipv6-address>fe80::1</ipv6-address><mac-address>52:54:00:00:00:01</mac-address>
+    <state>stale</state><timer>1200</timer>
+  </neighbor></neighbor-discovery></ipv6>
+</interface></vprn></service>
+""")
+
+
+def test_ipv6_neighbors_table_from_state():
+    driver = _driver(IPV6_NEIGHBORS, getters=["get_ipv6_neighbors_table"])
+    assert driver.get_ipv6_neighbors_table() == [
+        {
+            "interface": "to_vSR-AUTO-02-V6",
+            "mac": "52:54:00:fe:b8:f0",
+            "ip": "::ac10:1702",
+            "age": 3.0,
+            "state": "reachable",
+        },
+        {
+            "interface": "lan",
+            "mac": "52:54:00:00:00:01",
+            "ip": "fe80::1",
+            "age": 1200.0,
+            "state": "stale",
+        },
+    ]
+    assert "<ipv6-address/>" in driver.conn.filters[0]
+    # the list keys of the routers and VPRNs are selected, so that their entries are not merged
+    assert "<router-name/>" in driver.conn.filters[0]
+    assert "<service-name/>" in driver.conn.filters[0]
+
+
+def _vprn_neighbor(service, mac):
+    return """<vprn><service-name>{}</service-name><interface>
+  <interface-name>to-ce</interface-name>
+  <ipv6><neighbor-discovery><neighbor>
+    <ipv6-address>fe80::1</ipv6-address><mac-address>{}</mac-address>
+    <state>reachable</state><timer>10</timer>
+  </neighbor></neighbor-discovery></ipv6>
+</interface></vprn>""".format(service, mac)
+
+
+def test_ipv6_neighbors_same_address_in_two_vprns():
+    reply = STATE.format("<service>{}{}</service>".format(
+        _vprn_neighbor("cust-a", "52:54:00:00:00:0a"),
+        _vprn_neighbor("cust-b", "52:54:00:00:00:0b"),
+    ))
+    driver = _driver(reply, getters=["get_ipv6_neighbors_table"])
+    assert [n["mac"] for n in driver.get_ipv6_neighbors_table()] == [
+        "52:54:00:00:00:0a", "52:54:00:00:00:0b"
+    ]
+
+
+FDB = STATE.format("""
+<service><vpls><service-name>l2</service-name><fdb>
+  <mac><address>00:00:5e:00:53:01</address><type>learned</type><locale>sap</locale>
+    <sap>1/1/2:10</sap></mac>
+  <mac><address>00:00:5e:00:53:02</address><type>static</type><locale>sdp</locale>
+    <sdp>1:100</sdp></mac>
+  <mac><address>00:00:5e:00:53:03</address><type>learned</type><locale>cpm</locale></mac>
+</fdb></vpls></service>
+""")
+
+
+def test_mac_address_table_from_state():
+    driver = _driver(FDB, getters=["get_mac_address_table"])
+    table = driver.get_mac_address_table()
+    assert [(e["mac"], e["interface"], e["vlan"], e["static"]) for e in table] == [
+        ("00:00:5e:00:53:01", "sap:1/1/2", 10, False),
+        ("00:00:5e:00:53:02", "sdp:1", 100, True),
+        ("00:00:5e:00:53:03", "cpm", -1, False),
+    ]
+    assert table[0]["moves"] == -1 and table[0]["last_move"] == -1.0
+    assert "<service-name></service-name>" in driver.conn.filters[0]
+
+    list(iter_mac_address_table(driver, service="l2"))
+    assert "<service-name>l2</service-name>" in driver.conn.filters[1]
+
+    list(iter_mac_address_table(driver, service="l2&<lab>"))
+    assert "<service-name>l2&amp;&lt;lab&gt;</service-name>" in driver.conn.filters[2]
+
+
+SAA_RUN = """<run><run-index>{}</run-index><total-attempts>10</total-attempts>
+<requests-failed-to-send>{}</requests-failed-to-send>
+<round-trip><min>{}</min><max>3.5</max><average>2.0</average><jitter>0.25</jitter></round-trip>
+</run>"""
+
+SAA = DATA.format("""
+<configure xmlns="urn:nokia.com:sros:ns:yang:sr:conf"><saa>
+  <owner><owner-name>TiMOS CLI</owner-name><test>2</test><type><icmp-ping>
+    <destination-address>192.168.2.1</destination-address><count>10</count>
+  </icmp-ping></type></owner>
+  <owner><owner-name>TiMOS CLI</owner-name><test>3</test><type><icmp-ping>
+    <destination-address>192.168.3.1</destination-address><count>5</count>
+  </icmp-ping></type></owner>
+</saa></configure>
+<state xmlns="urn:nokia.com:sros:ns:yang:sr:state"><saa>
+  <owner><owner-name>TiMOS CLI</owner-name><test>2</test><run-history>
+    {}{}{}
+  </run-history></owner>
+</saa></state>
+""".format(SAA_RUN.format(102061, 10, 1.0), SAA_RUN.format(102062, 0, 1.5),
+           SAA_RUN.format(102060, 0, 0.5)))
+
+
+def test_probes_results_from_state():
+    driver = _driver(SAA, getters=["get_probes_results"])
+    results = driver.get_probes_results()
+    assert results["TiMOS CLI"]["2"] == {
+        "probe_type": "icmp-ping",
+        "target": "192.168.2.1",
+        "source": "",
+        "probe_count": 10,
+        "rtt": 2.0,
+        "round_trip_jitter": 0.25,
+        "current_test_min_delay": 1.5,
+        "current_test_max_delay": 3.5,
+        "current_test_avg_delay": 2.0,
+        "last_test_min_delay": 1.0,
+        "last_test_max_delay": 3.5,
+        "last_test_avg_delay": 2.0,
+        "last_test_loss": 1,
+        "global_test_min_delay": -1.0,
+        "global_test_max_delay": -1.0,
+        "global_test_avg_delay": -1.0,
+    }
+    # no run yet
+    assert results["TiMOS CLI"]["3"]["rtt"] == -1.0
+    assert results["TiMOS CLI"]["3"]["last_test_loss"] == -1
+    assert len(driver.conn.filters) == 1
+
+
+def test_probes_results_filter():
+    test = etree.fromstring(build_probes_filter("TiMOS CLI", "2")).xpath(
+        "//*[local-name()='owner'][*[local-name()='owner-name']='TiMOS CLI']"
+        "/*[local-name()='test']/text()"
+    )
+    assert test == ["2", "2"]
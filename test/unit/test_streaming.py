@@ -0,0 +1,114 @@
+"""Tests for the incremental reply parser and the generator getters."""
+
+import json
+import os
+import threading
+
+import pytest
+from lxml import etree
+from ncclient.operations.rpc import RPCError
+
+from napalm_sros import sros
+from napalm_sros.api import iter_arp_table, iter_bgp_config, iter_interfaces_counters
+from napalm_sros.utils.streaming import RawGet, _RawReply, iter_entries, raw_reply
+
+MOCKED_DATA = os.path.join(os.path.dirname(__file__), "mocked_data")
+
+
+class FakeReply:
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def data_xml(self):
+        return etree.fromstring(self._data.encode("UTF-8"))
+
+
+class FakeRPC:
+    """What ncclient returns for an asynchronous RPC once the reply was delivered."""
+
+    def __init__(self, xml):
+        self.event = threading.Event()
+        self.event.set()
+        self.timeout = 30
+        self.error = None
+        self.reply = _RawReply(xml)
+
+
+class FakeConn:
+    def __init__(self, data):
+        self.data = data
+        self.rpcs = []
+
+    def get(self, filter="", with_defaults=""):
+        return FakeReply(self.data)
+
+    def execute(self, operation, **kwargs):
+        self.rpcs.append(FakeRPC(self.data))
+        return self.rpcs[-1]
+
+
+def _device(getter):
+    path = os.path.join(MOCKED_DATA, "test_" + getter, "normal")
+    with open(os.path.join(path, getter + ".xml")) as f:
+        data = f.read()
+    with open(os.path.join(path, "expected_result.json")) as f:
+        expected = json.load(f)
+    device = sros.NokiaSROSDriver("test", "admin", "pwd")
+    device.conn = FakeConn(data)
+    return device, expected
+
+
+def test_iter_entries_releases_processed_entries():
+    count = 20000
+    source = b"<data><state xmlns='urn:s'>" + b"<port><id>x</id></port>" * count + b"</state></data>"
+    seen = 0
+    largest = 0
+    for _, port in iter_entries(source, "s:state/s:port", namespaces={"s": "urn:s"}):
+        assert port.findtext("{urn:s}id") == "x"
+        largest = max(largest, len(port.getparent()))
+        seen += 1
+    assert seen == count
+    # only the entries of the chunk that is being parsed are held at any time
+    assert largest < count / 4
+
+
+def test_raw_reply_is_not_parsed():
+    conn = FakeConn("<rpc-reply><data><state/></data></rpc-reply>")
+    assert raw_reply(conn, RawGet, filter="") == conn.data
+    assert conn.rpcs[0].reply._root is None
+
+
+def test_raw_reply_raises_rpc_error():
+    conn = FakeConn(
+        """<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"><rpc-error>
+        <error-type>application</error-type><error-tag>operation-failed</error-tag>
+        <error-severity>error</error-severity><error-message>too big</error-message>
+        </rpc-error></rpc-reply>"""
+    )
+    with pytest.raises(RPCError):
+        raw_reply(conn, RawGet, filter="")
+
+
+def test_iter_entries_reads_text_in_chunks():
+    text = "<data><state xmlns='urn:s'>" + "<port><id>\u20ac</id></port>" * 50000 + "</state></data>"
+    ids = [p.findtext("{urn:s}id") for _, p in iter_entries(text, "s:state/s:port", {"s": "urn:s"})]
+    assert ids == ["\u20ac"] * 50000
+
+
+def test_iter_arp_table():
+    device, expected = _device("get_arp_table")
+    assert list(iter_arp_table(device)) == expected == device.get_arp_table()
+
+
+def test_iter_interfaces_counters():
+    device, expected = _device("get_interfaces_counters")
+    assert dict(iter_interfaces_counters(device)) == expected
+
+
+def test_iter_bgp_config():
+    device, expected = _device("get_bgp_config")
+    merged = {}
+    for _, config in iter_bgp_config(device):
+        merged.update(config)
+    assert json.loads(json.dumps(merged)) == expected
@@ -0,0 +1,77 @@
+"""Tests for the registry of compiled TextFSM templates."""
+
+import os
+
+import pytest
+
+from napalm_sros.utils import parse_output_to_dict
+from napalm_sros.utils.parse_output_to_dict import TemplateRegistry
+
+TEMPLATE = "textfsm_templates//nokia_sros_show_service_fdb_mac.tpl"
+
+OUTPUT = os.path.join(
+    os.path.dirname(__file__),
+    "mocked_data",
+    "test_get_mac_address_table",
+    "normal",
+    "_show_service_fdb-mac.txt",
+)
+
+
+def _output():
+    with open(OUTPUT) as f:
+        return f.read()
+
+
+def test_template_compiled_once(monkeypatch):
+    registry = TemplateRegistry(os.path.dirname(parse_output_to_dict.__file__))
+    first = registry.parse(TEMPLATE, _output())
+    monkeypatch.setattr(parse_output_to_dict, "open", lambda *a, **k: 1 / 0, raising=False)
+    assert registry.parse(TEMPLATE, _output()) == first
+    assert first[0]["ServId"] == "2000" and first[0]["MAC"] == "a4:92:cb:aa:15:76"
+    assert list(first[0]) == list(registry.header(TEMPLATE))
+
+
+def test_parse_iter_streams_rows():
+    expected = parse_output_to_dict.parse_with_textfsm(TEMPLATE, _output())
+    consumed = []
+
+    def lines():
+        for line in _output().splitlines():
+            consumed.append(line)
+            yield line
+
+    rows = parse_output_to_dict.parse_iter(TEMPLATE, lines())
+    assert next(rows) == expected[0]
+    assert len(consumed) < len(_output().splitlines())
+    assert [expected[0]] + list(rows) == expected
+
+
+def test_parse_iter_returns_the_fsm_when_closed():
+    registry = TemplateRegistry(os.path.dirname(parse_output_to_dict.__file__))
+    rows = registry.parse_iter(TEMPLATE, _output())
+    first = next(rows)
+    rows.close()
+    idle = registry._load(TEMPLATE)[2]
+    assert len(idle) == 1
+    # the clone is reset before it is reused
+    assert list(registry.parse_iter(TEMPLATE, _output()))[0] == first
+    assert len(idle) == 1
+
+
+def test_parse_iter_rejects_fillup(tmp_path):
+    (tmp_path / "fillup.tpl").write_text(
+        "Value Fillup Service (\\d+)\nValue Mac (\\S+)\n\nStart\n"
+        "  ^Service ${Service}\n  ^${Mac} -> Record\n"
+    )
+    registry = TemplateRegistry(str(tmp_path))
+    with pytest.raises(ValueError, match="Service"):
+        registry.parse_iter("fillup.tpl", "aa:bb\nService 10\n")
+    # the service is filled in the row recorded before it
+    assert registry.parse("fillup.tpl", "aa:bb\nService 10\n")[0] == {
+        "Service": "10", "Mac": "aa:bb"
+    }
+
+def test_by_first_value():
+    by_service = parse_output_to_dict.parse_with_textfsm_by_first_value(TEMPLATE, _output())
+    assert "ServId" not in by_service["2000"] and "MAC" in by_service["2000"]
@@ -0,0 +1,98 @@
+"""Tests for the structural XML diff used by compare_config."""
+
+import copy
+import json
+import os
+
+import dictdiffer
+import pytest
+import xmltodict
+from lxml import etree
+
+from napalm_sros.utils.xml_diff import diff_xml
+
+CONFIG = os.path.join(
+    os.path.dirname(__file__), "mocked_data", "test_get_config", "normal", "get_config_running.xml"
+)
+NS = "{urn:nokia.com:sros:ns:yang:sr:conf}"
+
+
+def _configure():
+    with open(CONFIG, "rb") as f:
+        return etree.fromstring(f.read())[0]
+
+
+def _change_leaf(c):
+    c.find(".//" + NS + "card-type").text = "iom-2"
+
+
+def _append_entry(c):
+    card = c.find(NS + "card")
+    mda = copy.deepcopy(card.findall(NS + "mda")[-1])
+    mda[0].text = "3"
+    card.findall(NS + "mda")[-1].addnext(mda)
+
+
+def _single_entry_left(c):
+    card = c.find(NS + "card")
+    card.remove(card.findall(NS + "mda")[-1])
+
+
+def _remove_leaf(c):
+    leaf = c.find(".//" + NS + "mda-type")
+    leaf.getparent().remove(leaf)
+
+
+def _add_leaf(c):
+    etree.SubElement(c.find(NS + "card"), NS + "admin-state").text = "disable"
+
+
+def _add_attribute(c):
+    c.find(NS + "card").set("operation", "replace")
+
+
+def _remove_container(c):
+    c.remove(c.find(NS + "log"))
+
+
+@pytest.mark.parametrize("process_namespaces", [False, True])
+@pytest.mark.parametrize(
+    "change",
+    [
+        None,
+        _change_leaf,
+        _append_entry,
+        _single_entry_left,
+        _remove_leaf,
+        _add_leaf,
+        _add_attribute,
+        _remove_container,
+    ],
+)
+def test_same_result_as_dictdiffer(change, process_namespaces):
+    running = _configure()
+    candidate = copy.deepcopy(running)
+    if change is not None:
+        change(candidate)
+    running, candidate = etree.tostring(running), etree.tostring(candidate)
+
+    expected = list(
+        dictdiffer.diff(
+            xmltodict.parse(running, process_namespaces=process_namespaces),
+            xmltodict.parse(candidate, process_namespaces=process_namespaces),
+        )
+    )
+    result = list(diff_xml(running, candidate, process_namespaces=process_namespaces))
+    assert json.dumps(result) == json.dumps(expected)
+    assert str(result) == str(expected)
+
+
+def test_list_entries_matched_by_key():
+    running = b"""<configure xmlns="urn:c"><port><port-id>1/1/1</port-id><description>a</description>
+    </port><port><port-id>1/1/2</port-id></port><port><port-id>1/1/3</port-id></port></configure>"""
+    candidate = b"""<configure xmlns="urn:c"><port><port-id>1/1/1</port-id><description>b</description>
+    </port><port><port-id>1/1/3</port-id></port></configure>"""
+    assert list(diff_xml(running, candidate)) == [
+        ("change", ["configure", "port", 0, "description"], ("a", "b")),
+        ("remove", "configure.port", [(1, {"port-id": "1/1/2"})]),
+    ]